@@ -0,0 +1,145 @@
+"""
+Parity and latency check for the embedding inference backends.
+
+Compares the cosine similarities each backend produces on a fixed
+response/keyword corpus against the torch backend, and times single-answer
+and batched encodes.
+
+    cd ai_backend && python -m benchmarks.backend_parity [--backends onnx onnx-int8]
+
+Exits non-zero if any backend drifts beyond --tolerance.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from model.backends import load_embedding_model
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+THRESHOLD = 0.7
+
+CORPUS = [
+    (
+        "Python lists are mutable and can be changed after creation, while tuples "
+        "are immutable, which also makes tuples hashable and usable as dict keys.",
+        ["mutable", "immutable", "hashable", "dictionary key", "performance"],
+    ),
+    (
+        "A primary key uniquely identifies each row in a table, and a foreign key "
+        "references the primary key of another table to enforce referential integrity.",
+        ["primary key", "foreign key", "referential integrity", "unique", "index"],
+    ),
+    (
+        "React re-renders a component when its state or props change; hooks like "
+        "useState and useEffect let function components manage state and side effects.",
+        ["state", "props", "hooks", "useEffect", "virtual DOM"],
+    ),
+    (
+        "Gradient descent updates the weights in the direction that reduces the loss, "
+        "and the learning rate controls how big each step is.",
+        ["gradient", "loss function", "learning rate", "weights", "overfitting"],
+    ),
+    (
+        "TCP is connection oriented and guarantees delivery and ordering through "
+        "acknowledgements, whereas UDP is connectionless and faster but unreliable.",
+        ["connection oriented", "reliable", "acknowledgement", "connectionless", "latency"],
+    ),
+    (
+        "I am not really sure, I think it has something to do with memory.",
+        ["garbage collection", "reference counting", "heap", "memory leak", "stack"],
+    ),
+    (
+        "Overfitting happens when a model memorizes training data; regularization, "
+        "dropout and more data help it generalize.",
+        ["overfitting", "regularization", "dropout", "generalization", "validation set"],
+    ),
+    (
+        "Git branches let developers work in isolation and merge changes back, "
+        "resolving conflicts when the same lines were edited.",
+        ["branch", "merge", "conflict", "commit", "rebase"],
+    ),
+]
+
+
+def cosine_matrix(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return a @ b.T
+
+
+def corpus_similarities(model):
+    responses = [response for response, _ in CORPUS]
+    keywords = [kw for _, kws in CORPUS for kw in kws]
+
+    response_emb = np.asarray(model.encode(responses), dtype=np.float32)
+    keyword_emb = np.asarray(model.encode(keywords), dtype=np.float32)
+    sims = cosine_matrix(response_emb, keyword_emb)
+
+    # Keep only each response's own keywords
+    values, offset = [], 0
+    for row, (_, kws) in enumerate(CORPUS):
+        values.extend(sims[row, offset:offset + len(kws)])
+        offset += len(kws)
+    return np.array(values)
+
+
+def latency_ms(model, texts, repeats):
+    model.encode(texts)  # warm-up
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.encode(texts)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["onnx", "onnx-int8"])
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--tolerance", type=float, default=0.03,
+                        help="max allowed absolute cosine difference vs torch")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    single = [CORPUS[0][0]]
+    batch = [response for response, _ in CORPUS]
+
+    reference = load_embedding_model(args.model, "torch")
+    ref_sims = corpus_similarities(reference)
+    ref_matched = ref_sims >= THRESHOLD
+
+    rows = [("torch", 0.0, 0.0, 1.0,
+             latency_ms(reference, single, args.repeats),
+             latency_ms(reference, batch, args.repeats))]
+
+    for backend in args.backends:
+        model = load_embedding_model(args.model, backend)
+        sims = corpus_similarities(model)
+        diff = np.abs(sims - ref_sims)
+        agreement = float(np.mean((sims >= THRESHOLD) == ref_matched))
+        rows.append((
+            backend, float(diff.max()), float(diff.mean()), agreement,
+            latency_ms(model, single, args.repeats),
+            latency_ms(model, batch, args.repeats),
+        ))
+
+    print(f"{'backend':<10} {'max|d|':>8} {'mean|d|':>8} {'match':>6} "
+          f"{'1 answer ms':>12} {f'{len(batch)} answers ms':>14}")
+    failed = False
+    for name, max_diff, mean_diff, agreement, one_ms, batch_ms in rows:
+        print(f"{name:<10} {max_diff:>8.4f} {mean_diff:>8.4f} {agreement:>6.1%} "
+              f"{one_ms:>12.2f} {batch_ms:>14.2f}")
+        failed = failed or max_diff > args.tolerance
+
+    if failed:
+        print(f"FAIL: cosine drift above tolerance {args.tolerance}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Cold-start benchmark: how long a fresh process takes to be able to answer
+/health (importing the app) and to be fully ready (every subsystem loaded).
+
+    cd ai_backend && python -m benchmarks.cold_start [--runs 5]
+
+Each run is a new interpreter, so import and model-loading costs are real.
+Before subsystems were loaded lazily, importing the app did all the loading,
+so the old time-to-bind was roughly today's time-to-ready.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.harness import environment, save
+
+AI_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "results", "cold_start.json")
+
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter() - start
+
+from subsystems import SUBSYSTEMS, load_all
+load_all()
+print(json.dumps({
+    "import_s": imported,
+    "ready_s": time.perf_counter() - start,
+    "subsystems": {name: s.status() for name, s in SUBSYSTEMS.items()},
+}))
+"""
+
+
+def probe():
+    env = dict(os.environ, WARMUP="true", SUBSYSTEM_LOADING="lazy")
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=AI_BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Loaders print progress: the result is the last line
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PRISM AI backend cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    runs = [probe() for _ in range(args.runs)]
+    result = {
+        "environment": environment(),
+        "runs": args.runs,
+        "import_s_median": round(statistics.median(r["import_s"] for r in runs), 3),
+        "ready_s_median": round(statistics.median(r["ready_s"] for r in runs), 3),
+        "subsystems": {
+            name: {
+                "state": runs[-1]["subsystems"][name]["state"],
+                "seconds_median": round(statistics.median(
+                    r["subsystems"][name]["seconds"] or 0.0 for r in runs
+                ), 3),
+            }
+            for name in runs[-1]["subsystems"]
+        },
+    }
+
+    print(f"time to import app (bind /health): {result['import_s_median']:.3f} s")
+    print(f"time to all subsystems loaded:     {result['ready_s_median']:.3f} s")
+    for name, stats in result["subsystems"].items():
+        print(f"  {name:<12} {stats['seconds_median']:>8.3f} s  ({stats['state']})")
+
+    save(result, args.output)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
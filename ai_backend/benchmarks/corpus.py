@@ -0,0 +1,175 @@
+"""
+Deterministic synthetic inputs for the offline benchmarks: answers, keyword
+lists, resume PDFs and canned Gemini outputs. No network or fixtures needed.
+"""
+import json
+import random
+
+ANSWER_WORDS = (
+    "the a an and of to in is that for it as with was on by this be are "
+    "python list tuple dictionary mutable immutable hash function class object "
+    "inheritance polymorphism encapsulation database index query join table key "
+    "primary foreign normalization transaction commit rollback react state props "
+    "hook component render virtual dom network protocol tcp udp packet latency "
+    "gradient descent loss learning rate model training overfitting dropout "
+    "memory stack heap pointer reference garbage collection thread process lock"
+).split()
+
+KEYWORDS = [
+    "mutable", "immutable", "hashable", "dictionary key", "inheritance",
+    "polymorphism", "encapsulation", "primary key", "foreign key", "normalization",
+    "transaction", "index", "state", "props", "hooks", "virtual DOM",
+    "connection oriented", "acknowledgement", "gradient", "learning rate",
+    "overfitting", "regularization", "garbage collection", "reference counting",
+    "deadlock", "mutex", "time complexity", "recursion", "caching", "load balancing",
+]
+
+RESUME_SKILLS = [
+    "Python", "Java", "C++", "SQL", "MySQL", "TensorFlow", "PyTorch",
+    "Machine Learning", "Deep Learning", "NLP", "Data Science", "AWS", "Azure",
+    "Git", "Node.js", "React", "HTML", "CSS", "JavaScript", "DBMS", "OOP",
+    "Data Structures", "Algorithms", "Computer Networks", "Cloud Computing",
+]
+
+RESUME_FILLER = (
+    "Designed and implemented scalable services for internal teams. "
+    "Collaborated with product managers to deliver features on schedule. "
+    "Improved reliability by adding monitoring, alerting and automated tests. "
+    "Mentored junior engineers and reviewed code across several repositories. "
+    "Reduced infrastructure cost by optimizing queries and caching hot paths."
+).split(". ")
+
+
+def answer(words, seed=0):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(ANSWER_WORDS) for _ in range(words)) + "."
+
+
+def expected_keywords(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {"keyword": kw, "weight": round(rng.uniform(0.5, 2.0), 2)}
+        for kw in rng.sample(KEYWORDS, min(count, len(KEYWORDS)))
+    ]
+
+
+# -------------------------
+# Resume PDFs
+# -------------------------
+def resume_lines(pages, seed=0, lines_per_page=50):
+    rng = random.Random(seed)
+    all_pages = []
+    for page in range(pages):
+        lines = [f"Candidate {seed} - page {page + 1}"]
+        while len(lines) < lines_per_page:
+            if rng.random() < 0.3:
+                picked = rng.sample(RESUME_SKILLS, 4)
+                lines.append("Skills: " + ", ".join(picked))
+            else:
+                lines.append(rng.choice(RESUME_FILLER).strip().rstrip(".") + ".")
+        all_pages.append(lines)
+    return all_pages
+
+
+def skill_taxonomy(count, seed=0):
+    """
+    A synthetic taxonomy of `count` skills (one or two alias each) that
+    includes RESUME_SKILLS, for matcher scaling runs.
+    """
+    rng = random.Random(seed)
+    entries = [{"name": skill, "category": "Resume"} for skill in RESUME_SKILLS]
+    for i in range(count - len(entries)):
+        words = rng.sample(ANSWER_WORDS, 2)
+        entries.append({
+            "name": f"{words[0].title()} {i}",
+            "category": f"Category {i % 40}",
+            "aliases": [f"{words[0]}{i}", f"{words[0]} {words[1]} {i}"],
+        })
+    return entries
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages):
+    """
+    Build a minimal text PDF (Helvetica, one text block per page) from a list
+    of pages, each a list of lines.
+    """
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages_obj = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    kids = []
+    for lines in pages:
+        text = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(
+            f"({_escape(line)}) Tj T*" for line in lines
+        ) + " ET"
+        stream = text.encode("latin-1", "replace")
+        content = add(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        kids.append(add(
+            (
+                f"<< /Type /Page /Parent {pages_obj} 0 R /MediaBox [0 0 595 842] "
+                f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {content} 0 R >>"
+            ).encode()
+        ))
+
+    objects[catalog - 1] = f"<< /Type /Catalog /Pages {pages_obj} 0 R >>".encode()
+    objects[pages_obj - 1] = (
+        f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] "
+        f"/Count {len(kids)} >>"
+    ).encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += (
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, catalog, xref)
+    )
+    return bytes(out)
+
+
+def resume_pdf(pages, seed=0):
+    return make_pdf(resume_lines(pages, seed))
+
+
+# -------------------------
+# Canned Gemini outputs
+# -------------------------
+def gemini_output(skills, seed=0, noisy=True):
+    """
+    Text shaped like a real generate_content response for `skills`:
+    2 questions per skill, optionally wrapped in markdown fences and chatter.
+    """
+    rng = random.Random(seed)
+    items = []
+    for skill in skills:
+        for n in range(2):
+            items.append({
+                "skill": skill,
+                "question": f"Question {n + 1} about {skill}: explain "
+                            + " ".join(rng.sample(ANSWER_WORDS, 12)) + "?",
+                "keywords": rng.sample(KEYWORDS, rng.randint(3, 6)),
+            })
+
+    body = json.dumps(items, indent=2)
+    if noisy:
+        return f"Sure! Here are your questions:\n```json\n{body}\n```\nGood luck!"
+    return body
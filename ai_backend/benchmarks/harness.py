@@ -0,0 +1,110 @@
+"""
+Timing, memory and baseline-comparison helpers shared by the benchmarks.
+"""
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples_s, items_per_call=1):
+    ms = sorted(s * 1000 for s in samples_s)
+    total = sum(samples_s)
+    return {
+        "calls": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(ms[-1], 3),
+        "throughput_per_s": round(len(ms) * items_per_call / total, 2) if total else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def measure(fn, repeats=50, warmup=3, items_per_call=1, setup=None):
+    """
+    Time `fn()` sequentially. `setup()`, if given, runs untimed before each call.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    samples = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, items_per_call)
+
+
+def measure_concurrent(fn, concurrency, calls):
+    """
+    Run `calls` invocations of `fn()` from `concurrency` threads; latency is
+    per call, throughput is calls over wall-clock time.
+    """
+    def timed(_):
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(timed, range(calls)))
+    wall = time.perf_counter() - start
+
+    result = summarize(samples)
+    result["throughput_per_s"] = round(calls / wall, 2)
+    result["concurrency"] = concurrency
+    return result
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def compare(results, baseline, max_regression=0.20, metric="p95_ms"):
+    """
+    Return a list of (case, baseline_value, current_value, ratio) for every
+    case whose `metric` grew by more than `max_regression` over the baseline.
+    """
+    regressions = []
+    for case, current in results["cases"].items():
+        previous = baseline.get("cases", {}).get(case)
+        if not previous or not previous.get(metric):
+            continue
+        ratio = current[metric] / previous[metric]
+        if ratio > 1 + max_regression:
+            regressions.append((case, previous[metric], current[metric], round(ratio, 2)))
+    return regressions
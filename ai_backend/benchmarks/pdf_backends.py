@@ -0,0 +1,120 @@
+"""
+Comparison of the PDF text extraction backends on generated resumes.
+
+    cd ai_backend && python -m benchmarks.pdf_backends [--backends pypdfium2 pdfminer pypdf2]
+
+For each backend: time per page, peak RSS (each backend runs in a fresh
+process) and whether the skills extracted from every resume match the ones
+found with pypdf2, the reference backend.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Single-process extraction: the pool would hide per-backend cost
+os.environ["PDF_PROCESS_WORKERS"] = "0"
+
+from benchmarks import corpus
+from benchmarks.harness import environment, peak_rss_mb, save, summarize
+
+AI_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "results", "pdf_backends.json")
+REFERENCE = "pypdf2"
+PAGE_COUNTS = (1, 2, 3, 5, 10)
+
+
+def resumes(count):
+    return [
+        corpus.resume_pdf(PAGE_COUNTS[seed % len(PAGE_COUNTS)], seed=seed)
+        for seed in range(count)
+    ]
+
+
+def run_backend(backend, count, repeats):
+    """
+    Extract every resume `repeats` times with one backend (in this process).
+    """
+    from resume_parser.parser import extract_skills, extract_text
+
+    documents = resumes(count)
+    rss_before = peak_rss_mb()
+
+    samples = []
+    skills = []
+    for i, pdf in enumerate(documents):
+        pages = PAGE_COUNTS[i % len(PAGE_COUNTS)]
+        for _ in range(repeats):
+            start = time.perf_counter()
+            text = extract_text(pdf, backends=(backend,))
+            # Per-page cost of this document
+            samples.append((time.perf_counter() - start) / pages)
+        skills.append(extract_skills(text))
+
+    stats = summarize(samples)
+    stats["peak_rss_delta_mb"] = round(peak_rss_mb() - rss_before, 1)
+    return {"per_page": stats, "skills": skills}
+
+
+def _run_in_subprocess(backend, count, repeats):
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.pdf_backends", "--child", backend,
+         "--resumes", str(count), "--repeats", str(repeats)],
+        cwd=AI_BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PRISM PDF backend comparison")
+    parser.add_argument("--backends", nargs="+", default=["pypdfium2", "pdfminer", "pypdf2"])
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_backend(args.child, args.resumes, args.repeats)))
+        return 0
+
+    backends = list(dict.fromkeys([REFERENCE] + args.backends))
+    runs = {b: _run_in_subprocess(b, args.resumes, args.repeats) for b in backends}
+    reference = runs[REFERENCE].get("skills")
+
+    results = {"environment": environment(), "resumes": args.resumes, "backends": {}}
+    for backend, run in runs.items():
+        if "error" in run:
+            print(f"  {backend:<10} unavailable: {run['error']}")
+            results["backends"][backend] = run
+            continue
+
+        mismatches = [
+            {"resume": i, "missing": sorted(set(ref) - set(got)), "extra": sorted(set(got) - set(ref))}
+            for i, (ref, got) in enumerate(zip(reference or [], run["skills"]))
+            if set(ref) != set(got)
+        ]
+        stats = run["per_page"]
+        results["backends"][backend] = {
+            "per_page": stats,
+            "skills_match": f"{args.resumes - len(mismatches)}/{args.resumes}",
+            "mismatches": mismatches,
+        }
+        print(
+            f"  {backend:<10} per page p50 {stats['p50_ms']:>8.3f}  p95 {stats['p95_ms']:>8.3f} ms  "
+            f"rss +{stats['peak_rss_delta_mb']} MB  skills match {args.resumes - len(mismatches)}/{args.resumes}"
+        )
+
+    save(results, args.output)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Offline benchmark suite for the AI backend.
+
+    cd ai_backend && python -m benchmarks.run [--suites evaluator keywords resume questions]
+
+Reports p50/p95/p99 latency, throughput and peak RSS per case, writes the
+results as JSON and compares them against a stored baseline:
+
+    python -m benchmarks.run --save-baseline      # record a baseline
+    python -m benchmarks.run                      # fails if p95 regressed > 20%
+
+Gemini is never called: the question suite replays canned model outputs.
+The evaluator suites need the embedding model to be available locally.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+
+# Benchmarks load and warm up the models explicitly
+os.environ.setdefault("WARMUP", "false")
+os.environ.setdefault("KEYWORD_STORE_DIR", "")
+os.environ.setdefault("EVAL_CACHE_MAX_ENTRIES", "0")
+os.environ.setdefault("RESUME_CACHE_PATH", "")
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+
+from benchmarks import corpus
+from benchmarks.harness import compare, environment, measure, measure_concurrent, save
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, "latest.json")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+
+
+# -------------------------
+# Suites
+# -------------------------
+def bench_evaluator(repeats):
+    from model.evaluator import evaluate_response, evaluate_responses, get_embedding_model
+
+    get_embedding_model().encode("warmup")
+    cases = {}
+
+    for words, keywords in itertools.product((20, 80, 250), (3, 10, 20)):
+        response = corpus.answer(words, seed=words)
+        question = {"text": "Q", "expected_keywords": corpus.expected_keywords(keywords, seed=keywords)}
+        cases[f"evaluate_response/words={words}/keywords={keywords}"] = measure(
+            lambda: evaluate_response(response, question), repeats=repeats
+        )
+
+    question = {"text": "Q", "expected_keywords": corpus.expected_keywords(5)}
+    answers = itertools.cycle([corpus.answer(80, seed=i) for i in range(64)])
+    for concurrency in (1, 8):
+        cases[f"evaluate_response/concurrent={concurrency}"] = measure_concurrent(
+            lambda: evaluate_response(next(answers), question),
+            concurrency=concurrency,
+            calls=repeats * 4,
+        )
+
+    session = [
+        (corpus.answer(80, seed=i), {"text": "Q", "expected_keywords": corpus.expected_keywords(5, seed=i)})
+        for i in range(20)
+    ]
+    cases["evaluate_responses/session=20"] = measure(
+        lambda: evaluate_responses(session), repeats=max(5, repeats // 5), items_per_call=len(session)
+    )
+    return cases
+
+
+def bench_keywords(repeats):
+    from model.evaluator import get_embedding_model, get_keyword_embeddings
+
+    get_embedding_model().encode("warmup")
+    cases = {}
+    counter = itertools.count()
+    fresh = []
+
+    def new_keywords():
+        # Unseen keywords every call -> always a miss
+        n = next(counter)
+        fresh[:] = [f"{kw} {n}" for kw in corpus.KEYWORDS[:5]]
+
+    cases["keyword_embeddings/miss/keywords=5"] = measure(
+        lambda: get_keyword_embeddings(fresh), repeats=repeats, setup=new_keywords
+    )
+
+    cached = corpus.KEYWORDS[:5]
+    get_keyword_embeddings(cached)
+    cases["keyword_embeddings/hit/keywords=5"] = measure(
+        lambda: get_keyword_embeddings(cached), repeats=repeats
+    )
+
+    cached = corpus.KEYWORDS[:20]
+    get_keyword_embeddings(cached)
+    cases["keyword_embeddings/hit/keywords=20"] = measure(
+        lambda: get_keyword_embeddings(cached), repeats=repeats
+    )
+    return cases
+
+
+def bench_resume(repeats):
+    from resume_parser.parser import extract_skills, extract_text
+    from resume_parser.skill_matcher import SkillMatcher
+
+    cases = {}
+    for pages in (1, 3, 10, 40):
+        pdf = corpus.resume_pdf(pages, seed=pages)
+        cases[f"extract_text/pages={pages}"] = measure(
+            lambda: extract_text(pdf), repeats=max(5, repeats // pages), items_per_call=pages
+        )
+
+        text = extract_text(pdf)
+        cases[f"extract_skills/pages={pages}"] = measure(
+            lambda: extract_skills(text), repeats=repeats
+        )
+
+    # Repeat upload: a hash and an in-memory lookup
+    from resume_parser.service import parse_resume
+    pdf = corpus.resume_pdf(10, seed=10)
+    parse_resume(pdf)
+    cases["parse_resume/cached/pages=10"] = measure(lambda: parse_resume(pdf), repeats=repeats)
+
+    # Single-pass matching: cost should not grow with the taxonomy
+    text = extract_text(corpus.resume_pdf(10, seed=10))
+    for size in (1000, 20000):
+        matcher = SkillMatcher(corpus.skill_taxonomy(size))
+        cases[f"match_skills/taxonomy={size}/pages=10"] = measure(
+            lambda: matcher.match(text), repeats=repeats
+        )
+    return cases
+
+
+def bench_questions(repeats):
+    from question_generator import gemini_api
+    from question_generator.model_router import ModelRouter
+
+    class _CannedResponse:
+        def __init__(self, text):
+            self.text = text
+
+    class _CannedModel:
+        output = ""
+
+        def __init__(self, name):
+            self.name = name
+
+        def generate_content(self, prompt, **kwargs):
+            return _CannedResponse(_CannedModel.output)
+
+    # Replay canned outputs instead of calling Gemini
+    gemini_api.ROUTER = ModelRouter(["models/offline"], lambda: ["models/offline"])
+    gemini_api.get_genai().GenerativeModel = _CannedModel
+
+    cases = {}
+    for count in (3, 10):
+        skills = corpus.RESUME_SKILLS[:count]
+        raw = corpus.gemini_output(skills, seed=count)
+
+        _CannedModel.output = raw
+        cases[f"generate_questions_for_skills/skills={count}"] = measure(
+            lambda: gemini_api.generate_questions_for_skills(skills), repeats=repeats
+        )
+        cases[f"parse_questions/skills={count}"] = measure(
+            lambda: gemini_api.parse_questions(raw), repeats=repeats
+        )
+    return cases
+
+
+SUITES = {
+    "evaluator": bench_evaluator,
+    "keywords": bench_keywords,
+    "resume": bench_resume,
+    "questions": bench_questions,
+}
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main():
+    parser = argparse.ArgumentParser(description="PRISM AI backend benchmarks")
+    parser.add_argument("--suites", nargs="+", choices=sorted(SUITES), default=list(SUITES))
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=0.20,
+                        help="allowed p95 growth over the baseline (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    results = {"environment": environment(), "cases": {}}
+    for name in args.suites:
+        print(f"== {name}")
+        for case, stats in SUITES[name](args.repeats).items():
+            results["cases"][case] = stats
+            print(
+                f"  {case:<48} p50 {stats['p50_ms']:>9.3f}  p95 {stats['p95_ms']:>9.3f}  "
+                f"p99 {stats['p99_ms']:>9.3f} ms  {stats['throughput_per_s']:>9.2f}/s  "
+                f"rss {stats['peak_rss_mb']} MB"
+            )
+
+    save(results, args.output)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        save(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against (run with --save-baseline)")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.max_regression)
+    for case, before, after, ratio in regressions:
+        print(f"REGRESSION {case}: p95 {before:.3f} -> {after:.3f} ms ({ratio}x)")
+    if regressions:
+        return 1
+
+    print(f"No p95 regressions above {args.max_regression:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and single-flight loading.
+
+    get_or_compute(key, compute) runs `compute()` at most once per key at a
+    time: concurrent callers for the same missing key wait on the first
+    caller's result instead of computing it again.
+    """
+
+    def __init__(self, max_entries=1024, ttl_seconds=600):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl = float(ttl_seconds)
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}            # key -> Future
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl > 0
+
+    def _get_locked(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._get_locked(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[1]
+
+    def __contains__(self, key):
+        # Membership only: not counted as a hit or miss
+        with self._lock:
+            return self._get_locked(key) is not None
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute, cacheable=None):
+        """
+        Return the cached value for `key`, or compute it once.
+        Results for which `cacheable(value)` is False are returned but not stored.
+        """
+        if not self.enabled:
+            return compute()
+
+        with self._lock:
+            entry = self._get_locked(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        if cacheable is None or cacheable(value):
+            self.put(key, value)
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import QUEUE_WAIT_SECONDS, register_collector
+
+# -------------------------
+# Configuration
+# -------------------------
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "4"))
+INFERENCE_QUEUE_LIMIT = int(os.getenv("INFERENCE_QUEUE_LIMIT", "32"))
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "2"))
+PARSE_QUEUE_LIMIT = int(os.getenv("PARSE_QUEUE_LIMIT", "8"))
+
+# 0 = leave the library default
+INTRA_OP_THREADS = int(os.getenv("INFERENCE_INTRA_OP_THREADS", "0"))
+INTER_OP_THREADS = int(os.getenv("INFERENCE_INTER_OP_THREADS", "0"))
+
+
+class ExecutorSaturated(Exception):
+    """
+    Raised when a pool already has `max_workers + max_queue` jobs pending.
+    """
+
+    def __init__(self, name, retry_after=1):
+        super().__init__(f"{name} executor saturated")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """
+    Thread pool dedicated to one kind of workload, with a hard limit on
+    queued jobs and queue-wait measurements.
+
+    Jobs beyond the limit are rejected immediately instead of piling up,
+    so callers can answer 503 while the pool drains.
+    """
+
+    def __init__(self, name, max_workers, max_queue, wait_samples=1024):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=f"{name}-pool"
+        )
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._waits = deque(maxlen=wait_samples)
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args):
+        """
+        Run `fn(*args)` on this pool and await its result.
+        Raises ExecutorSaturated if the queue is full.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(self.name)
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def job():
+            wait = time.perf_counter() - submitted
+            QUEUE_WAIT_SECONDS.observe(wait, pool=self.name)
+            with self._lock:
+                self._waits.append(wait)
+                self._running += 1
+            try:
+                return fn(*args)
+            finally:
+                # Released here, not in the awaiting coroutine: a cancelled
+                # request still occupies the pool until its job finishes
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self.completed += 1
+
+        return await asyncio.get_running_loop().run_in_executor(self._pool, job)
+
+    def stats(self):
+        with self._lock:
+            waits = sorted(self._waits)
+            pending, running = self._pending, self._running
+
+        def percentile(p):
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))] * 1000, 2)
+
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.max_queue,
+            "running": running,
+            "queued": pending - running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(waits[-1] * 1000, 2) if waits else 0.0,
+            },
+        }
+
+
+# -------------------------
+# Workload pools
+# -------------------------
+inference_executor = BoundedExecutor(
+    "inference", INFERENCE_WORKERS, INFERENCE_QUEUE_LIMIT
+)
+parse_executor = BoundedExecutor("parse", PARSE_WORKERS, PARSE_QUEUE_LIMIT)
+
+
+def executor_stats():
+    return {
+        "inference": inference_executor.stats(),
+        "parse": parse_executor.stats(),
+    }
+
+
+def _collect_executor_metrics():
+    for executor in (inference_executor, parse_executor):
+        stats = executor.stats()
+        labels = {"pool": executor.name}
+        yield ("prism_executor_running", "gauge", "Jobs currently running.", labels, stats["running"])
+        yield ("prism_executor_queued", "gauge", "Jobs waiting for a worker.", labels, stats["queued"])
+        yield ("prism_executor_rejected_total", "counter", "Jobs rejected because the queue was full.", labels, stats["rejected"])
+
+
+register_collector(_collect_executor_metrics)
+
+
+def configure_inference_threads():
+    """
+    Apply INFERENCE_INTRA_OP_THREADS / INFERENCE_INTER_OP_THREADS to torch.
+    Must run before the first forward pass: torch refuses to resize its
+    inter-op pool once it has been used.
+    """
+    if INTRA_OP_THREADS <= 0 and INTER_OP_THREADS <= 0:
+        return
+
+    try:
+        import torch
+    except ImportError:
+        return
+
+    if INTRA_OP_THREADS > 0:
+        torch.set_num_threads(INTRA_OP_THREADS)
+    if INTER_OP_THREADS > 0:
+        try:
+            torch.set_num_interop_threads(INTER_OP_THREADS)
+        except RuntimeError as e:
+            print(f"WARNING: could not set torch inter-op threads: {e}")
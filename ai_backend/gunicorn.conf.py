@@ -0,0 +1,29 @@
+# Pre-fork deployment: models load once in the master and are shared with
+# the workers copy-on-write.
+#
+#   cd ai_backend && gunicorn main:app -c gunicorn.conf.py
+#
+# Per-worker memory is logged at startup and served at /memory.
+import os
+
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+# The forward-pass warm-up must run in the workers, not the master
+os.environ["WARMUP"] = "false"
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+
+
+def on_starting(server):
+    from preload import preload_models
+
+    preload_models()
+
+
+def post_worker_init(worker):
+    from preload import warmup_worker
+
+    warmup_worker()
@@ -1,13 +1,40 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from contextlib import asynccontextmanager
+
+from fastapi import Body, FastAPI, UploadFile, File, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-import tempfile
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import json
 import os
 
-from resume_parser.parser import extract_text, extract_skills
-from question_generator.service import generate_questions
-from response_evaluator.evaluator import evaluate
+from executors import ExecutorSaturated, executor_stats, inference_executor, parse_executor
+from resume_parser.parser import group_by_category
+from resume_parser.service import parse_resume as parse_resume_bytes
+from question_generator.service import generate_questions_async, stream_questions
+from response_evaluator.evaluator import evaluate_async, evaluate_many, start_session, MAX_BATCH_ITEMS
+from preload import process_memory
+from metrics import ERRORS, STAGE_SECONDS, render_metrics
+from subsystems import (
+    PARSE_RESUME_SUBSYSTEMS,
+    SUBSYSTEM_LOADING,
+    SUBSYSTEMS,
+    SubsystemUnavailable,
+    all_ready,
+    load_in_background,
+    readiness,
+    require,
+    routable,
+)
+
+@asynccontextmanager
+async def lifespan(app):
+    # The port is bound before any model loads; /ready reports progress
+    if SUBSYSTEM_LOADING == "background":
+        load_in_background()
+    yield
+
 
-app = FastAPI(title="PRISM AI Backend")
+app = FastAPI(title="PRISM AI Backend", lifespan=lifespan)
 
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 
@@ -19,6 +46,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server busy ({exc.name}), retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(SubsystemUnavailable)
+async def subsystem_unavailable_handler(request: Request, exc: SubsystemUnavailable):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"{exc.name} is unavailable", "error": exc.error},
+    )
+
+
+async def _require(*names):
+    # Waits for a subsystem still loading without blocking the event loop
+    if not all_ready(*names):
+        await run_in_threadpool(require, *names)
+
 # -------------------------
 # Health check
 # -------------------------
@@ -27,6 +77,50 @@ def health():
     return {"status": "running"}
 
 
+# -------------------------
+# Readiness (per subsystem)
+# -------------------------
+@app.get("/ready")
+def ready():
+    report = readiness()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+
+@app.get("/ready/{name}")
+def ready_subsystem(name: str):
+    subsystem = SUBSYSTEMS.get(name)
+    if subsystem is None:
+        raise HTTPException(status_code=404, detail=f"Unknown subsystem {name}")
+    return JSONResponse(
+        status_code=200 if routable(name) else 503,
+        content={"name": name, **subsystem.status()},
+    )
+
+
+# -------------------------
+# Per-worker memory (pre-fork deployments)
+# -------------------------
+@app.get("/memory")
+def memory():
+    return process_memory()
+
+
+# -------------------------
+# Prometheus metrics (per worker)
+# -------------------------
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+# -------------------------
+# Executor queue depth and wait times
+# -------------------------
+@app.get("/executors")
+def executors():
+    return executor_stats()
+
+
 # -------------------------
 # Resume parsing
 # -------------------------
@@ -36,39 +130,165 @@ async def parse_resume(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
     # Read file safely
-    pdf_bytes = await file.read()
+    with STAGE_SECONDS.time(stage="pdf_read"):
+        pdf_bytes = await file.read()
 
     if len(pdf_bytes) > 5 * 1024 * 1024:
         raise HTTPException(status_code=413, detail="File too large (max 5MB)")
 
-    with tempfile.NamedTemporaryFile(delete=True, suffix=".pdf") as tmp:
-        tmp.write(pdf_bytes)
-        tmp.flush()
+    await _require(*PARSE_RESUME_SUBSYSTEMS)
+
+    # PDF parsing is CPU-bound: keep it off the event loop
+    skills = await parse_executor.run(_parse_pdf, pdf_bytes)
 
-        text = extract_text(tmp.name)
-        skills = extract_skills(text)
+    return {"skills": sorted(skills), "categories": group_by_category(skills)}
 
-    return {"skills": skills}
+
+def _parse_pdf(pdf_bytes):
+    # Parsed straight from memory (no temp file); repeat uploads hit the cache
+    return parse_resume_bytes(pdf_bytes)["skills"]
 
 
 # -------------------------
 # Question generation
 # -------------------------
 @app.post("/generate-questions")
-def generate_questions_api(payload: dict):
+async def generate_questions_api(payload: dict):
+    skills = payload.get("skills")
+
+    if not isinstance(skills, list) or not skills:
+        raise HTTPException(status_code=400, detail="skills must be a non-empty list")
+
+    # Gemini is required only for skills the question bank cannot serve.
+    # Awaited, not run in a thread: pending generations hold no threads.
+    return await generate_questions_async(skills)
+
+
+@app.post("/generate-questions/stream")
+async def generate_questions_stream_api(payload: dict):
+    """
+    Same questions as /generate-questions as NDJSON, one {"skill", "text",
+    "keywords", "id"} object per line, each sent as soon as it is ready.
+    """
     skills = payload.get("skills")
 
     if not isinstance(skills, list) or not skills:
         raise HTTPException(status_code=400, detail="skills must be a non-empty list")
 
-    return generate_questions(skills)
+    # Errors before the first byte still get a proper status code
+    questions = await stream_questions(skills)
+
+    async def lines():
+        async for question in questions:
+            yield json.dumps(question) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 # -------------------------
 # Response evaluation
 # -------------------------
-from fastapi.concurrency import run_in_threadpool
-
 @app.post("/evaluate-response")
 async def evaluate_response_api(payload: dict):
-    return await run_in_threadpool(evaluate, payload)
+    await _require("embeddings", "sentiment")
+    return await evaluate_async(payload)
+
+
+@app.post("/evaluate-responses")
+async def evaluate_responses_api(payload: list = Body(...)):
+    if not payload:
+        raise HTTPException(status_code=400, detail="payload must be a non-empty list")
+
+    if len(payload) > MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many items (max {MAX_BATCH_ITEMS})",
+        )
+
+    await _require("embeddings", "sentiment")
+    return await inference_executor.run(evaluate_many, payload)
+
+
+# -------------------------
+# Streaming evaluation (live transcript)
+# -------------------------
+@app.websocket("/evaluate-stream")
+async def evaluate_stream_api(websocket: WebSocket):
+    """
+    Protocol (JSON messages):
+      client -> {"question": {...}}                 open the session
+      client -> {"chunk": "new transcript text"}    server replies partial scores
+      client -> {"final": true, "chunk": "..."}     server replies full result, closes
+    """
+    await websocket.accept()
+
+    try:
+        opening = await _receive_object(websocket)
+        if opening is None:
+            return
+        try:
+            await _require("embeddings", "sentiment")
+        except SubsystemUnavailable as e:
+            await websocket.send_json({"error": str(e)})
+            await websocket.close(code=1011)
+            return
+
+        try:
+            session = await inference_executor.run(start_session, opening.get("question"))
+        except ValueError as e:
+            await websocket.send_json({"error": str(e)})
+            await websocket.close(code=1003)
+            return
+
+        await websocket.send_json({"ready": True})
+
+        while True:
+            message = await _receive_object(websocket)
+            if message is None:
+                return
+            chunk = message.get("chunk") or ""
+            if not isinstance(chunk, str):
+                await websocket.send_json({"error": "chunk must be a string"})
+                await websocket.close(code=1003)
+                return
+
+            if message.get("final"):
+                result = await inference_executor.run(session.finalize, chunk)
+                await websocket.send_json(result)
+                await websocket.close()
+                return
+
+            snapshot = await inference_executor.run(session.add_chunk, chunk)
+            await websocket.send_json(snapshot)
+
+    except ExecutorSaturated as e:
+        await websocket.send_json({"error": str(e)})
+        await websocket.close(code=1013)  # try again later
+    except WebSocketDisconnect:
+        return
+    except Exception as e:
+        # Never expose internal errors to frontend
+        print(f"ERROR in streaming evaluation: {e}")
+        ERRORS.inc(component="evaluate_stream")
+        await websocket.send_json({"error": "Evaluation failed"})
+        await websocket.close(code=1011)
+
+
+async def _receive_object(websocket):
+    """
+    Next message as a JSON object, or None after replying with an error and
+    closing the socket (1003: unsupported data).
+    """
+    try:
+        message = json.loads(await websocket.receive_text())
+    except ValueError:
+        message = None
+        error = "Message is not valid JSON"
+    else:
+        error = "Message must be a JSON object"
+
+    if isinstance(message, dict):
+        return message
+    await websocket.send_json({"error": error})
+    await websocket.close(code=1003)
+    return None
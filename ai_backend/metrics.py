@@ -0,0 +1,180 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# -------------------------
+# Minimal Prometheus text-format metrics (per process)
+# -------------------------
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+_METRICS = []
+_COLLECTORS = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _METRICS.append(self)
+
+    def inc(self, amount=1.0, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+        _METRICS.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                    lines.append(f"{self.name}_bucket{le} {count}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+                lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+def register_collector(collect):
+    """
+    Register `collect()` -> iterable of (name, type, documentation, labels_dict, value)
+    for values owned elsewhere (cache and executor counters), read at scrape time.
+    """
+    _COLLECTORS.append(collect)
+
+
+def render_metrics():
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+
+    # Collectors may yield several metrics in any order: the exposition
+    # format needs each metric's samples together under one header
+    families = {}  # name -> (kind, documentation, [sample lines])
+    for collect in _COLLECTORS:
+        try:
+            samples = list(collect())
+        except Exception as e:
+            print(f"ERROR collecting metrics: {e}")
+            continue
+        for name, kind, documentation, labels, value in samples:
+            family = families.setdefault(name, (kind, documentation, []))
+            family[2].append(
+                f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}"
+            )
+
+    for name, (kind, documentation, samples) in families.items():
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------
+# Shared metrics
+# -------------------------
+STAGE_SECONDS = Histogram(
+    "prism_stage_duration_seconds",
+    "Time spent in each request processing stage.",
+    ["stage"],
+)
+PDF_PAGE_SECONDS = Histogram(
+    "prism_pdf_page_extract_seconds",
+    "Text extraction time per PDF page.",
+    ["backend"],
+)
+PDF_BACKEND_FAILURES = Counter(
+    "prism_pdf_backend_failures_total",
+    "PDF extractions that failed or found no text and fell back to the next backend.",
+    ["backend"],
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "prism_executor_queue_wait_seconds",
+    "Time jobs wait in an executor queue before starting.",
+    ["pool"],
+)
+GEMINI_PARSE_FAILURES = Counter(
+    "prism_gemini_parse_failures_total",
+    "Gemini responses that could not be parsed as a JSON question array.",
+)
+GEMINI_COALESCED = Counter(
+    "prism_gemini_coalesced_total",
+    "Question generations that joined an identical in-flight Gemini call.",
+)
+GEMINI_HEDGES = Counter(
+    "prism_gemini_hedged_requests_total",
+    "Gemini requests sent to a backup model because the primary was slower than its p95.",
+    ["model"],
+)
+GEMINI_DEADLINE_EXCEEDED = Counter(
+    "prism_gemini_deadline_exceeded_total",
+    "Gemini requests abandoned at their deadline.",
+)
+ERRORS = Counter(
+    "prism_errors_total",
+    "Errors caught and turned into fallback results.",
+    ["component"],
+)
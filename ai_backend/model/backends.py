@@ -0,0 +1,247 @@
+import json
+import os
+
+import numpy as np
+
+# -----------------------------
+# Embedding inference backends
+# -----------------------------
+#
+#   torch      SentenceTransformer on PyTorch (default)
+#   onnx       exported ONNX graph on ONNX Runtime
+#   onnx-int8  the same graph with dynamically int8-quantized weights
+#
+# All backends expose the SentenceTransformer subset used by the evaluator:
+# encode(...) and get_sentence_embedding_dimension().
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+DEFAULT_ONNX_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), ".cache", "onnx"
+)
+
+_ONNX_FILES = {"onnx": "model.onnx", "onnx-int8": "model.int8.onnx"}
+_CONFIG_FILE = "prism_onnx.json"
+
+
+def load_embedding_model(model_name, backend="torch", onnx_dir=None, intra_op_threads=None,
+                         snapshot_dir=None):
+    """
+    Load `model_name` with the requested inference backend.
+    ONNX backends export the model on first use if no export exists yet.
+    The torch backend loads from `snapshot_dir` (see model/snapshot.py) when
+    it holds a snapshot of `model_name`, without any hub lookup.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}, expected one of {BACKENDS}")
+
+    if backend == "torch":
+        if snapshot_dir:
+            from model.snapshot import load_snapshot, read_manifest
+
+            manifest = read_manifest(snapshot_dir)
+            if manifest and manifest.get("model") == model_name:
+                return load_snapshot(snapshot_dir)
+            if manifest:
+                print(f"WARNING: snapshot at {snapshot_dir} is for {manifest.get('model')}, ignoring it")
+
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name, device="cpu")
+
+    model_dir = onnx_dir or os.path.join(DEFAULT_ONNX_DIR, model_name.replace("/", "_"))
+    model_path = os.path.join(model_dir, _ONNX_FILES[backend])
+    if os.path.exists(model_path):
+        exported = read_onnx_config(model_dir).get("model")
+        if exported != model_name:
+            if onnx_dir:
+                # A configured directory may be shared: never overwrite it
+                raise ValueError(
+                    f"ONNX export at {model_dir} is for {exported}, not {model_name}"
+                )
+            print(f"WARNING: ONNX export at {model_dir} is for {exported}, re-exporting {model_name}...")
+            export_onnx(model_name, model_dir, quantize=(backend == "onnx-int8"))
+    else:
+        print(f"No ONNX export at {model_dir}, exporting {model_name}...")
+        export_onnx(model_name, model_dir, quantize=(backend == "onnx-int8"))
+
+    return OnnxEmbeddingModel(model_dir, _ONNX_FILES[backend], intra_op_threads)
+
+
+def read_onnx_config(model_dir):
+    """
+    The export's prism_onnx.json, or {} if it is missing or unreadable.
+    """
+    try:
+        with open(os.path.join(model_dir, _CONFIG_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class OnnxEmbeddingModel:
+    """
+    Sentence embedding model running on ONNX Runtime.
+
+    Reproduces the SentenceTransformer pipeline (tokenize -> transformer ->
+    mean pooling -> optional L2 normalization) with NumPy around the graph.
+    """
+
+    def __init__(self, model_dir, model_file="model.onnx", intra_op_threads=None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_dir, _CONFIG_FILE), "r", encoding="utf-8") as f:
+            config = json.load(f)
+
+        self.max_seq_length = config["max_seq_length"]
+        self.normalize = config["normalize"]
+        self.dim = config["dim"]
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = int(intra_op_threads)
+
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, sentences, batch_size=32, convert_to_tensor=False, **kwargs):
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        chunks = []
+        for start in range(0, len(sentences), batch_size):
+            chunks.append(self._encode_batch(sentences[start:start + batch_size]))
+
+        embeddings = (
+            np.concatenate(chunks) if chunks
+            else np.zeros((0, self.dim), dtype=np.float32)
+        )
+        if single:
+            embeddings = embeddings[0]
+
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+    def _encode_batch(self, texts):
+        encoded = self.tokenizer(
+            list(texts),
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np",
+        )
+        feeds = {
+            name: encoded[name].astype(np.int64)
+            for name in self._input_names
+        }
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # Mean pooling over non-padding tokens
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if self.normalize:
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def export_onnx(model_name, output_dir, quantize=True, opset=14):
+    """
+    Export the SentenceTransformer's transformer to ONNX (model.onnx) and,
+    if `quantize`, a dynamically int8-quantized copy (model.int8.onnx).
+    Requires torch; serving the export afterwards does not.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0]
+    pooling = next((m for m in st_model if isinstance(m, Pooling)), None)
+    pooling_mode = (
+        pooling.get_pooling_mode_str() if hasattr(pooling, "get_pooling_mode_str")
+        else getattr(pooling, "pooling_mode", None)
+    ) if pooling is not None else None
+    if pooling_mode != "mean":
+        raise RuntimeError(f"{model_name}: only mean-pooling models can be exported")
+
+    os.makedirs(output_dir, exist_ok=True)
+    transformer.tokenizer.save_pretrained(output_dir)
+
+    dummy = transformer.tokenizer(["export"], return_tensors="pt")
+    input_names = [
+        name for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in dummy
+    ]
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    model_path = os.path.join(output_dir, _ONNX_FILES["onnx"])
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(transformer.auto_model.eval()),
+            tuple(dummy[name] for name in input_names),
+            model_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+
+    with open(os.path.join(output_dir, _CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "model": model_name,
+                "max_seq_length": st_model.max_seq_length,
+                "normalize": any(isinstance(m, Normalize) for m in st_model),
+                "dim": st_model.get_sentence_embedding_dimension(),
+            },
+            f,
+            indent=2,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(
+            model_path,
+            os.path.join(output_dir, _ONNX_FILES["onnx-int8"]),
+            weight_type=QuantType.QInt8,
+        )
+
+    print(f"Exported {model_name} to {output_dir}")
+
+
+if __name__ == "__main__":
+    # cd ai_backend && python -m model.backends [model_name] [output_dir]
+    import sys
+
+    name = sys.argv[1] if len(sys.argv) > 1 else "all-MiniLM-L6-v2"
+    out = sys.argv[2] if len(sys.argv) > 2 else os.path.join(
+        DEFAULT_ONNX_DIR, name.replace("/", "_")
+    )
+    export_onnx(name, out)
@@ -0,0 +1,107 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Collects single-text encode requests from many threads and runs them
+    through the embedding model as one batch.
+
+    A batch is flushed when it reaches `max_batch_size` or when the oldest
+    pending text has waited `max_wait_ms`, whichever comes first. Each caller
+    receives only its own embedding.
+    """
+
+    def __init__(self, encode_batch, max_batch_size=32, max_wait_ms=5.0):
+        self._encode_batch = encode_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def submit(self, text) -> Future:
+        """
+        Queue a text for encoding and return a Future for its embedding.
+        """
+        future = Future()
+        # Under the lock: a worker that is ending either finds this text
+        # queued and hands it on, or is already replaced here
+        with self._lock:
+            self._ensure_worker()
+            self._queue.put((text, future))
+        return future
+
+    def encode(self, text):
+        """
+        Blocking encode of a single text through the shared batch.
+        """
+        return self.submit(text).result()
+
+    def _ensure_worker(self):
+        # Called with self._lock held. Threads do not survive a fork: the
+        # child starts its own worker and queue.
+        if self._pid != os.getpid():
+            self._queue = queue.Queue()
+            self._thread = None
+            self._pid = os.getpid()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="embedding-microbatcher", daemon=True
+            )
+            self._thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    # Window closed: still take whatever is already queued
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        try:
+            while True:
+                self._process(self._collect())
+        finally:
+            # Only a BaseException ends the loop: a new worker takes over
+            # whatever is still queued
+            with self._lock:
+                self._thread = None
+                if not self._queue.empty():
+                    self._ensure_worker()
+
+    def _process(self, batch):
+        # Callers that gave up (cancelled futures) are not encoded
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        futures = [future for _, future in batch]
+        if not batch:
+            return
+
+        try:
+            embeddings = self._encode_batch([text for text, _ in batch])
+            for future, embedding in zip(futures, embeddings):
+                future.set_result(embedding)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # Also on a BaseException: never leave callers waiting
+            for future in futures:
+                if not future.done():
+                    future.set_exception(RuntimeError("embedding batch did not complete"))
@@ -1,119 +1,309 @@
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from sentence_transformers import SentenceTransformer, util
-from functools import lru_cache
+import asyncio
+import numpy as np
 import os
+import threading
+
+from model.backends import load_embedding_model
+from model.batcher import MicroBatcher
+from model.keyword_store import KeywordEmbeddingStore
+from model.snapshot import default_snapshot_dir, read_manifest, seed_keyword_store
+from metrics import ERRORS, STAGE_SECONDS, register_collector
 # -----------------------------
 # Lazy-loaded global model
 # -----------------------------
 
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+# torch | onnx | onnx-int8 (see model/backends.py)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR") or None
+# Offline snapshot written by `python -m model.snapshot` ("" disables)
+EMBEDDING_SNAPSHOT_DIR = os.getenv(
+    "EMBEDDING_SNAPSHOT_DIR", default_snapshot_dir(EMBEDDING_MODEL_NAME)
+)
+
 _MODEL = None
+_MODEL_LOCK = threading.Lock()
 
 def get_embedding_model():
     """
-    Lazily initialize and cache the SentenceTransformer model.
-    Ensures the model is only loaded once per Python process.
+    Lazily initialize and cache the embedding model for EMBEDDING_BACKEND.
+    Ensures the model is only loaded once per Python process, even when
+    several threads ask for it at once.
     """
     global _MODEL
     if _MODEL is None:
-        _MODEL = SentenceTransformer(
-            "all-MiniLM-L6-v2",
-            device="cpu"
-        )
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                _MODEL = load_embedding_model(
+                    EMBEDDING_MODEL_NAME,
+                    EMBEDDING_BACKEND,
+                    onnx_dir=EMBEDDING_ONNX_DIR,
+                    intra_op_threads=int(os.getenv("INFERENCE_INTRA_OP_THREADS", "0")) or None,
+                    snapshot_dir=EMBEDDING_SNAPSHOT_DIR or None,
+                )
     return _MODEL
 
 
+# -----------------------------
+# Micro-batched response encoding
+# -----------------------------
+
+MICROBATCH_ENABLED = os.getenv("EMBED_MICROBATCH", "true") == "true"
+MICROBATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+
+_BATCHER = None
+
+def get_batcher():
+    """
+    Lazily create the process-wide MicroBatcher in front of the embedding model.
+    """
+    global _BATCHER
+    if _BATCHER is None:
+        _BATCHER = MicroBatcher(
+            encode_responses,
+            max_batch_size=MICROBATCH_MAX_SIZE,
+            max_wait_ms=MICROBATCH_MAX_WAIT_MS,
+        )
+    return _BATCHER
+
+
+def encode_responses(texts):
+    """
+    Encode a list of response texts in one forward pass. Called directly by
+    batch callers and by the micro-batcher; concurrent inference calls from
+    several threads are safe.
+    """
+    with STAGE_SECONDS.time(stage="encode_responses"):
+        return get_embedding_model().encode(texts, convert_to_numpy=True)
+
+
+def encode_response(response):
+    """
+    Encode a single response text. Concurrent callers are coalesced into one
+    batched forward pass when micro-batching is enabled.
+    """
+    if MICROBATCH_ENABLED:
+        return get_batcher().encode(response)
+    return encode_responses([response])[0]
+
+
+async def encode_response_async(response):
+    """
+    encode_response() awaited on the event loop: waiting for the batch holds
+    no worker thread, so batches can fill up to EMBED_BATCH_MAX_SIZE.
+    Returns None without micro-batching (encode on a worker instead).
+    """
+    if not MICROBATCH_ENABLED:
+        return None
+    return await asyncio.wrap_future(get_batcher().submit(response))
+
+
 # -----------------------------
 # Cached keyword embeddings
 # -----------------------------
 
-@lru_cache(maxsize=256)
-def get_keyword_embeddings(keywords_tuple):
+KEYWORD_STORE_DIR = os.getenv(
+    "KEYWORD_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "keyword_embeddings"),
+)
+KEYWORD_STORE_MAX_ENTRIES = int(os.getenv("KEYWORD_STORE_MAX_ENTRIES", "20000"))
+KEYWORD_STORE_MEMORY_ENTRIES = int(os.getenv("KEYWORD_STORE_MEMORY_ENTRIES", "4096"))
+
+_KEYWORD_STORE = None
+_KEYWORD_STORE_LOCK = threading.Lock()
+
+def embedding_model_id():
+    """
+    Identifies the vector space produced by the current model and backend.
+    Quantized backends produce slightly different vectors: never mix them.
+    """
+    if EMBEDDING_BACKEND == "torch":
+        return EMBEDDING_MODEL_NAME
+    return f"{EMBEDDING_MODEL_NAME}-{EMBEDDING_BACKEND}"
+
+
+def get_keyword_store():
+    """
+    Lazily open the per-keyword embedding store for the current model.
+    Set KEYWORD_STORE_DIR="" to keep it in memory only.
     """
-    Given a tuple of keyword strings, return a cached tensor of embeddings.
-    Using a tuple makes it hashable for lru_cache.
+    global _KEYWORD_STORE
+    if _KEYWORD_STORE is None:
+        with _KEYWORD_STORE_LOCK:
+            if _KEYWORD_STORE is None:
+                _seed_keyword_store()
+                _KEYWORD_STORE = KeywordEmbeddingStore(
+                    embedding_model_id(),
+                    get_embedding_model().get_sentence_embedding_dimension(),
+                    directory=KEYWORD_STORE_DIR or None,
+                    max_entries=KEYWORD_STORE_MAX_ENTRIES,
+                    memory_entries=KEYWORD_STORE_MEMORY_ENTRIES,
+                )
+    return _KEYWORD_STORE
+
+
+def _seed_keyword_store():
+    # Fresh containers start from the keyword vectors baked into the snapshot
+    if EMBEDDING_BACKEND != "torch" or not (KEYWORD_STORE_DIR and EMBEDDING_SNAPSHOT_DIR):
+        return
+    try:
+        manifest = read_manifest(EMBEDDING_SNAPSHOT_DIR)
+        if manifest and manifest.get("model") == EMBEDDING_MODEL_NAME:
+            if seed_keyword_store(EMBEDDING_SNAPSHOT_DIR, embedding_model_id(), KEYWORD_STORE_DIR):
+                print(f"Keyword store seeded from snapshot {EMBEDDING_SNAPSHOT_DIR}")
+    except Exception as e:
+        print(f"WARNING: could not seed keyword store from snapshot: {e}")
+
+
+def get_keyword_embeddings(keywords):
     """
-    if not keywords_tuple:
+    Return a (len(keywords), dim) matrix of keyword embeddings.
+    Each keyword is cached individually, so only keywords never seen
+    before (by this model) are encoded.
+    """
+    keywords = list(keywords)
+    if not keywords:
         return None
-    model = get_embedding_model()
-    # Convert tuple back to list for encoding
-    return model.encode(list(keywords_tuple), convert_to_tensor=True)
+    return get_keyword_store().get_many(keywords, _encode_keywords)
 
 
-# --- Optimized semantic_keyword_score (With Caching + Weights) --- #
-def semantic_keyword_score(response, expected_keywords_weighted, threshold=0.7):
+def _encode_keywords(texts):
+    with STAGE_SECONDS.time(stage="encode_keywords"):
+        return get_embedding_model().encode(texts, convert_to_numpy=True)
+
+
+def _collect_keyword_store_metrics():
+    if _KEYWORD_STORE is None:
+        return
+    yield ("prism_keyword_cache_hits_total", "counter",
+           "Keyword embeddings served from the keyword store.", {}, _KEYWORD_STORE.hits)
+    yield ("prism_keyword_cache_misses_total", "counter",
+           "Keywords that had to be encoded.", {}, _KEYWORD_STORE.misses)
+    yield ("prism_keyword_cache_entries", "gauge",
+           "Keywords held in the keyword store.", {}, len(_KEYWORD_STORE))
+
+
+register_collector(_collect_keyword_store_metrics)
+
+
+# -----------------------------
+# Vectorized scoring core
+# -----------------------------
+
+def keyword_weights(expected_keywords_weighted):
     """
-    Compute a weighted semantic keyword score between 0 and 100.
+    Split [{"keyword": ..., "weight": ...}, ...] into a keyword list and a
+    float32 weight vector.
+    """
+    keywords = [item["keyword"] for item in expected_keywords_weighted]
+    weights = np.fromiter(
+        (item.get("weight", 1.0) for item in expected_keywords_weighted),
+        dtype=np.float32,
+        count=len(keywords),
+    )
+    return keywords, weights
 
-    expected_keywords_weighted: list of dicts like:
-        [{"keyword": "python", "weight": 1.5}, ...]
 
-    Returns:
-        (score_0_to_100, matched_keywords_list, per_keyword_similarity_dict)
+def cosine_similarity_matrix(a, b):
     """
-    # Fallback values in case of error
-    fallback_score = 0.0
-    fallback_matched = []
-    fallback_semantic_scores = {
-        item["keyword"]: 0.0 for item in expected_keywords_weighted
-    }
+    Cosine similarity between the rows of `a` (R, D) and `b` (K, D) -> (R, K).
+    A 1-D `a` is treated as a single row.
+    """
+    with STAGE_SECONDS.time(stage="cos_sim"):
+        a = np.atleast_2d(np.asarray(a, dtype=np.float32))
+        b = np.atleast_2d(np.asarray(b, dtype=np.float32))
+        a = a / np.clip(np.linalg.norm(a, axis=1, keepdims=True), 1e-12, None)
+        b = b / np.clip(np.linalg.norm(b, axis=1, keepdims=True), 1e-12, None)
+        return a @ b.T
 
-    try:
-        # 1. Extract raw keywords, weights, and total weight
-        raw_keywords = [item["keyword"] for item in expected_keywords_weighted]
-        weights = [item["weight"] for item in expected_keywords_weighted]
-        total_possible_weight = sum(weights)
 
-        if not raw_keywords or total_possible_weight <= 0:
-            return 0.0, [], {}
+def score_keyword_matrix(similarities, weights, threshold=0.7):
+    """
+    Weighted keyword scores computed entirely with array operations.
 
-        # 2. Get embeddings (with caching for keyword side)
-        model = get_embedding_model()
-        response_embedding = model.encode(response, convert_to_tensor=True)
+    similarities: (K,) for one response or (R, K) for R responses.
+    weights: (K,) shared by every row, or (R, K) per row; a 0 weight
+        excludes that keyword from a row.
 
-        # Use cached embeddings for keywords
-        keyword_embeddings = get_keyword_embeddings(tuple(raw_keywords))
-        if keyword_embeddings is None:
-            return 0.0, [], {}
+    Returns (scores_0_to_100, matched_mask, rounded_similarities) with shapes
+    (), (K,), (K,) for one response or (R,), (R, K), (R, K) for a matrix.
+    """
+    # float64 so rounded values serialize exactly like Python's round()
+    sims = np.asarray(similarities, dtype=np.float64)
+    weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), sims.shape)
 
-        scores = util.cos_sim(response_embedding, keyword_embeddings)[0]
+    matched = (sims >= threshold) & (weights > 0)
+    total = weights.sum(axis=-1)
+    matched_sum = np.where(matched, weights, 0.0).sum(axis=-1)
 
-        # 3. Calculate WEIGHTED score
-        matched_weight_sum = 0.0
-        matched_keywords = []
-        semantic_scores = {}
+    ratio = np.divide(
+        matched_sum, total, out=np.zeros_like(total), where=total > 0
+    )
+    return np.round(ratio * 100, 2), matched, np.round(sims, 3)
 
-        for i, score in enumerate(scores):
-            keyword_item = expected_keywords_weighted[i]
-            keyword = keyword_item["keyword"]
-            weight = float(keyword_item.get("weight", 1.0))
 
-            # Record raw similarity for detail
-            sim = float(score)
-            semantic_scores[keyword] = round(sim, 3)
+# --- Optimized semantic_keyword_score (With Caching + Weights) --- #
+def semantic_keyword_score(response, expected_keywords_weighted, threshold=0.7,
+                           keyword_embeddings=None, response_embedding=None):
+    """
+    Compute a weighted semantic keyword score between 0 and 100.
 
-            if sim >= threshold:
-                matched_weight_sum += weight
-                matched_keywords.append(keyword)
+    expected_keywords_weighted: list of dicts like:
+        [{"keyword": "python", "weight": 1.5}, ...]
+    keyword_embeddings: optional precomputed (K, dim) matrix aligned with
+        expected_keywords_weighted; skips keyword encoding entirely.
+    response_embedding: optional precomputed response vector.
 
-        score = (
-            matched_weight_sum / total_possible_weight
-            if total_possible_weight > 0
-            else 0.0
-        )
+    Returns:
+        (score_0_to_100, matched_keywords_list, per_keyword_similarity_dict, ok)
+        where ok is False when scoring failed and the zero scores are a fallback.
+    """
+    try:
+        keywords, weights = keyword_weights(expected_keywords_weighted)
+        if not keywords or weights.sum() <= 0:
+            return 0.0, [], {}, True
+
+        # Response side goes through the micro-batcher, keyword side
+        # through the per-keyword store
+        if response_embedding is None:
+            response_embedding = encode_response(response)
+        if keyword_embeddings is None:
+            keyword_embeddings = get_keyword_embeddings(keywords)
+
+        sims = cosine_similarity_matrix(response_embedding, keyword_embeddings)[0]
+        score, matched_mask, rounded = score_keyword_matrix(sims, weights, threshold)
 
-        return round(score * 100, 2), matched_keywords, semantic_scores
+        matched_keywords = [kw for kw, hit in zip(keywords, matched_mask.tolist()) if hit]
+        semantic_scores = dict(zip(keywords, rounded.tolist()))
+
+        return float(score), matched_keywords, semantic_scores, True
 
     except Exception as e:
         # Log the error for debugging purposes (in a real system, use proper logging)
         print(f"ERROR in semantic_keyword_score: {e}")
+        ERRORS.inc(component="semantic_keyword_score")
         # Return sensible fallback values instead of crashing
-        return fallback_score, fallback_matched, fallback_semantic_scores
+        return 0.0, [], {
+            item.get("keyword"): 0.0 for item in expected_keywords_weighted
+            if isinstance(item, dict)
+        }, False
 
-_analyzer = SentimentIntensityAnalyzer()
+_ANALYZER = None
+
+def get_sentiment_analyzer():
+    """
+    Lazily build the VADER analyzer (loads its lexicon once per process).
+    """
+    global _ANALYZER
+    if _ANALYZER is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _ANALYZER = SentimentIntensityAnalyzer()
+    return _ANALYZER
 
 # --- sentiment_score and interpret_sentiment stay simple/cheap --- #
 def sentiment_score(response):
-    score = _analyzer.polarity_scores(response)["compound"]
+    score = get_sentiment_analyzer().polarity_scores(response)["compound"]
     return round((score + 1) * 50, 2)  # -> 0..100
 
 
@@ -126,10 +316,168 @@ def interpret_sentiment(score):
         return "negative"
 
 
+# --- Batched semantic_keyword_score (one encode per side) --- #
+def semantic_keyword_scores_batch(responses, expected_keywords_list, threshold=0.7,
+                                  keyword_embeddings_list=None):
+    """
+    Batched counterpart of semantic_keyword_score.
+
+    Encodes every response in a single forward pass and every distinct keyword
+    across all questions in another, then scores the whole response x keyword
+    similarity matrix at once with a per-row weight matrix.
+
+    keyword_embeddings_list: optional per-row precomputed keyword matrices
+    (or None entries); only keywords not covered by them are looked up.
+
+    Returns a list of (score_0_to_100, matched_keywords_list,
+    per_keyword_similarity_dict, ok) tuples aligned with `responses`.
+    """
+    # Distinct keywords across the whole batch -> column index
+    columns = {}
+    row_columns = []
+    for expected in expected_keywords_list:
+        row_columns.append(
+            [columns.setdefault(item["keyword"], len(columns)) for item in expected]
+        )
+
+    if not responses or not columns:
+        return [(0.0, [], {}, True) for _ in responses]
+
+    try:
+        weight_matrix = np.zeros((len(responses), len(columns)), dtype=np.float32)
+        for row, (expected, cols) in enumerate(zip(expected_keywords_list, row_columns)):
+            if cols:
+                np.add.at(weight_matrix[row], cols, keyword_weights(expected)[1])
+
+        response_embeddings = encode_responses(list(responses))
+
+        known = {}
+        for expected, vectors in zip(expected_keywords_list, keyword_embeddings_list or []):
+            if vectors is not None:
+                known.update(zip((item["keyword"] for item in expected), vectors))
+        missing = [kw for kw in columns if kw not in known]
+        if missing:
+            known.update(zip(missing, get_keyword_embeddings(missing)))
+        keyword_embeddings = np.stack([known[kw] for kw in columns])
+
+        sims = cosine_similarity_matrix(response_embeddings, keyword_embeddings)
+        scores, matched_mask, rounded = score_keyword_matrix(sims, weight_matrix, threshold)
+    except Exception as e:
+        print(f"ERROR in semantic_keyword_scores_batch: {e}")
+        ERRORS.inc(component="semantic_keyword_scores_batch")
+        return [
+            (0.0, [], {item["keyword"]: 0.0 for item in expected}, False)
+            for expected in expected_keywords_list
+        ]
+
+    results = []
+    for row, (expected, cols) in enumerate(zip(expected_keywords_list, row_columns)):
+        if not cols or weight_matrix[row].sum() <= 0:
+            results.append((0.0, [], {}, True))
+            continue
+
+        keywords = [item["keyword"] for item in expected]
+        hits = matched_mask[row, cols].tolist()
+        results.append((
+            float(scores[row]),
+            [kw for kw, hit in zip(keywords, hits) if hit],
+            dict(zip(keywords, rounded[row, cols].tolist())),
+            True,
+        ))
+
+    return results
+
+
+def build_result(response, question_text, expected_keywords_weighted,
+                 kw_score, matched, semantic_scores, kw_weight, sent_weight,
+                 degraded=False):
+    """
+    Combine keyword and sentiment scores into the evaluation result structure.
+    degraded: keyword scoring failed and kw_score is a fallback; the result
+    carries "degraded": True so that it is never cached.
+    """
+    sent_score = sentiment_score(response)
+
+    # Normalize weights if they don't sum to 1 (optional safety)
+    total_weight = kw_weight + sent_weight
+    if total_weight <= 0:
+        kw_w_norm, sent_w_norm = 0.8, 0.2
+    else:
+        kw_w_norm = kw_weight / total_weight
+        sent_w_norm = sent_weight / total_weight
+
+    final_score = round(
+        kw_w_norm * kw_score + sent_w_norm * sent_score, 2
+    )
+
+    # Missing keywords
+    all_keywords = [item["keyword"] for item in expected_keywords_weighted]
+    missing = [kw for kw in all_keywords if kw not in matched]
+
+    sentiment_label = interpret_sentiment(sent_score)
+    suggestion = (
+        f"Try mentioning: {', '.join(missing)}." if missing else ""
+    )
+
+    result = {
+        "question": question_text,
+        "response": response,
+        "scores": {
+            "keyword": kw_score,
+            "sentiment": sent_score,
+            "final": final_score,
+            "weights": {
+                "keyword_weight": kw_w_norm,
+                "sentiment_weight": sent_w_norm,
+            },
+        },
+        "feedback": {
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+            "sentiment": sentiment_label,
+            "suggestion": suggestion,
+            "keyword_detail": semantic_scores,
+        },
+    }
+    if degraded:
+        result["degraded"] = True
+    return result
+
+
+def _error_result(response, question_obj):
+    """
+    Guaranteed fallback structure for a failed evaluation.
+    """
+    return {
+        "question": question_obj.get("text", "Error: Unknown Question"),
+        "response": response,
+        "scores": {
+            "keyword": 0.0,
+            "sentiment": 50.0,
+            "final": 25.0,
+            "weights": {
+                "keyword_weight": 0.8,
+                "sentiment_weight": 0.2,
+            },
+        },
+        "feedback": {
+            "matched_keywords": [],
+            "missing_keywords": ["System Error"],
+            "sentiment": "neutral",
+            "suggestion": "Evaluation failed due to system error.",
+            "keyword_detail": {},
+        },
+        "degraded": True,
+    }
+
+
 # --- Optimized evaluate_response --- #
-def evaluate_response(response, question_obj, kw_weight=0.8, sent_weight=0.2):
+def evaluate_response(response, question_obj, kw_weight=0.8, sent_weight=0.2,
+                      keyword_embeddings=None, response_embedding=None):
     """
     Evaluate a response against a question and expected keywords.
+    keyword_embeddings: optional precomputed matrix for expected_keywords.
+    response_embedding: optional precomputed vector for the response.
 
     question_obj format:
     {
@@ -143,82 +491,58 @@ def evaluate_response(response, question_obj, kw_weight=0.8, sent_weight=0.2):
         question_text = question_obj["text"]
         expected_keywords_weighted = question_obj.get("expected_keywords", [])
 
-        kw_score, matched, semantic_scores = semantic_keyword_score(
-            response, expected_keywords_weighted
+        kw_score, matched, semantic_scores, ok = semantic_keyword_score(
+            response, expected_keywords_weighted,
+            keyword_embeddings=keyword_embeddings,
+            response_embedding=response_embedding,
         )
-        sent_score = sentiment_score(response)
-
-        # Normalize weights if they don't sum to 1 (optional safety)
-        total_weight = kw_weight + sent_weight
-        if total_weight <= 0:
-            kw_w_norm, sent_w_norm = 0.8, 0.2
-        else:
-            kw_w_norm = kw_weight / total_weight
-            sent_w_norm = sent_weight / total_weight
-
-        final_score = round(
-            kw_w_norm * kw_score + sent_w_norm * sent_score, 2
-        )
-
-        # Missing keywords
-        all_keywords = [item["keyword"] for item in expected_keywords_weighted]
-        missing = [kw for kw in all_keywords if kw not in matched]
 
-        sentiment_label = interpret_sentiment(sent_score)
-        suggestion = (
-            f"Try mentioning: {', '.join(missing)}." if missing else ""
+        return build_result(
+            response, question_text, expected_keywords_weighted,
+            kw_score, matched, semantic_scores, kw_weight, sent_weight,
+            degraded=not ok,
         )
 
-        result = {
-            "question": question_text,
-            "response": response,
-            "scores": {
-                "keyword": kw_score,
-                "sentiment": sent_score,
-                "final": final_score,
-                "weights": {
-                    "keyword_weight": kw_w_norm,
-                    "sentiment_weight": sent_w_norm,
-                },
-            },
-            "feedback": {
-                "matched_keywords": matched,
-                "missing_keywords": missing,
-                "sentiment": sentiment_label,
-                "suggestion": suggestion,
-                "keyword_detail": semantic_scores,
-            },
-        }
-
-        return result
-
     except Exception as e:
         # Catch fatal errors (e.g., malformed question_obj input)
         print(f"FATAL ERROR in evaluate_response: {e}")
-        # Guaranteed fallback structure
-        return {
-            "question": question_obj.get("text", "Error: Unknown Question"),
-            "response": response,
-            "scores": {
-                "keyword": 0.0,
-                "sentiment": 50.0,
-                "final": 25.0,
-                "weights": {
-                    "keyword_weight": 0.8,
-                    "sentiment_weight": 0.2,
-                },
-            },
-            "feedback": {
-                "matched_keywords": [],
-                "missing_keywords": ["System Error"],
-                "sentiment": "neutral",
-                "suggestion": "Evaluation failed due to system error.",
-                "keyword_detail": {},
-            },
-        }
+        ERRORS.inc(component="evaluate_response")
+        return _error_result(response, question_obj)
+
 
-# Warm-up to avoid first-request latency
-if os.getenv("WARMUP", "true") == "true":
-    print("Warming up embedding model...")
-    _ = get_embedding_model().encode("warmup", convert_to_tensor=True)
-    print("Embedding model ready")
+# --- Batched evaluate_response --- #
+def evaluate_responses(pairs, kw_weight=0.8, sent_weight=0.2,
+                       keyword_embeddings_list=None):
+    """
+    Evaluate many (response, question_obj) pairs, e.g. a whole interview
+    session, with one batched encode and one similarity matrix.
+    keyword_embeddings_list: optional precomputed keyword matrices per pair.
+
+    Returns a list of result dicts aligned with `pairs`, each in the same
+    format as evaluate_response.
+    """
+    responses = [response for response, _ in pairs]
+    expected_keywords_list = [
+        question_obj.get("expected_keywords", []) for _, question_obj in pairs
+    ]
+
+    keyword_results = semantic_keyword_scores_batch(
+        responses, expected_keywords_list,
+        keyword_embeddings_list=keyword_embeddings_list,
+    )
+
+    results = []
+    for (response, question_obj), (kw_score, matched, semantic_scores, ok) in zip(
+        pairs, keyword_results
+    ):
+        try:
+            results.append(build_result(
+                response, question_obj["text"], question_obj.get("expected_keywords", []),
+                kw_score, matched, semantic_scores, kw_weight, sent_weight,
+                degraded=not ok,
+            ))
+        except Exception as e:
+            print(f"FATAL ERROR in evaluate_responses: {e}")
+            results.append(_error_result(response, question_obj))
+
+    return results
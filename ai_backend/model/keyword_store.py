@@ -0,0 +1,295 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+import numpy as np
+
+
+def store_paths(model_name, directory):
+    """
+    (array, index, lock) file paths of the store for `model_name` in `directory`.
+    """
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+    return tuple(
+        os.path.join(directory, f"{safe_name}{suffix}")
+        for suffix in (".npy", ".index.json", ".lock")
+    )
+
+
+class KeywordEmbeddingStore:
+    """
+    Per-keyword embedding cache for a single embedding model.
+
+    - Hot layer: in-memory dict of keyword -> vector (LRU, `memory_entries`).
+    - Persistent layer: memory-mapped float32 array on disk plus a JSON
+      keyword -> row index, so embeddings survive restarts (LRU, `max_entries`).
+
+    Only keywords never seen before are sent to the model. Several worker
+    processes may open the same directory: the array is mapped shared, writes
+    take the file lock exclusively and reads of mapped rows take it shared.
+    The array's last row is a header holding the index generation, bumped on
+    every index write, and a dirty flag set while rows are being rewritten:
+    a process whose index generation is behind reloads the index before
+    reading any row, so it never reads a row another worker has reused.
+    """
+
+    def __init__(self, model_name, dim, directory=None,
+                 max_entries=20000, memory_entries=4096):
+        self.model_name = model_name
+        self.dim = int(dim)
+        self.max_entries = max(1, int(max_entries))
+        self.memory_entries = max(0, int(memory_entries))
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()   # keyword -> np.ndarray
+        self._index = OrderedDict()    # keyword -> row (LRU order)
+        self._free_rows = []
+        self._array = None
+        self._lock_path = None
+        self._generation = None
+
+        self.hits = 0
+        self.misses = 0
+
+        if directory:
+            self._open(directory)
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+
+    def _open(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self._array_path, self._index_path, self._lock_path = store_paths(
+            self.model_name, directory
+        )
+
+        with self._file_lock():
+            self._open_locked()
+
+    def _open_locked(self):
+        meta = None
+        if os.path.exists(self._array_path) and os.path.exists(self._index_path):
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                self._array = np.load(self._array_path, mmap_mode="r+")
+            except Exception as e:
+                print(f"WARNING: discarding unreadable keyword store: {e}")
+                meta = None
+
+        if (
+            meta is None
+            or meta.get("model") != self.model_name
+            # One extra row: the header (see _header)
+            or self._array.shape != (self.max_entries + 1, self.dim)
+            or meta.get("generation") != int(self._header()[0])
+            or self._header()[1]
+        ):
+            self._array = np.lib.format.open_memmap(
+                self._array_path, mode="w+", dtype=np.float32,
+                shape=(self.max_entries + 1, self.dim),
+            )
+            self._load_index({"keywords": [], "generation": 0})
+            self._write_index()
+            return
+
+        self._load_index(meta)
+
+    def _header(self):
+        # [index generation, dirty flag] as uint32 in the last row
+        return self._array[self.max_entries].view(np.uint32)
+
+    def _load_index(self, meta):
+        # Index is stored least- to most-recently used
+        self._index = OrderedDict(
+            (keyword, int(row)) for keyword, row in meta["keywords"]
+        )
+        used = set(self._index.values())
+        self._free_rows = [r for r in range(self.max_entries - 1, -1, -1) if r not in used]
+        self._generation = meta.get("generation")
+
+    def _refresh(self):
+        """
+        Bring the index up to date with the array. Call with the file lock
+        held (shared or exclusive).
+        """
+        if self._array is None:
+            return
+
+        generation, dirty = (int(v) for v in self._header()[:2])
+        if dirty:
+            # A writer died while rewriting rows: none of them can be trusted
+            if self._index:
+                print("WARNING: keyword store was left mid-update, ignoring persisted rows")
+            self._load_index({"keywords": [], "generation": None})
+            return
+        if generation == self._generation:
+            return
+
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except Exception as e:
+            print(f"WARNING: could not reload keyword store index: {e}")
+            meta = None
+        if meta is None or meta.get("generation") != generation:
+            self._load_index({"keywords": [], "generation": None})
+            return
+        self._load_index(meta)
+
+    @contextmanager
+    def _file_lock(self, shared=False):
+        if fcntl is None or self._lock_path is None:
+            yield
+            return
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_index(self):
+        # Exclusive file lock held
+        generation = ((self._generation or 0) + 1) & 0xFFFFFFFF
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "model": self.model_name,
+                    "generation": generation,
+                    "keywords": list(self._index.items()),
+                },
+                f,
+            )
+        os.replace(tmp_path, self._index_path)
+
+        header = self._header()
+        header[0] = generation
+        header[1] = 0
+        self._array.flush()
+        self._generation = generation
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+
+    def _lookup(self, keyword):
+        vector = self._memory.get(keyword)
+        if vector is not None:
+            self._memory.move_to_end(keyword)
+            if keyword in self._index:
+                self._index.move_to_end(keyword)
+            return vector
+
+        row = self._index.get(keyword)
+        if row is None:
+            return None
+
+        self._index.move_to_end(keyword)
+        vector = np.array(self._array[row])
+        self._remember(keyword, vector)
+        return vector
+
+    def _remember(self, keyword, vector):
+        if self.memory_entries <= 0:
+            return
+        self._memory[keyword] = vector
+        self._memory.move_to_end(keyword)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _store(self, keyword, vector):
+        self._remember(keyword, vector)
+        if self._array is None:
+            return
+
+        if keyword in self._index:
+            row = self._index[keyword]
+        elif self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            # Evict least recently used keyword and reuse its row
+            evicted, row = self._index.popitem(last=False)
+            self._memory.pop(evicted, None)
+
+        self._array[row] = vector
+        self._index[keyword] = row
+
+    def _store_many(self, keywords, vectors):
+        if self._array is None:
+            for keyword, vector in zip(keywords, vectors):
+                self._store(keyword, vector)
+            return
+
+        with self._file_lock():
+            # Pick up rows written by other workers before allocating new ones
+            self._refresh()
+            self._header()[1] = 1
+            for keyword, vector in zip(keywords, vectors):
+                self._store(keyword, vector)
+            self._array.flush()
+            self._write_index()
+
+    def warm(self, limit=None):
+        """
+        Load the most recently used persisted rows into the in-memory layer,
+        e.g. in a pre-fork master so workers inherit them copy-on-write.
+        """
+        with self._lock, self._file_lock(shared=True):
+            self._refresh()
+            if self._array is None:
+                return 0
+            keywords = list(self._index)[::-1][: limit or self.memory_entries]
+            for keyword in reversed(keywords):
+                self._remember(keyword, np.array(self._array[self._index[keyword]]))
+            return len(keywords)
+
+    def get_many(self, keywords, encode_batch):
+        """
+        Return a (len(keywords), dim) float32 matrix of embeddings.
+
+        `encode_batch(list_of_texts)` is called at most once, with only the
+        keywords that are not already cached.
+        """
+        vectors = [None] * len(keywords)
+        missing = {}
+
+        with self._lock, self._file_lock(shared=True):
+            self._refresh()
+            for i, keyword in enumerate(keywords):
+                vector = self._lookup(keyword)
+                if vector is None:
+                    missing.setdefault(keyword, []).append(i)
+                else:
+                    vectors[i] = vector
+
+            self.hits += len(keywords) - sum(len(p) for p in missing.values())
+            self.misses += len(missing)
+
+        if missing:
+            new_keywords = list(missing)
+            encoded = np.asarray(encode_batch(new_keywords), dtype=np.float32)
+
+            with self._lock:
+                for keyword, vector in zip(new_keywords, encoded):
+                    for i in missing[keyword]:
+                        vectors[i] = vector
+                self._store_many(new_keywords, encoded)
+
+        if not vectors:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack(vectors)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._index) if self._array is not None else len(self._memory)
@@ -0,0 +1,250 @@
+import json
+import mmap
+import os
+import shutil
+import struct
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+from model.keyword_store import store_paths
+
+# -----------------------------
+# Offline model snapshots
+# -----------------------------
+#
+#   <snapshot>/prism_snapshot.json     manifest
+#   <snapshot>/model/                  SentenceTransformer folder, safetensors weights
+#   <snapshot>/keyword_embeddings/     keyword store seed for this model
+#
+# Loading a snapshot never touches the Hugging Face hub, and the transformer
+# weights are memory-mapped from model.safetensors: pages are read on demand
+# and shared through the page cache by every process on the host.
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), ".cache", "snapshots"
+)
+
+_MANIFEST_FILE = "prism_snapshot.json"
+_MODEL_DIR = "model"
+_KEYWORDS_DIR = "keyword_embeddings"
+_WEIGHTS_FILE = "model.safetensors"
+
+
+def default_snapshot_dir(model_name):
+    return os.path.join(DEFAULT_SNAPSHOT_DIR, model_name.replace("/", "_"))
+
+
+def read_manifest(snapshot_dir):
+    """
+    Return the snapshot manifest, or None if `snapshot_dir` holds no snapshot.
+    """
+    path = os.path.join(snapshot_dir, _MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@contextmanager
+def _locked(lock_path):
+    # Same lock the keyword store takes for writes
+    if fcntl is None:
+        yield
+        return
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def create_snapshot(model_name, output_dir, keyword_store_dir=None):
+    """
+    Write `model_name` (weights as safetensors, tokenizer, pooling config) and
+    its keyword store, if any, to `output_dir`. Needs hub access (or a warm
+    hub cache) once; loading the snapshot afterwards does not.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+
+    tmp_dir = output_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    model.save(os.path.join(tmp_dir, _MODEL_DIR), safe_serialization=True)
+
+    if not os.path.exists(os.path.join(tmp_dir, _MODEL_DIR, _WEIGHTS_FILE)):
+        raise RuntimeError(f"{model_name}: weights were not saved as {_WEIGHTS_FILE}")
+
+    keywords = 0
+    if keyword_store_dir:
+        array_path, index_path, lock_path = store_paths(model_name, keyword_store_dir)
+        if os.path.exists(array_path) and os.path.exists(index_path):
+            target = os.path.join(tmp_dir, _KEYWORDS_DIR)
+            os.makedirs(target, exist_ok=True)
+            with _locked(lock_path):
+                shutil.copy2(index_path, target)
+                shutil.copy2(array_path, target)
+            with open(index_path, "r", encoding="utf-8") as f:
+                keywords = len(json.load(f)["keywords"])
+
+    manifest = {
+        "model": model_name,
+        "dim": model.get_sentence_embedding_dimension(),
+        "keywords": keywords,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(os.path.join(tmp_dir, _MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Replace a previous snapshot only once the new one is complete
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(tmp_dir, output_dir)
+    return manifest
+
+
+# -----------------------------
+# Loading
+# -----------------------------
+
+def _safetensors_dtypes():
+    import torch
+
+    return {
+        "F64": torch.float64, "F32": torch.float32, "F16": torch.float16,
+        "BF16": torch.bfloat16, "I64": torch.int64, "I32": torch.int32,
+        "I16": torch.int16, "I8": torch.int8, "U8": torch.uint8, "BOOL": torch.bool,
+    }
+
+
+def mmap_safetensors(path):
+    """
+    Return {name: tensor} for a safetensors file without reading it: every
+    tensor is a view into a private (copy-on-write) mapping of the file.
+    """
+    import torch
+
+    dtypes = _safetensors_dtypes()
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    # Layout: u64 header length, JSON header, raw tensor bytes
+    (header_len,) = struct.unpack("<Q", buffer[:8])
+    header = json.loads(buffer[8:8 + header_len])
+    base = 8 + header_len
+
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = dtypes[info["dtype"]]
+        start, end = info["data_offsets"]
+        if end == start:
+            tensors[name] = torch.empty(info["shape"], dtype=dtype)
+            continue
+        tensors[name] = torch.frombuffer(
+            buffer, dtype=dtype, offset=base + start,
+            count=(end - start) // dtype.itemsize,
+        ).reshape(info["shape"])
+    return tensors
+
+
+@contextmanager
+def _mapped_pretrained_weights(weights_path):
+    """
+    While active, Hugging Face models are built from their config with every
+    parameter on the meta device (nothing allocated, weights file not read)
+    and then given views of the mapped `weights_path` as their parameters.
+    Buffers are created as usual. Patches transformers process-wide: only
+    used for the one model load, under the evaluator's model lock.
+    """
+    import torch
+    from transformers import PreTrainedModel
+
+    original = PreTrainedModel.__dict__["from_pretrained"]
+    register_parameter = torch.nn.Module.register_parameter
+
+    def register_on_meta(module, name, param):
+        if param is not None and param.device.type != "meta":
+            param = torch.nn.Parameter(param.to("meta"), requires_grad=param.requires_grad)
+        register_parameter(module, name, param)
+
+    def from_pretrained(cls, pretrained_model_name_or_path, *args, config=None, **kwargs):
+        if config is None:
+            config = cls.config_class.from_pretrained(pretrained_model_name_or_path)
+        torch.nn.Module.register_parameter = register_on_meta
+        try:
+            model = cls._from_config(config)
+        finally:
+            torch.nn.Module.register_parameter = register_parameter
+        # strict: a parameter missing from the file would stay on meta
+        model.load_state_dict(mmap_safetensors(weights_path), strict=True, assign=True)
+        return model.eval()
+
+    PreTrainedModel.from_pretrained = classmethod(from_pretrained)
+    try:
+        yield
+    finally:
+        PreTrainedModel.from_pretrained = original
+
+
+def load_snapshot(snapshot_dir, mmap_weights=True):
+    """
+    Load the SentenceTransformer stored in `snapshot_dir` from local files only.
+    With `mmap_weights` the transformer weights are never read up front: the
+    parameters are views of the mapped safetensors file.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model_dir = os.path.join(snapshot_dir, _MODEL_DIR)
+
+    if mmap_weights:
+        try:
+            with _mapped_pretrained_weights(os.path.join(model_dir, _WEIGHTS_FILE)):
+                # A local folder is loaded as-is: no hub lookups
+                return SentenceTransformer(model_dir, device="cpu")
+        except Exception as e:
+            print(f"WARNING: loading snapshot weights into memory, could not mmap them: {e}")
+
+    return SentenceTransformer(model_dir, device="cpu")
+
+
+def seed_keyword_store(snapshot_dir, model_name, directory):
+    """
+    Copy the snapshot's keyword store into `directory` if that directory has
+    no store for `model_name` yet (e.g. a fresh container). Returns True if
+    the store was seeded.
+    """
+    source = os.path.join(snapshot_dir, _KEYWORDS_DIR)
+    array_path, index_path, lock_path = store_paths(model_name, directory)
+    seed_array, seed_index, _ = store_paths(model_name, source)
+
+    if not (os.path.exists(seed_array) and os.path.exists(seed_index)):
+        return False
+
+    os.makedirs(directory, exist_ok=True)
+    with _locked(lock_path):
+        if os.path.exists(index_path):
+            return False
+        shutil.copy2(seed_array, array_path)
+        shutil.copy2(seed_index, index_path)
+    return True
+
+
+if __name__ == "__main__":
+    # cd ai_backend && python -m model.snapshot [model_name] [output_dir]
+    import sys
+
+    name = sys.argv[1] if len(sys.argv) > 1 else os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    out = sys.argv[2] if len(sys.argv) > 2 else default_snapshot_dir(name)
+    store_dir = os.getenv(
+        "KEYWORD_STORE_DIR",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "keyword_embeddings"),
+    )
+    print(json.dumps(create_snapshot(name, out, keyword_store_dir=store_dir or None), indent=2))
+    print(f"Snapshot written to {out}")
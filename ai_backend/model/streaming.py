@@ -0,0 +1,128 @@
+import re
+
+import numpy as np
+
+from model.evaluator import (
+    build_result,
+    cosine_similarity_matrix,
+    encode_responses,
+    get_keyword_embeddings,
+    keyword_weights,
+    score_keyword_matrix,
+)
+
+# Sentence boundary: terminal punctuation followed by whitespace, or ending
+# the chunk (speech-to-text emits whole sentences without trailing spaces)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class StreamingEvaluation:
+    """
+    Incrementally score a live transcript against one question.
+
+    Transcript chunks are split into sentences; only sentences that have not
+    been embedded yet are encoded. A running per-keyword maximum similarity
+    over all sentences decides which keywords are matched, so each chunk costs
+    one small encode and finalizing the answer needs no extra forward pass.
+
+    Unpunctuated speech is flushed as a segment once the pending fragment
+    reaches `max_pending_words`, keeping every segment well inside the
+    model's token window.
+    """
+
+    def __init__(self, question_obj, threshold=0.7, max_pending_words=40,
+                 kw_weight=0.8, sent_weight=0.2):
+        self.question_text = question_obj["text"]
+        self.expected_keywords = question_obj.get("expected_keywords", [])
+        self.threshold = threshold
+        self.max_pending_words = max_pending_words
+        self.kw_weight = kw_weight
+        self.sent_weight = sent_weight
+
+        self.keywords, self.weights = keyword_weights(self.expected_keywords)
+
+        self._keyword_matrix = None
+        if self.keywords and self.weights.sum() > 0:
+            self._keyword_matrix = get_keyword_embeddings(self.keywords)
+
+        self.max_sims = np.full(len(self.keywords), -1.0, dtype=np.float32)
+        self.segments = []
+        self._pending = ""
+
+    def add_chunk(self, text):
+        """
+        Append a transcript chunk and return the updated partial scores.
+        """
+        self._pending = f"{self._pending} {text}".strip() if text else self._pending
+
+        parts = _SENTENCE_END.split(self._pending)
+        complete, self._pending = parts[:-1], parts[-1]
+
+        if self._pending.endswith((".", "!", "?")):
+            complete.append(self._pending)
+            self._pending = ""
+
+        if len(self._pending.split()) >= self.max_pending_words:
+            complete.append(self._pending)
+            self._pending = ""
+
+        self._embed(complete)
+        return self.snapshot()
+
+    def _embed(self, sentences):
+        sentences = [s.strip() for s in sentences if s and s.strip()]
+        if not sentences:
+            return
+
+        self.segments.extend(sentences)
+        if self._keyword_matrix is None:
+            return
+
+        embeddings = encode_responses(sentences)
+        sims = cosine_similarity_matrix(embeddings, self._keyword_matrix)
+        np.maximum(self.max_sims, sims.max(axis=0), out=self.max_sims)
+
+    def _keyword_scores(self):
+        if self._keyword_matrix is None or not self.segments:
+            return 0.0, [], {kw: 0.0 for kw in self.keywords}
+
+        score, matched_mask, rounded = score_keyword_matrix(
+            self.max_sims, self.weights, self.threshold
+        )
+        matched = [kw for kw, hit in zip(self.keywords, matched_mask.tolist()) if hit]
+        return float(score), matched, dict(zip(self.keywords, rounded.tolist()))
+
+    @property
+    def transcript(self):
+        return " ".join(self.segments + ([self._pending] if self._pending else []))
+
+    def snapshot(self):
+        """
+        Partial result for the transcript embedded so far.
+        """
+        kw_score, matched, detail = self._keyword_scores()
+        return {
+            "partial": True,
+            "segments": len(self.segments),
+            "scores": {"keyword": kw_score},
+            "feedback": {
+                "matched_keywords": matched,
+                "keyword_detail": detail,
+            },
+        }
+
+    def finalize(self, text=None):
+        """
+        Flush any trailing fragment and return the full evaluation result,
+        in the same format as evaluate_response.
+        """
+        if text:
+            self._pending = f"{self._pending} {text}".strip()
+        pending, self._pending = self._pending, ""
+        self._embed([pending])
+
+        kw_score, matched, detail = self._keyword_scores()
+        return build_result(
+            self.transcript, self.question_text, self.expected_keywords,
+            kw_score, matched, detail, self.kw_weight, self.sent_weight,
+        )
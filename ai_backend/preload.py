@@ -0,0 +1,85 @@
+import gc
+import os
+import resource
+
+
+# -------------------------
+# Per-process memory report
+# -------------------------
+def process_memory():
+    """
+    Memory usage of the current process in MB.
+
+    rss counts shared pages in every worker that maps them; pss divides them
+    between the processes sharing them, so sum(pss) over workers is the real
+    footprint of a pre-forked deployment.
+    """
+    report = {"pid": os.getpid()}
+    fields = {
+        "Rss": "rss_mb",
+        "Pss": "pss_mb",
+        "Shared_Clean": "shared_clean_mb",
+        "Shared_Dirty": "shared_dirty_mb",
+        "Private_Clean": "private_clean_mb",
+        "Private_Dirty": "private_dirty_mb",
+    }
+
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in fields:
+                    report[fields[name]] = round(int(value.split()[0]) / 1024, 1)
+    except OSError:
+        # Non-Linux: peak RSS only (KB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        report["peak_rss_mb"] = round(peak / 1024, 1)
+
+    return report
+
+
+# -------------------------
+# Pre-fork model loading
+# -------------------------
+def preload_models():
+    """
+    Load every model and warm cache once in the master process, before
+    workers are forked, so their pages are shared copy-on-write.
+
+    No forward pass is run here: OpenMP thread pools started in the master
+    do not survive fork. Workers warm up after forking (see warmup_worker).
+    """
+    from model.evaluator import get_embedding_model, get_keyword_store
+    from subsystems import SUBSYSTEMS, load_all
+
+    # WARMUP is off in the master: loads without a forward pass.
+    # Failed subsystems stay reported at /ready; workers retry them.
+    load_all()
+
+    if SUBSYSTEMS["embeddings"].ready:
+        model = get_embedding_model()
+        if hasattr(model, "share_memory"):
+            # torch backend: move weights into shared memory so they are never
+            # copied on write
+            model.eval()
+            model.share_memory()
+
+        warmed = get_keyword_store().warm()
+        print(f"Preloaded models in master (pid {os.getpid()}), {warmed} keyword embeddings warm")
+
+    # Objects created so far are never collected: keep the GC from touching
+    # (and therefore un-sharing) their pages in the workers
+    gc.collect()
+    gc.freeze()
+
+
+def warmup_worker():
+    """
+    Run the first forward pass inside a freshly forked worker.
+    """
+    from model.evaluator import get_embedding_model
+    from subsystems import SUBSYSTEMS
+
+    if SUBSYSTEMS["embeddings"].ready:
+        get_embedding_model().encode("warmup")
+    print(f"Worker {os.getpid()} ready: {process_memory()}")
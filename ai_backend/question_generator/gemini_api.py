@@ -1,67 +1,71 @@
+import asyncio
 import os
 import json
-import google.generativeai as genai
-
-
-api_key = os.getenv("GEMINI_API_KEY")
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import (
+    ERRORS,
+    GEMINI_COALESCED,
+    GEMINI_PARSE_FAILURES,
+    STAGE_SECONDS,
+    register_collector,
+)
+from question_generator.model_router import STREAM, ModelRouter
+from question_generator.question_bank import skill_key
+from question_generator.stream_parser import ObjectArrayStreamParser
+
+_GENAI = None
+_GENAI_LOCK = threading.Lock()
+
+def get_genai():
+    """
+    Import and configure the Gemini SDK on first use. A missing
+    GEMINI_API_KEY only disables question generation, not the whole app.
+    """
+    global _GENAI
+    if _GENAI is None:
+        with _GENAI_LOCK:
+            if _GENAI is None:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise RuntimeError("GEMINI_API_KEY not set")
 
-if not api_key:
-    raise RuntimeError("GEMINI_API_KEY not set")
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                _GENAI = genai
+    return _GENAI
 
-genai.configure(api_key=api_key)
+MAX_KEYWORDS_PER_Q = 5
 
 MODEL_PRIORITY = ["models/gemini-2.5-flash", "models/gemini-2.0-flash", "models/gemini-pro"]
 
-_MODEL_NAME = None
+def _list_model_names():
+    return [m.name for m in get_genai().list_models()]
 
-def get_available_model():
-    global _MODEL_NAME
-    if _MODEL_NAME:
-        return _MODEL_NAME
-
-    available = [m.name for m in genai.list_models()]
-    for candidate in MODEL_PRIORITY:
-        if candidate in available:
-            _MODEL_NAME = candidate
-            return _MODEL_NAME
 
-    raise RuntimeError("No valid Gemini model available")
+ROUTER = ModelRouter(MODEL_PRIORITY, _list_model_names)
 
 
-def generate_questions_for_skills(skills):
+def get_available_model():
     """
-    Batch-generate questions for multiple skills in ONE Gemini call.
-
-    Input:
-        skills: ["Python", "React", "DBMS", ...]
-
-    Output:
-        A flat list of dicts:
-        [
-          {"skill": "Python", "text": "...", "keywords": ["...", ...]},
-          {"skill": "Python", "text": "...", "keywords": ["...", ...]},
-          {"skill": "React",  "text": "...", "keywords": ["...", ...]},
-          ...
-        ]
+    The model calls currently go to first (see model_router).
     """
+    return ROUTER.models()[0]
 
-    skills = skills[:10]           # max 10 skills
-    MAX_KEYWORDS_PER_Q = 5
 
-    try:
-        model_name = get_available_model()
-        model = genai.GenerativeModel(model_name)
-
-        skills_json = json.dumps(skills)
+def build_prompt(skills, per_skill=2):
+    skills_json = json.dumps(skills)
 
-        prompt = f"""
+    return f"""
         You are an interview question generator.
 
         You will receive a JSON array of skills:
 
         {skills_json}
 
-        For EACH skill in that array, generate EXACTLY 2 interview questions
+        For EACH skill in that array, generate EXACTLY {per_skill} interview questions
         that test the candidate's knowledge of that skill.
 
         For each question, also provide 3-5 important keywords that should
@@ -83,67 +87,406 @@ def generate_questions_for_skills(skills):
         - Do NOT include comments, explanation, or any text outside the JSON array.
         """
 
-        response = model.generate_content(prompt)
 
-        if not response or not getattr(response, "text", None):
-            print("ERROR: Gemini returned empty or invalid response")
-            return []
+def _questions_from_response(response):
+    if not response or not getattr(response, "text", None):
+        print("ERROR: Gemini returned empty or invalid response")
+        GEMINI_PARSE_FAILURES.inc()
+        return []
+
+    return parse_questions(response.text, MAX_KEYWORDS_PER_Q)
+
+
+# -------------------------
+# Sharding
+# -------------------------
+# Output length, and so latency, grows with the number of skills in one
+# prompt. Skill lists are split into shards of QUESTION_SHARD_SIZE skills,
+# generated concurrently (QUESTION_SHARD_CONCURRENCY at a time per request)
+# and merged. A failed shard only loses its own skills.
+
+QUESTION_SHARD_SIZE = int(os.getenv("QUESTION_SHARD_SIZE", "5"))
+QUESTION_SHARD_CONCURRENCY = int(os.getenv("QUESTION_SHARD_CONCURRENCY", "4"))
+
+
+def shard_skills(skills, size=None):
+    """
+    Distinct skills (first spelling kept) in shards of `size`.
+    """
+    size = max(1, size or QUESTION_SHARD_SIZE)
+    distinct = {}
+    for skill in skills:
+        distinct.setdefault(skill_key(skill), skill)
+    skills = list(distinct.values())
+    return [skills[i:i + size] for i in range(0, len(skills), size)]
+
+
+def _question_key(question):
+    return skill_key(question["skill"]), " ".join(question["text"].lower().split())
+
+
+def merge_questions(skills, results):
+    """
+    Merge per-shard question lists: grouped by skill in input order, each
+    skill's questions in generated order, duplicates dropped.
+    """
+    order = {}
+    for skill in skills:
+        order.setdefault(skill_key(skill), len(order))
+
+    seen = set()
+    by_skill = {}
+    for questions in results:
+        for question in questions:
+            key = _question_key(question)
+            if key in seen:
+                continue
+            seen.add(key)
+            by_skill.setdefault(key[0], []).append(question)
+
+    # Skills Gemini made up (not in the input) go last
+    ordered = sorted(by_skill, key=lambda key: order.get(key, len(order)))
+    return [question for key in ordered for question in by_skill[key]]
+
+
+def generate_questions_for_skills(skills, per_skill=2):
+    """
+    Generate `per_skill` questions for each skill: one Gemini call per shard
+    of QUESTION_SHARD_SIZE skills, shards in parallel.
+
+    Input:
+        skills: ["Python", "React", "DBMS", ...]
+
+    Output:
+        A flat list of dicts:
+        [
+          {"skill": "Python", "text": "...", "keywords": ["...", ...]},
+          {"skill": "Python", "text": "...", "keywords": ["...", ...]},
+          {"skill": "React",  "text": "...", "keywords": ["...", ...]},
+          ...
+        ]
+    """
+    deadline = ROUTER.deadline()
+    shards = shard_skills(skills)
+    if len(shards) <= 1:
+        return _generate_shard(skills, per_skill, deadline)
+
+    workers = max(1, min(QUESTION_SHARD_CONCURRENCY, len(shards)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemini-shard") as pool:
+        results = list(pool.map(lambda shard: _generate_shard(shard, per_skill, deadline), shards))
+    return merge_questions(skills, results)
+
+
+def _generate_shard(skills, per_skill, deadline=None):
+    """
+    Batch-generate questions for a few skills in ONE Gemini call.
+    """
+    try:
+        prompt = build_prompt(skills, per_skill)
+
+        def request(model_name, timeout):
+            model = get_genai().GenerativeModel(model_name)
+            return model.generate_content(prompt, request_options={"timeout": timeout})
+
+        with STAGE_SECONDS.time(stage="gemini_generate_content"):
+            _, response = ROUTER.call_sync(request, deadline)
+
+        return _questions_from_response(response)
+
+    except Exception as e:
+        print(f"Error generating batch questions for skills: {e}")
+        ERRORS.inc(component="question_generator")
+        return []
+
+
+# -------------------------
+# Async client
+# -------------------------
+# generate_questions_for_skills_async awaits Gemini's async API instead of
+# holding a thread for the whole round-trip. At most GEMINI_MAX_IN_FLIGHT
+# calls run at once, and concurrent requests for the same normalized skill
+# set (e.g. a user refreshing the interview page) share one upstream call.
+
+GEMINI_MAX_IN_FLIGHT = int(os.getenv("GEMINI_MAX_IN_FLIGHT", "32"))
+
+_SEMAPHORE = None
+_SEMAPHORE_LOOP = None
+_IN_FLIGHT = {}  # (skill keys, per_skill) -> asyncio.Task
+
+
+def _semaphore():
+    # Bound to the running loop (one per process in the app)
+    global _SEMAPHORE, _SEMAPHORE_LOOP
+    loop = asyncio.get_running_loop()
+    if _SEMAPHORE is None or _SEMAPHORE_LOOP is not loop:
+        _SEMAPHORE = asyncio.Semaphore(max(1, GEMINI_MAX_IN_FLIGHT))
+        _SEMAPHORE_LOOP = loop
+    return _SEMAPHORE
 
-        raw = response.text.strip()
 
-        # Try to extract the JSON array if there's any noise
+async def _generate_async(skills, per_skill, deadline):
+    async with _semaphore():
         try:
-            first = raw.find("[")
-            last = raw.rfind("]")
-            if first != -1 and last != -1:
-                raw_json = raw[first:last + 1]
-            else:
-                raw_json = raw
-
-            data = json.loads(raw_json)
+            prompt = build_prompt(skills, per_skill)
+
+            def request(model_name):
+                return get_genai().GenerativeModel(model_name).generate_content_async(prompt)
+
+            with STAGE_SECONDS.time(stage="gemini_generate_content"):
+                _, response = await ROUTER.call(request, deadline)
+
+            return _questions_from_response(response)
+
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error("Gemini parsing error", exc_info=True)
-            print("Raw output was:", raw)
+            print(f"Error generating batch questions for skills: {e}")
+            ERRORS.inc(component="question_generator")
             return []
 
-        if not isinstance(data, list):
-            print("ERROR: Expected a JSON array from Gemini, got:", type(data))
-            return []
 
-        normalized = []
-        for item in data:
-            if not isinstance(item, dict):
-                continue
+async def generate_questions_for_skills_async(skills, per_skill=2):
+    """
+    Async generate_questions_for_skills: shards run concurrently, at most
+    QUESTION_SHARD_CONCURRENCY at a time.
+    """
+    deadline = ROUTER.deadline()
+    shards = shard_skills(skills)
+    limit = asyncio.Semaphore(max(1, QUESTION_SHARD_CONCURRENCY))
 
-            skill = item.get("skill")
-            qtext = (
-                item.get("question")
-                or item.get("text")
-                or ""
-            )
-            keywords = item.get("keywords") or item.get("tags") or []
+    async def run(shard):
+        async with limit:
+            return await _generate_coalesced(shard, per_skill, deadline)
+
+    results = await asyncio.gather(*(run(shard) for shard in shards), return_exceptions=True)
+    for shard, result in zip(shards, results):
+        if isinstance(result, Exception):
+            print(f"Error generating questions for shard {shard}: {result}")
+            ERRORS.inc(component="question_generator")
+    return merge_questions(
+        skills, [result for result in results if not isinstance(result, BaseException)]
+    )
+
+
+async def _generate_coalesced(skills, per_skill, deadline):
+    """
+    One Gemini call for a shard. Callers asking for the same skills
+    (compared case- and whitespace-insensitively) while a call is in flight
+    get that call's result.
+    """
+    key = (tuple(sorted({skill_key(s) for s in skills})), per_skill)
+
+    task = _IN_FLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_generate_async(list(skills), per_skill, deadline))
+        _IN_FLIGHT[key] = task
+        task.add_done_callback(lambda _: _IN_FLIGHT.pop(key, None))
+    else:
+        GEMINI_COALESCED.inc()
+
+    # Shielded: one caller disconnecting (or reaching an earlier deadline)
+    # does not cancel the others' call
+    try:
+        questions = await asyncio.wait_for(
+            asyncio.shield(task), max(0.0, deadline - time.monotonic())
+        )
+    except TimeoutError:
+        print(f"Gemini call for {list(skills)} passed the request deadline")
+        ERRORS.inc(component="question_generator")
+        return []
+    return [dict(q, keywords=list(q["keywords"])) for q in questions]
 
-            if not skill or not qtext:
+
+async def stream_questions_for_skills_async(skills, per_skill=2, on_shard_end=None):
+    """
+    Async generator over generated questions, each yielded as soon as its
+    JSON object is complete. Shards stream concurrently and their questions
+    are interleaved as they arrive (each skill's in generated order);
+    duplicates are dropped. Not coalesced: every stream is its own call
+    (within GEMINI_MAX_IN_FLIGHT).
+
+    on_shard_end: optional coroutine function awaited with the questions of
+    each shard once its stream has ended (not for shards cut short).
+    """
+    deadline = ROUTER.deadline()
+    shards = shard_skills(skills)
+    if len(shards) <= 1:
+        questions = []
+        async for question in _stream_shard(skills, per_skill, deadline):
+            questions.append(question)
+            yield question
+        if on_shard_end is not None and questions:
+            await on_shard_end(questions)
+        return
+
+    limit = asyncio.Semaphore(max(1, QUESTION_SHARD_CONCURRENCY))
+    queue = asyncio.Queue()
+    done = object()
+
+    async def pump(shard):
+        try:
+            questions = []
+            async with limit:
+                async for question in _stream_shard(shard, per_skill, deadline):
+                    questions.append(question)
+                    queue.put_nowait(question)
+            if on_shard_end is not None and questions:
+                await on_shard_end(questions)
+        finally:
+            queue.put_nowait(done)
+
+    tasks = [asyncio.ensure_future(pump(shard)) for shard in shards]
+    seen = set()
+    remaining = len(tasks)
+    try:
+        while remaining:
+            question = await queue.get()
+            if question is done:
+                remaining -= 1
                 continue
+            key = _question_key(question)
+            if key not in seen:
+                seen.add(key)
+                yield question
+    finally:
+        # Client gone: stop the shards still streaming
+        for task in tasks:
+            task.cancel()
 
-            # Force keywords into a list of strings
-            if not isinstance(keywords, list):
-                keywords = [str(keywords)]
-            else:
-                keywords = [str(k) for k in keywords]
 
-            normalized.append(
-                {
-                    "skill": skill,
-                    "text": qtext,
-                    "keywords": [str(k) for k in keywords[:MAX_KEYWORDS_PER_Q]]
-                }
-            )
+async def _stream_shard(skills, per_skill, deadline):
+    """
+    Questions of one streamed Gemini call. Errors and the deadline end the
+    stream. Routing (and hedging) covers the wait for the first chunk.
+    """
+    parser = ObjectArrayStreamParser()
+    count = 0
 
-        return normalized
+    try:
+        async with _semaphore():
+            prompt = build_prompt(skills, per_skill)
+
+            def request(model_name):
+                return get_genai().GenerativeModel(model_name).generate_content_async(
+                    prompt, stream=True
+                )
+
+            started = time.perf_counter()
+            _, response = await ROUTER.call(request, deadline, kind=STREAM)
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(
+                        chunks.__anext__(), max(0.0, deadline - time.monotonic())
+                    )
+                except StopAsyncIteration:
+                    break
+
+                try:
+                    text = chunk.text
+                except ValueError:  # chunk without text parts
+                    continue
+
+                for item in parser.feed(text):
+                    question = normalize_question(item)
+                    if question is None:
+                        continue
+                    if count == 0:
+                        STAGE_SECONDS.observe(
+                            time.perf_counter() - started, stage="gemini_first_question"
+                        )
+                    count += 1
+                    yield question
+
+            STAGE_SECONDS.observe(time.perf_counter() - started, stage="gemini_stream_content")
 
     except Exception as e:
-        print(f"Error generating batch questions for skills: {e}")
+        print(f"Error streaming batch questions for skills: {e!r}")
+        ERRORS.inc(component="question_generator")
+        return
+
+    if count == 0:
+        print("ERROR: Gemini stream held no usable JSON question array")
+        GEMINI_PARSE_FAILURES.inc()
+    elif parser.invalid:
+        print(f"ERROR: skipped {parser.invalid} malformed questions in Gemini stream")
+        GEMINI_PARSE_FAILURES.inc()
+
+
+def _collect_gemini_metrics():
+    yield ("prism_gemini_in_flight", "gauge",
+           "Async Gemini calls running or waiting for a slot.", {},
+           sum(1 for task in list(_IN_FLIGHT.values()) if not task.done()))
+
+
+register_collector(_collect_gemini_metrics)
+register_collector(ROUTER.collect_metrics)
+
+
+def parse_questions(raw, max_keywords=MAX_KEYWORDS_PER_Q):
+    """
+    Parse Gemini's raw text into the normalized question list returned by
+    generate_questions_for_skills. Tolerates noise around the JSON array.
+    """
+    raw = raw.strip()
+
+    # Try to extract the JSON array if there's any noise
+    try:
+        first = raw.find("[")
+        last = raw.rfind("]")
+        if first != -1 and last != -1:
+            raw_json = raw[first:last + 1]
+        else:
+            raw_json = raw
+
+        data = json.loads(raw_json)
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error("Gemini parsing error", exc_info=True)
+        print("Raw output was:", raw)
+        GEMINI_PARSE_FAILURES.inc()
+        return []
+
+    if not isinstance(data, list):
+        print("ERROR: Expected a JSON array from Gemini, got:", type(data))
+        GEMINI_PARSE_FAILURES.inc()
         return []
+
+    normalized = []
+    for item in data:
+        question = normalize_question(item, max_keywords)
+        if question is not None:
+            normalized.append(question)
+
+    return normalized
+
+
+def normalize_question(item, max_keywords=MAX_KEYWORDS_PER_Q):
+    """
+    One Gemini array element -> {"skill", "text", "keywords"}, or None if it
+    is not a usable question.
+    """
+    if not isinstance(item, dict):
+        return None
+
+    skill = item.get("skill")
+    qtext = (
+        item.get("question")
+        or item.get("text")
+        or ""
+    )
+    keywords = item.get("keywords") or item.get("tags") or []
+
+    if not skill or not qtext:
+        return None
+
+    # Force keywords into a list of strings
+    if not isinstance(keywords, list):
+        keywords = [str(keywords)]
+    else:
+        keywords = [str(k) for k in keywords]
+
+    return {
+        "skill": skill,
+        "text": qtext,
+        "keywords": [str(k) for k in keywords[:max_keywords]]
+    }
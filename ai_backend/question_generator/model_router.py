@@ -0,0 +1,238 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+
+from metrics import GEMINI_DEADLINE_EXCEEDED, GEMINI_HEDGES, STAGE_SECONDS
+
+# -------------------------
+# Gemini model routing
+# -------------------------
+# Models are tried in MODEL_PRIORITY order among those list_models() reports
+# (refreshed every GEMINI_MODEL_LIST_TTL_SECONDS), models failing more than
+# GEMINI_MAX_ERROR_RATE of their calls in the last GEMINI_ERROR_WINDOW_SECONDS
+# last. A call that has not answered within its model's recent p95 latency
+# for that kind of call (a full answer, or a stream's first chunk) is
+# hedged: the next model gets the same request and the first answer wins.
+# Every request has an overall deadline. The sync path falls back on errors
+# but does not hedge.
+
+GEMINI_MODEL_LIST_TTL_SECONDS = float(os.getenv("GEMINI_MODEL_LIST_TTL_SECONDS", "600"))
+GEMINI_DEADLINE_SECONDS = float(os.getenv("GEMINI_DEADLINE_SECONDS", "45"))
+GEMINI_MAX_ERROR_RATE = float(os.getenv("GEMINI_MAX_ERROR_RATE", "0.5"))
+GEMINI_STATS_WINDOW = int(os.getenv("GEMINI_STATS_WINDOW", "100"))
+# Errors older than this no longer count: a demoted model gets traffic again
+GEMINI_ERROR_WINDOW_SECONDS = float(os.getenv("GEMINI_ERROR_WINDOW_SECONDS", "300"))
+# Until a model has this many successful calls its hedge delay is the default
+GEMINI_HEDGE_MIN_SAMPLES = int(os.getenv("GEMINI_HEDGE_MIN_SAMPLES", "20"))
+GEMINI_HEDGE_DEFAULT_SECONDS = float(os.getenv("GEMINI_HEDGE_DEFAULT_SECONDS", "15"))
+# Never hedge sooner than this, however fast the model usually is
+GEMINI_HEDGE_MIN_SECONDS = float(os.getenv("GEMINI_HEDGE_MIN_SECONDS", "2"))
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+# Call kinds with separate latency distributions
+GENERATE = "generate"  # full answer
+STREAM = "stream"      # first chunk of a streamed answer
+CALL_KINDS = (GENERATE, STREAM)
+
+
+class ModelStats:
+    """
+    Rolling latency of successful calls, per call kind, and error rate of
+    all calls in the last GEMINI_ERROR_WINDOW_SECONDS, of a model.
+    """
+
+    def __init__(self, window=GEMINI_STATS_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies = {kind: deque(maxlen=window) for kind in CALL_KINDS}
+        self._outcomes = deque(maxlen=window)  # (time.monotonic(), ok)
+
+    def record(self, seconds=None, ok=True, kind=GENERATE):
+        with self._lock:
+            self._outcomes.append((time.monotonic(), ok))
+            if ok and seconds is not None:
+                self._latencies[kind].append(seconds)
+
+    def p95(self, kind=GENERATE):
+        with self._lock:
+            if len(self._latencies[kind]) < GEMINI_HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies[kind])
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def error_rate(self):
+        since = time.monotonic() - GEMINI_ERROR_WINDOW_SECONDS
+        with self._lock:
+            while self._outcomes and self._outcomes[0][0] < since:
+                self._outcomes.popleft()
+            if not self._outcomes:
+                return 0.0
+            return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+
+class ModelRouter:
+    def __init__(self, priority, list_models):
+        """
+        priority: model names, preferred first.
+        list_models: callable returning the names currently available.
+        """
+        self.priority = list(priority)
+        self.stats = {name: ModelStats() for name in self.priority}
+        self._list_models = list_models
+        self._available = None
+        self._refreshed = 0.0
+        self._lock = threading.Lock()
+
+    def _stale(self):
+        return (
+            self._available is None
+            or time.monotonic() - self._refreshed >= GEMINI_MODEL_LIST_TTL_SECONDS
+        )
+
+    def models(self):
+        """
+        Available models to try, in order. Blocks on list_models() when the
+        cached list is older than GEMINI_MODEL_LIST_TTL_SECONDS.
+        """
+        if self._stale():
+            with self._lock:
+                if self._stale():
+                    try:
+                        with STAGE_SECONDS.time(stage="gemini_list_models"):
+                            names = set(self._list_models())
+                        self._available = [m for m in self.priority if m in names]
+                    except Exception as e:
+                        if self._available is None:
+                            raise
+                        print(f"WARNING: keeping previous Gemini model list: {e}")
+                    self._refreshed = time.monotonic()
+
+        if not self._available:
+            raise RuntimeError("No valid Gemini model available")
+        # Stable sort: priority order within healthy and unhealthy models
+        return sorted(
+            self._available,
+            key=lambda name: self.stats[name].error_rate() > GEMINI_MAX_ERROR_RATE,
+        )
+
+    def hedge_delay(self, name, kind=GENERATE):
+        p95 = self.stats[name].p95(kind)
+        return max(GEMINI_HEDGE_MIN_SECONDS, p95 if p95 is not None else GEMINI_HEDGE_DEFAULT_SECONDS)
+
+    def deadline(self):
+        return time.monotonic() + GEMINI_DEADLINE_SECONDS
+
+    async def call(self, request, deadline=None, kind=GENERATE):
+        """
+        Await `request(model_name)` on the best model, hedged to the next
+        models, and return (model_name, result) of the first success.
+        Raises the last error if every model failed, DeadlineExceeded if
+        `deadline` (time.monotonic() value) passes first. `kind` selects the
+        latency distribution the call is measured against (GENERATE for a
+        full answer, STREAM when `request` returns once the first chunk is in).
+        """
+        deadline = deadline or self.deadline()
+        models = await asyncio.to_thread(self.models) if self._stale() else self.models()
+
+        pending = {}  # task -> (model, started)
+        launched = 0
+        last_error = None
+
+        def launch():
+            nonlocal launched
+            name = models[launched]
+            launched += 1
+            pending[asyncio.ensure_future(request(name))] = (name, time.monotonic())
+
+        launch()
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    GEMINI_DEADLINE_EXCEEDED.inc()
+                    for name, _ in pending.values():
+                        self.stats[name].record(ok=False)
+                    raise DeadlineExceeded(f"Gemini did not answer within {GEMINI_DEADLINE_SECONDS}s")
+
+                timeout = deadline - now
+                hedge_at = None
+                if pending and launched < len(models):
+                    # Hedge once the newest attempt is slower than its p95
+                    name, started = list(pending.values())[-1]
+                    hedge_at = started + self.hedge_delay(name, kind)
+                    timeout = min(timeout, hedge_at - now)
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=max(0.0, timeout), return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    name, started = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        print(f"Gemini call to {name} failed: {e}")
+                        self.stats[name].record(ok=False)
+                        last_error = e
+                        continue
+                    self.stats[name].record(time.monotonic() - started, kind=kind)
+                    return name, result
+
+                if not pending:
+                    # Everything in flight failed: next model right away
+                    if launched >= len(models):
+                        raise last_error or RuntimeError("No valid Gemini model available")
+                    launch()
+                elif hedge_at is not None and time.monotonic() >= hedge_at:
+                    GEMINI_HEDGES.inc(model=models[launched])
+                    launch()
+        finally:
+            # Losers of a hedge, or everything on deadline/cancellation
+            for task in pending:
+                task.cancel()
+
+    def call_sync(self, request, deadline=None, kind=GENERATE):
+        """
+        Blocking call(): `request(model_name, timeout_seconds)` is tried on
+        each model in turn until one succeeds. No hedging.
+        """
+        deadline = deadline or self.deadline()
+        last_error = None
+
+        for name in self.models():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                GEMINI_DEADLINE_EXCEEDED.inc()
+                raise DeadlineExceeded(f"Gemini did not answer within {GEMINI_DEADLINE_SECONDS}s")
+
+            started = time.monotonic()
+            try:
+                result = request(name, remaining)
+            except Exception as e:
+                print(f"Gemini call to {name} failed: {e}")
+                self.stats[name].record(ok=False)
+                last_error = e
+                continue
+            self.stats[name].record(time.monotonic() - started, kind=kind)
+            return name, result
+
+        raise last_error or RuntimeError("No valid Gemini model available")
+
+    def collect_metrics(self):
+        for name, stats in self.stats.items():
+            for kind in CALL_KINDS:
+                p95 = stats.p95(kind)
+                if p95 is not None:
+                    yield ("prism_gemini_model_p95_seconds", "gauge",
+                           "Rolling p95 latency of successful calls per Gemini model and call kind"
+                           " (stream: time to first chunk).",
+                           {"model": name, "call": kind}, p95)
+        for name, stats in self.stats.items():
+            yield ("prism_gemini_model_error_rate", "gauge",
+                   "Error rate per Gemini model over the last GEMINI_ERROR_WINDOW_SECONDS.",
+                   {"model": name}, stats.error_rate())
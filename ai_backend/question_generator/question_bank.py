@@ -0,0 +1,198 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# -------------------------
+# Question bank
+# -------------------------
+# Generated questions are kept per normalized skill and served again to later
+# candidates, rotating so that they do not all get the same ones. Gemini is
+# only asked about skills with too few fresh questions in the bank.
+# QUESTION_BANK_PATH="" disables it.
+
+QUESTION_BANK_PATH = os.getenv(
+    "QUESTION_BANK_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "question_bank.sqlite3"),
+)
+# A skill is served from the bank once it holds this many fresh questions, or
+# once Gemini has answered for it within the TTL (it may return fewer)
+QUESTION_BANK_MIN_QUESTIONS = int(os.getenv("QUESTION_BANK_MIN_QUESTIONS", "4"))
+QUESTION_BANK_MAX_QUESTIONS = int(os.getenv("QUESTION_BANK_MAX_QUESTIONS", "50"))
+# Questions older than this are stale: regenerated, and only served when
+# there are not enough fresh ones
+QUESTION_BANK_TTL_SECONDS = float(os.getenv("QUESTION_BANK_TTL_SECONDS", str(30 * 86400)))
+# "least_served": questions served least often first; "random": any order
+QUESTION_BANK_ROTATION = os.getenv("QUESTION_BANK_ROTATION", "least_served")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bank (
+    skill_key TEXT NOT NULL,
+    id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    created REAL NOT NULL,
+    served INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (skill_key, id)
+)
+"""
+
+_GENERATIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    skill_key TEXT PRIMARY KEY,
+    generated REAL NOT NULL
+)
+"""
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def enabled():
+    return bool(QUESTION_BANK_PATH) and QUESTION_BANK_MIN_QUESTIONS > 0
+
+
+def skill_key(skill):
+    """
+    "  Node.JS " -> "node.js": one bank entry per skill, whatever the spelling.
+    """
+    return " ".join(str(skill).lower().split())
+
+
+@contextmanager
+def _connect():
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                os.makedirs(os.path.dirname(os.path.abspath(QUESTION_BANK_PATH)), exist_ok=True)
+                with sqlite3.connect(QUESTION_BANK_PATH) as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(_SCHEMA)
+                    conn.execute(_GENERATIONS_SCHEMA)
+                _initialized = True
+
+    conn = sqlite3.connect(QUESTION_BANK_PATH, timeout=10)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def missing_skills(skills):
+    """
+    The skills (as given) that have fewer than QUESTION_BANK_MIN_QUESTIONS
+    fresh questions in the bank and were not generated within the TTL.
+    """
+    keys = {skill_key(s) for s in skills}
+    if not keys:
+        return []
+
+    fresh_after = time.time() - QUESTION_BANK_TTL_SECONDS
+    placeholders = ",".join("?" * len(keys))
+    with _connect() as conn:
+        counts = dict(conn.execute(
+            f"SELECT skill_key, COUNT(*) FROM bank WHERE skill_key IN ({placeholders})"
+            " AND created >= ? GROUP BY skill_key",
+            (*keys, fresh_after),
+        ).fetchall())
+        generated = {row[0] for row in conn.execute(
+            f"SELECT skill_key FROM generations WHERE skill_key IN ({placeholders})"
+            " AND generated >= ?",
+            (*keys, fresh_after),
+        )}
+    return [
+        s for s in skills
+        if counts.get(skill_key(s), 0) < QUESTION_BANK_MIN_QUESTIONS
+        and skill_key(s) not in generated
+    ]
+
+
+def mark_generated(skills):
+    """
+    Record that Gemini answered for `skills`: they count as fresh for the
+    TTL however many questions it returned, instead of being asked again on
+    every request.
+    """
+    keys = {skill_key(s) for s in skills}
+    if not keys:
+        return
+    now = time.time()
+    with _connect() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO generations (skill_key, generated) VALUES (?, ?)",
+            [(key, now) for key in keys],
+        )
+
+
+def add_questions(questions, served_ids=()):
+    """
+    Bank generated questions (each with an "id"), keeping at most
+    QUESTION_BANK_MAX_QUESTIONS per skill, newest first. `served_ids` were
+    already sent to a candidate.
+    """
+    if not questions:
+        return
+
+    now = time.time()
+    served_ids = set(served_ids)
+    rows = [
+        (skill_key(q["skill"]), q["id"], q["text"], json.dumps(q["keywords"]), now,
+         int(q["id"] in served_ids))
+        for q in questions
+    ]
+    with _connect() as conn:
+        # A regenerated question counts as fresh again
+        conn.executemany(
+            "INSERT INTO bank (skill_key, id, text, keywords, created, served)"
+            " VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (skill_key, id) DO UPDATE SET"
+            " created = excluded.created, served = served + excluded.served",
+            rows,
+        )
+        for key in {row[0] for row in rows}:
+            conn.execute(
+                "DELETE FROM bank WHERE skill_key = ? AND id IN ("
+                " SELECT id FROM bank WHERE skill_key = ?"
+                " ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (key, key, QUESTION_BANK_MAX_QUESTIONS),
+            )
+
+
+def take_questions(skill, count):
+    """
+    Serve up to `count` banked questions for `skill` (as {"skill", "text",
+    "keywords", "id"}, with the caller's spelling of the skill) and record
+    that they were served. Fresh questions come first.
+    """
+    key = skill_key(skill)
+    fresh_after = time.time() - QUESTION_BANK_TTL_SECONDS
+
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT id, text, keywords, served, created < ? FROM bank WHERE skill_key = ?",
+            (fresh_after, key),
+        ).fetchall()
+        if not rows:
+            return []
+
+        random.shuffle(rows)
+        if QUESTION_BANK_ROTATION == "random":
+            rows.sort(key=lambda row: row[4])
+        else:
+            rows.sort(key=lambda row: (row[4], row[3]))  # stable: random among ties
+        rows = rows[:count]
+
+        conn.executemany(
+            "UPDATE bank SET served = served + 1 WHERE skill_key = ? AND id = ?",
+            [(key, row[0]) for row in rows],
+        )
+
+    return [
+        {"skill": skill, "text": text, "keywords": json.loads(keywords), "id": qid}
+        for qid, text, keywords, _, _ in rows
+    ]
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from cache import TTLCache
+
+# -------------------------
+# Question store
+# -------------------------
+# Generated questions keyed by a stable content ID, together with their
+# keyword embeddings computed once at generation time. /evaluate-response
+# can then reference a question by ID and skip keyword encoding entirely.
+
+QUESTION_STORE_PATH = os.getenv(
+    "QUESTION_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "questions.sqlite3"),
+)
+# Least recently used questions beyond this are evicted. Use is recorded when
+# a question is read from SQLite, i.e. at most the memory tier's TTL late.
+QUESTION_STORE_MAX_ENTRIES = int(os.getenv("QUESTION_STORE_MAX_ENTRIES", "50000"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id TEXT PRIMARY KEY,
+    skill TEXT NOT NULL,
+    text TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    model TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    vectors BLOB NOT NULL,
+    last_used REAL NOT NULL DEFAULT 0
+)
+"""
+
+_init_lock = threading.Lock()
+_initialized = False
+
+# Hot questions stay in memory: no SQLite round-trip per answer
+_LOADED = TTLCache(
+    max_entries=int(os.getenv("QUESTION_STORE_MEMORY_ENTRIES", "4096")),
+    ttl_seconds=float(os.getenv("QUESTION_STORE_MEMORY_TTL_SECONDS", "3600")),
+)
+
+
+def question_id(skill, text, keywords):
+    """
+    Stable ID derived from the question content: regenerating the same
+    question yields the same ID on every worker.
+    """
+    material = json.dumps(
+        [str(skill).strip().lower(), " ".join(str(text).split()), list(keywords)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:24]
+
+
+@contextmanager
+def _connect():
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                os.makedirs(os.path.dirname(os.path.abspath(QUESTION_STORE_PATH)), exist_ok=True)
+                with sqlite3.connect(QUESTION_STORE_PATH) as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(_SCHEMA)
+                    # Stores written before eviction existed
+                    columns = {row[1] for row in conn.execute("PRAGMA table_info(questions)")}
+                    if "last_used" not in columns:
+                        conn.execute(
+                            "ALTER TABLE questions ADD COLUMN last_used REAL NOT NULL DEFAULT 0"
+                        )
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS questions_last_used ON questions (last_used)"
+                    )
+                _initialized = True
+
+    conn = sqlite3.connect(QUESTION_STORE_PATH, timeout=10)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def save_questions(questions):
+    """
+    Embed every question's keywords (one batch for the whole set), persist
+    them and return the questions with an "id" field added. The least
+    recently used questions beyond QUESTION_STORE_MAX_ENTRIES are evicted.
+    """
+    from model.evaluator import embedding_model_id, get_keyword_embeddings
+
+    if not questions:
+        return questions
+
+    # Distinct keywords across all questions -> one encode
+    distinct = list(dict.fromkeys(kw for q in questions for kw in q["keywords"]))
+    vectors = (
+        dict(zip(distinct, get_keyword_embeddings(distinct)))
+        if distinct else {}
+    )
+    model = embedding_model_id()
+    dim = len(next(iter(vectors.values()))) if vectors else 0
+
+    now = time.time()
+    rows = []
+    stored = []
+    for q in questions:
+        qid = question_id(q["skill"], q["text"], q["keywords"])
+        matrix = np.asarray(
+            [vectors[kw] for kw in q["keywords"]], dtype=np.float32
+        ).reshape(len(q["keywords"]), dim)
+        rows.append((
+            qid, q["skill"], q["text"], json.dumps(q["keywords"]),
+            model, dim, matrix.tobytes(), now,
+        ))
+        stored.append({**q, "id": qid})
+
+    with _connect() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO questions"
+            " (id, skill, text, keywords, model, dim, vectors, last_used)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "DELETE FROM questions WHERE id IN ("
+            " SELECT id FROM questions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (QUESTION_STORE_MAX_ENTRIES,),
+        )
+    return stored
+
+
+def load_question(qid):
+    """
+    Return {"id", "skill", "text", "keywords", "model", "keyword_embeddings"}
+    for a stored question, or None if the ID is unknown.
+    """
+    if not isinstance(qid, str) or not qid:
+        return None
+
+    cached = _LOADED.get(qid)
+    if cached is not None:
+        return cached
+
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT skill, text, keywords, model, dim, vectors FROM questions WHERE id = ?",
+            (qid,),
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE questions SET last_used = ? WHERE id = ?", (time.time(), qid))
+
+    skill, text, keywords, model, dim, blob = row
+    question = {
+        "id": qid,
+        "skill": skill,
+        "text": text,
+        "keywords": json.loads(keywords),
+        "model": model,
+        "keyword_embeddings": np.frombuffer(blob, dtype=np.float32).reshape(-1, dim),
+    }
+    _LOADED.put(qid, question)
+    return question
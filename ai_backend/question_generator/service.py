@@ -1,15 +1,25 @@
-from question_generator.gemini_api import generate_questions_for_skills
+import asyncio
+import os
 
-def generate_questions(skills: list[str]):
-    """
-    Generate interview questions for a list of skills.
+import anyio
 
-    This function is:
-    - Safe for Railway free tier
-    - Defensive against bad input
-    - Gemini-token efficient
-    """
+from executors import ExecutorSaturated, inference_executor
+from metrics import ERRORS
+from question_generator import question_bank
+from question_generator.gemini_api import (
+    generate_questions_for_skills,
+    generate_questions_for_skills_async,
+    stream_questions_for_skills_async,
+)
+from question_generator.question_store import question_id, save_questions
+from subsystems import SubsystemUnavailable, require
 
+QUESTIONS_PER_SKILL = int(os.getenv("QUESTIONS_PER_SKILL", "2"))
+# Large lists are generated in parallel shards (see gemini_api); this only
+# bounds the cost of a single request
+QUESTION_MAX_SKILLS = int(os.getenv("QUESTION_MAX_SKILLS", "30"))
+
+def _clean_skills(skills):
     if not skills or not isinstance(skills, list):
         return []
 
@@ -21,9 +31,247 @@ def generate_questions(skills: list[str]):
     ]
 
     # Hard safety limit (VERY important for free tier)
-    clean_skills = clean_skills[:10]
+    if len(clean_skills) > QUESTION_MAX_SKILLS:
+        print(
+            f"WARNING: {len(clean_skills)} skills requested, "
+            f"generating questions for the first {QUESTION_MAX_SKILLS}"
+        )
+    return clean_skills[:QUESTION_MAX_SKILLS]
+
+
+def generate_questions(skills: list[str]):
+    """
+    Generate interview questions for a list of skills.
+
+    This function is:
+    - Safe for Railway free tier
+    - Defensive against bad input
+    - Gemini-token efficient
+    """
+    clean_skills = _clean_skills(skills)
+    if not clean_skills:
+        return []
+
+    plan = _plan(clean_skills)
+    missing, per_skill = plan["missing"], plan["per_skill"]
+    generated = generate_questions_for_skills(missing, per_skill) if missing else []
+    return _finish(clean_skills, _store(generated), plan)
+
 
+async def generate_questions_async(skills: list[str]):
+    """
+    generate_questions for the event loop: Gemini is awaited through the
+    async client (bounded, identical requests coalesced) and the blocking
+    bank, store and subsystem calls run in threads.
+    """
+    clean_skills = _clean_skills(skills)
     if not clean_skills:
         return []
 
-    return generate_questions_for_skills(clean_skills)
+    plan = await asyncio.to_thread(_plan, clean_skills)
+    missing, per_skill = plan["missing"], plan["per_skill"]
+    generated = await generate_questions_for_skills_async(missing, per_skill) if missing else []
+    if generated:
+        # Keyword encoding on the inference pool like every other encode
+        try:
+            generated = await inference_executor.run(_store, generated)
+        except ExecutorSaturated as e:
+            print(f"ERROR storing questions: {e}")
+    return await asyncio.to_thread(_finish, clean_skills, generated, plan)
+
+
+async def stream_questions(skills: list[str]):
+    """
+    Streaming generate_questions. Planning (and with it any
+    SubsystemUnavailable) happens before this returns; the returned async
+    iterator yields banked questions first, then each generated question as
+    soon as Gemini has written it.
+    """
+    clean_skills = _clean_skills(skills)
+    if not clean_skills:
+        return _iterate([])
+
+    plan = await asyncio.to_thread(_plan, clean_skills)
+    banked = []
+    if plan["bank"]:
+        missing = {question_bank.skill_key(s) for s in plan["missing"]}
+        banked = await asyncio.to_thread(
+            _serve, [s for s in clean_skills if question_bank.skill_key(s) not in missing], []
+        )
+        if not banked and not plan["missing"] and plan["gemini_error"] is not None:
+            raise plan["gemini_error"]
+
+    return _stream(clean_skills, plan, banked)
+
+
+async def _iterate(items):
+    for item in items:
+        yield item
+
+
+async def _stream(clean_skills, plan, banked):
+    for question in banked:
+        yield question
+
+    if not plan["missing"]:
+        return
+
+    spelling = {question_bank.skill_key(s): s for s in clean_skills}
+    sent = {}
+    sent_ids = []
+    generated = []
+    stored_ids = set()
+    finished = False
+
+    async def store(questions):
+        # One batch (one keyword encode, one transaction) per shard, on the
+        # inference pool like every other encode
+        questions = [q for q in map(_with_id, questions) if q["id"] not in stored_ids]
+        if not questions:
+            return
+        try:
+            await inference_executor.run(_store, questions)
+        except ExecutorSaturated as e:
+            print(f"ERROR storing questions: {e}")
+            return
+        stored_ids.update(q["id"] for q in questions)
+
+    try:
+        async for question in stream_questions_for_skills_async(
+            plan["missing"], plan["per_skill"], on_shard_end=store
+        ):
+            # Content IDs are sent right away; the rows follow at shard end
+            question = _with_id(question)
+            generated.append(question)
+
+            key = question_bank.skill_key(question["skill"])
+            if key not in spelling:
+                continue
+            # With the bank, extra questions are generated for rotation
+            if plan["bank"] and sent.get(key, 0) >= QUESTIONS_PER_SKILL:
+                continue
+            sent[key] = sent.get(key, 0) + 1
+            sent_ids.append(question.get("id"))
+            yield {**question, "skill": spelling[key]}
+        finished = True
+    finally:
+        # Shielded: when the client disconnects, Starlette cancels the
+        # response's scope, which would cancel these awaits too
+        with anyio.CancelScope(shield=True):
+            # Questions of shards cut short by the client leaving
+            if generated:
+                await store(generated)
+            if plan["bank"] and generated:
+                try:
+                    await asyncio.to_thread(
+                        question_bank.add_questions, generated, sent_ids
+                    )
+                    # A stream cut short may have missed questions: ask again next time
+                    if finished:
+                        await asyncio.to_thread(
+                            question_bank.mark_generated, _answered(plan["missing"], generated)
+                        )
+                except Exception as e:
+                    print(f"ERROR adding questions to the bank: {e}")
+                    ERRORS.inc(component="question_bank")
+
+
+def _plan(clean_skills):
+    """
+    Decide which skills need Gemini. Returns {"missing", "per_skill",
+    "bank", "gemini_error"}; raises SubsystemUnavailable if Gemini is needed,
+    unavailable, and the bank cannot stand in.
+    """
+    if not question_bank.enabled():
+        require("gemini")
+        return {"missing": clean_skills, "per_skill": QUESTIONS_PER_SKILL,
+                "bank": False, "gemini_error": None}
+
+    try:
+        missing = question_bank.missing_skills(clean_skills)
+    except Exception as e:
+        print(f"ERROR reading question bank: {e}")
+        ERRORS.inc(component="question_bank")
+        require("gemini")
+        return {"missing": clean_skills, "per_skill": QUESTIONS_PER_SKILL,
+                "bank": False, "gemini_error": None}
+
+    gemini_error = None
+    if missing:
+        try:
+            require("gemini")
+        except SubsystemUnavailable as e:
+            # Stale banked questions are better than none
+            gemini_error = e
+            missing = []
+
+    # One prompt for every missing skill, enough questions to rotate
+    per_skill = max(QUESTIONS_PER_SKILL, question_bank.QUESTION_BANK_MIN_QUESTIONS)
+    return {"missing": missing, "per_skill": per_skill,
+            "bank": True, "gemini_error": gemini_error}
+
+
+def _finish(clean_skills, generated, plan):
+    # `generated` has been through _store: stored questions carry an "id"
+    if not plan["bank"]:
+        return generated
+
+    try:
+        question_bank.add_questions([q for q in generated if "id" in q])
+        question_bank.mark_generated(_answered(plan["missing"], generated))
+    except Exception as e:
+        print(f"ERROR adding questions to the bank: {e}")
+        ERRORS.inc(component="question_bank")
+
+    questions = _serve(clean_skills, generated)
+    if not questions and plan["gemini_error"] is not None:
+        raise plan["gemini_error"]
+    return questions
+
+
+def _answered(missing, generated):
+    # Skills Gemini returned at least one question for
+    keys = {question_bank.skill_key(q["skill"]) for q in generated}
+    return [s for s in missing if question_bank.skill_key(s) in keys]
+
+
+def _with_id(question):
+    # Same ID as save_questions assigns
+    if "id" in question:
+        return question
+    return {**question, "id": question_id(question["skill"], question["text"], question["keywords"])}
+
+
+def _store(questions):
+    # Embed keywords once now so answers can be scored by question ID
+    try:
+        return save_questions(questions)
+    except Exception as e:
+        print(f"ERROR storing questions: {e}")
+        return questions
+
+
+def _serve(skills, generated):
+    """
+    QUESTIONS_PER_SKILL questions per skill, in input order: rotated from the
+    bank, or straight from `generated` if the bank cannot serve them.
+    """
+    by_skill = {}
+    for q in generated:
+        by_skill.setdefault(question_bank.skill_key(q["skill"]), []).append(q)
+
+    questions = []
+    for skill in dict.fromkeys(skills):
+        try:
+            picked = question_bank.take_questions(skill, QUESTIONS_PER_SKILL)
+        except Exception as e:
+            print(f"ERROR reading question bank: {e}")
+            ERRORS.inc(component="question_bank")
+            picked = []
+        if not picked:
+            picked = [
+                {**q, "skill": skill}
+                for q in by_skill.get(question_bank.skill_key(skill), [])[:QUESTIONS_PER_SKILL]
+            ]
+        questions.extend(picked)
+    return questions
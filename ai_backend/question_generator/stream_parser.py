@@ -0,0 +1,65 @@
+import json
+
+# -------------------------
+# Incremental JSON array parser
+# -------------------------
+# Gemini streams the question array in arbitrary text chunks. The parser
+# tracks string/escape state and nesting depth across chunks and hands back
+# each top-level object of the first array as soon as its closing brace
+# arrives. Noise before the array ("```json") is skipped, as in
+# parse_questions.
+
+
+class ObjectArrayStreamParser:
+    def __init__(self):
+        self.started = False  # "[" seen
+        self.done = False     # closing "]" seen
+        self.invalid = 0      # complete objects that were not valid JSON
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text):
+        """
+        Consume the next chunk; return the objects it completed.
+        """
+        items = []
+        for ch in text:
+            if self.done:
+                break
+
+            if not self.started:
+                self.started = ch == "["
+                continue
+
+            if self._depth == 0:
+                # Between elements: only "{" and the closing "]" matter
+                if ch == "{":
+                    self._depth = 1
+                    self._buffer = [ch]
+                elif ch == "]":
+                    self.done = True
+                continue
+
+            self._buffer.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        items.append(json.loads("".join(self._buffer)))
+                    except ValueError:
+                        self.invalid += 1
+                    self._buffer = []
+        return items
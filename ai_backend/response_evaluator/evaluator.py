@@ -1,4 +1,118 @@
-from model.evaluator import evaluate_response
+import hashlib
+import json
+import os
+
+from cache import TTLCache
+from executors import inference_executor
+from metrics import register_collector
+from model.evaluator import (
+    embedding_model_id,
+    encode_response_async,
+    evaluate_response,
+    evaluate_responses,
+)
+from model.streaming import StreamingEvaluation
+from question_generator.question_store import load_question
+
+MAX_BATCH_ITEMS = int(os.getenv("MAX_BATCH_ITEMS", "50"))
+
+# Scoring weights used by evaluate_response (part of the cache key)
+KW_WEIGHT = 0.8
+SENT_WEIGHT = 0.2
+
+# Retries and double submits hit this instead of the model.
+# EVAL_CACHE_MAX_ENTRIES=0 disables it.
+_RESULT_CACHE = TTLCache(
+    max_entries=int(os.getenv("EVAL_CACHE_MAX_ENTRIES", "2048")),
+    ttl_seconds=float(os.getenv("EVAL_CACHE_TTL_SECONDS", "600")),
+)
+
+
+def _cache_key(response, question):
+    """
+    Content hash of everything that determines an evaluation result.
+    """
+    material = json.dumps(
+        {
+            "response": " ".join(str(response).split()),
+            "question": str(question.get("text", "")).strip(),
+            "keywords": question.get("expected_keywords", []),
+            "weights": [KW_WEIGHT, SENT_WEIGHT],
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _cacheable(result):
+    # Results scored with fallback values after a model error are retried
+    return not result.get("degraded")
+
+
+def _for_response(result, response):
+    # Cached results may come from a request that differed only in whitespace
+    result = dict(result)
+    result["response"] = response
+    return result
+
+
+def _collect_cache_metrics():
+    stats = _RESULT_CACHE.stats()
+    yield ("prism_eval_cache_hits_total", "counter",
+           "Evaluations served from the result cache.", {}, stats["hits"])
+    yield ("prism_eval_cache_misses_total", "counter",
+           "Evaluations computed by the model.", {}, stats["misses"])
+    yield ("prism_eval_cache_coalesced_total", "counter",
+           "Evaluations that waited on an identical in-flight request.", {}, stats["coalesced"])
+
+
+register_collector(_collect_cache_metrics)
+
+
+def _resolve_question(item):
+    """
+    Return (question, keyword_embeddings) for an evaluation item.
+
+    Items may reference a generated question by "question_id" (or
+    question["id"]). Known IDs use the stored text, keywords and keyword
+    vectors; unknown IDs fall back to the inline question object.
+    """
+    question = item.get("question")
+    qid = item.get("question_id")
+    if qid is None and isinstance(question, dict):
+        qid = question.get("id")
+
+    try:
+        stored = load_question(qid)
+    except Exception as e:
+        print(f"ERROR loading question {qid}: {e}")
+        stored = None
+
+    if stored is None:
+        return question, None
+
+    # Inline weights still apply to the stored keywords
+    weights = {}
+    if isinstance(question, dict) and isinstance(question.get("expected_keywords"), list):
+        weights = {
+            kw["keyword"]: kw["weight"]
+            for kw in question["expected_keywords"]
+            if isinstance(kw, dict) and "keyword" in kw and "weight" in kw
+        }
+
+    resolved = {
+        "text": stored["text"],
+        "expected_keywords": [
+            {"keyword": kw, "weight": weights.get(kw, 1.0)}
+            for kw in stored["keywords"]
+        ],
+    }
+
+    # Vectors from another model or backend are not comparable
+    if stored["model"] != embedding_model_id():
+        return resolved, None
+    return resolved, stored["keyword_embeddings"]
 
 
 def evaluate(payload: dict):
@@ -13,13 +127,54 @@ def evaluate(payload: dict):
         ]
       }
     }
+
+    or, for a question returned by /generate-questions:
+    {
+      "response": "user answer",
+      "question_id": "<id>"
+    }
+    """
+    prepared = _prepare(payload)
+    if isinstance(prepared, dict):
+        return prepared
+    return _score(*prepared)
+
+
+async def evaluate_async(payload: dict):
+    """
+    evaluate() from the event loop. The response is encoded through the
+    micro-batcher and awaited here, not on an inference worker: requests
+    waiting for their batch hold no worker, so a batch is not capped at
+    INFERENCE_WORKERS texts. Lookup and scoring run on inference_executor.
     """
+    prepared = await inference_executor.run(_prepare, payload)
+    if isinstance(prepared, dict):
+        return prepared
 
+    response, question, keyword_embeddings = prepared
+    response_embedding = None
+    if _cache_key(response, question) not in _RESULT_CACHE:
+        try:
+            response_embedding = await encode_response_async(response)
+        except Exception as e:
+            # Scoring encodes again and degrades the result if that fails too
+            print(f"ERROR encoding response: {e}")
+
+    return await inference_executor.run(
+        _score, response, question, keyword_embeddings, response_embedding
+    )
+
+
+def _prepare(payload):
+    """
+    (response, question, keyword_embeddings) for a valid evaluate() payload,
+    or the fallback result for an invalid one.
+    """
     if not isinstance(payload, dict):
         return _fallback_result("Invalid payload")
 
     response = payload.get("response")
-    question = payload.get("question")
+    question, keyword_embeddings = _resolve_question(payload)
 
     # Validate question object
     if not isinstance(question, dict) or "text" not in question:
@@ -29,13 +184,126 @@ def evaluate(payload: dict):
     if response is None:
         return _fallback_result("Missing response")
 
+    return response, question, keyword_embeddings
+
+
+def _score(response, question, keyword_embeddings, response_embedding=None):
     try:
-        return evaluate_response(response, question)
+        result = _RESULT_CACHE.get_or_compute(
+            _cache_key(response, question),
+            lambda: evaluate_response(
+                response, question, KW_WEIGHT, SENT_WEIGHT,
+                keyword_embeddings=keyword_embeddings,
+                response_embedding=response_embedding,
+            ),
+            cacheable=_cacheable,
+        )
+        return _for_response(result, response)
     except Exception:
         # Never expose internal errors to frontend
         return _fallback_result("Evaluation failed")
 
 
+def evaluate_many(payload: list):
+    """
+    Expected payload: a list of evaluate() payloads, e.g. a whole session:
+    [
+      {"response": "user answer", "question": {"text": "...", "expected_keywords": [...]}},
+      {"response": "user answer", "question_id": "<id>"},
+      ...
+    ]
+
+    Valid items are scored together in one batched embedding pass;
+    invalid items get a fallback result in their position.
+    """
+
+    if not isinstance(payload, list):
+        return [_fallback_result("Invalid payload")]
+
+    results = [None] * len(payload)
+    valid_positions = []
+    valid_pairs = []
+    valid_embeddings = []
+
+    keys = {}
+
+    for i, item in enumerate(payload):
+        if isinstance(item, dict):
+            question, keyword_embeddings = _resolve_question(item)
+            item = {**item, "question": question}
+
+        error = _validate(item)
+        if error:
+            results[i] = _fallback_result(error)
+            continue
+
+        keys[i] = _cache_key(item["response"], item["question"])
+        cached = _RESULT_CACHE.get(keys[i])
+        if cached is not None:
+            results[i] = _for_response(cached, item["response"])
+            continue
+
+        valid_positions.append(i)
+        valid_pairs.append((item["response"], item["question"]))
+        valid_embeddings.append(keyword_embeddings)
+
+    if valid_pairs:
+        try:
+            batch_results = evaluate_responses(
+                valid_pairs, KW_WEIGHT, SENT_WEIGHT,
+                keyword_embeddings_list=valid_embeddings,
+            )
+        except Exception:
+            # Never cached: the next request retries
+            for i in valid_positions:
+                results[i] = _fallback_result("Evaluation failed")
+            return results
+
+        for i, result in zip(valid_positions, batch_results):
+            results[i] = result
+            if _cacheable(result):
+                _RESULT_CACHE.put(keys[i], result)
+
+    return results
+
+
+def _validate(item):
+    """
+    Return an error message for a malformed evaluation item, or None.
+    """
+    if not isinstance(item, dict):
+        return "Invalid payload"
+
+    if not _valid_question(item.get("question")):
+        return "Invalid question format"
+
+    if not isinstance(item.get("response"), str):
+        return "Missing response"
+
+    return None
+
+
+def _valid_question(question):
+    if not isinstance(question, dict) or "text" not in question:
+        return False
+
+    keywords = question.get("expected_keywords", [])
+    return isinstance(keywords, list) and all(
+        isinstance(kw, dict) and "keyword" in kw and "weight" in kw
+        for kw in keywords
+    )
+
+
+def start_session(question):
+    """
+    Open a streaming evaluation session for a live transcript.
+    Raises ValueError for a malformed question object.
+    """
+    if not _valid_question(question):
+        raise ValueError("Invalid question format")
+    return StreamingEvaluation(question)
+
+
 def _fallback_result(message: str):
     """
     Guaranteed-safe response structure.
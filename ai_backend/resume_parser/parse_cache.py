@@ -0,0 +1,85 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# -------------------------
+# On-disk resume parse cache
+# -------------------------
+# Second tier behind the in-memory cache in resume_parser/service.py: parse
+# results keyed by PDF content hash survive restarts and are shared by every
+# worker on the host. RESUME_CACHE_PATH="" disables it.
+
+RESUME_CACHE_PATH = os.getenv(
+    "RESUME_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "resume_parses.sqlite3"),
+)
+RESUME_CACHE_DISK_ENTRIES = int(os.getenv("RESUME_CACHE_DISK_ENTRIES", "10000"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parses (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    skills TEXT NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def enabled():
+    return bool(RESUME_CACHE_PATH) and RESUME_CACHE_DISK_ENTRIES > 0
+
+
+@contextmanager
+def _connect():
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                os.makedirs(os.path.dirname(os.path.abspath(RESUME_CACHE_PATH)), exist_ok=True)
+                with sqlite3.connect(RESUME_CACHE_PATH) as conn:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(_SCHEMA)
+                    conn.execute("CREATE INDEX IF NOT EXISTS parses_last_used ON parses (last_used)")
+                _initialized = True
+
+    conn = sqlite3.connect(RESUME_CACHE_PATH, timeout=10)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def load_parse(key):
+    """
+    Return {"text", "skills"} stored under `key`, or None.
+    """
+    with _connect() as conn:
+        row = conn.execute("SELECT text, skills FROM parses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE parses SET last_used = ? WHERE key = ?", (time.time(), key))
+    return {"text": row[0], "skills": json.loads(row[1])}
+
+
+def save_parse(key, result):
+    """
+    Store a parse result, evicting the least recently used rows beyond
+    RESUME_CACHE_DISK_ENTRIES.
+    """
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO parses VALUES (?, ?, ?, ?)",
+            (key, result["text"], json.dumps(result["skills"]), time.time()),
+        )
+        conn.execute(
+            "DELETE FROM parses WHERE key IN ("
+            " SELECT key FROM parses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (RESUME_CACHE_DISK_ENTRIES,),
+        )
@@ -1,64 +1,308 @@
-from PyPDF2 import PdfReader
-import spacy
-import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+import time
+
+from metrics import PDF_BACKEND_FAILURES, PDF_PAGE_SECONDS, STAGE_SECONDS
+from resume_parser.pdf_backends import BackendUnavailable, open_document, parse_backends
+from resume_parser.skill_index import SkillIndex, noun_chunks
+from resume_parser.skill_matcher import DEFAULT_TAXONOMY_PATH, SkillMatcher
+
+# -------------------------
+# Load NLP model lazily
+# -------------------------
+_NLP = None
+
+def get_nlp():
+    """
+    Load spaCy and en_core_web_sm on first use (importing spaCy alone takes
+    seconds), once per process.
+    """
+    global _NLP
+    if _NLP is None:
+        import spacy
+        try:
+            _NLP = spacy.load("en_core_web_sm")
+        except OSError:
+            raise RuntimeError(
+                "spaCy model 'en_core_web_sm' not found. "
+                "Ensure it is installed in requirements.txt"
+            )
+    return _NLP
 
 # -------------------------
-# Load NLP model safely
+# Skill taxonomy (loaded on first use)
 # -------------------------
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    raise RuntimeError(
-        "spaCy model 'en_core_web_sm' not found. "
-        "Ensure it is installed in requirements.txt"
-    )
-
-TECHNICAL_SKILLS = [
-    "Python", "Java", "C++", "C", "R", "SQL", "MySQL",
-    "TensorFlow", "PyTorch", "Machine Learning",
-    "Deep Learning", "Artificial Intelligence", "NLP",
-    "Data Science", "Cloud Computing", "AWS", "Azure",
-    "Git", "Node.js", "React", "HTML", "CSS", "JavaScript",
-    "DBMS", "OOP", "Data Structures", "Algorithms",
-    "Computer Networks"
-]
-
-# Precompile regex patterns (FAST)
-SKILL_PATTERNS = {
-    skill: re.compile(rf"\b{re.escape(skill.lower())}\b")
-    for skill in TECHNICAL_SKILLS
-}
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+
+_MATCHER = None
+
+def get_skill_matcher():
+    global _MATCHER
+    if _MATCHER is None:
+        _MATCHER = SkillMatcher.from_file(SKILL_TAXONOMY_PATH)
+    return _MATCHER
 
 
 # -------------------------
 # PDF text extraction
 # -------------------------
-def extract_text(file_path: str) -> str:
+# 0 disables a limit. Extraction stops at the first limit reached.
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "200000"))
+
+# Extraction backends in fallback order (see resume_parser/pdf_backends.py)
+PDF_BACKENDS = parse_backends(os.getenv("PDF_BACKENDS", "pypdfium2,pypdf2"))
+_UNAVAILABLE_BACKENDS = set()
+
+# Documents with at least this many pages are split across worker processes
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+# Off by default (fewer than 2 disables the pool): every task ships the whole
+# PDF to its process, and on the benchmark corpus that costs more than the
+# pages it saves. Enable only where a measurement on the target hardware
+# shows a crossover, and set PDF_PARALLEL_MIN_PAGES to it.
+PDF_PROCESS_WORKERS = int(os.getenv("PDF_PROCESS_WORKERS", "0"))
+
+_POOL = None
+_POOL_PID = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool():
+    """
+    Lazily start the page extraction process pool (once per worker process;
+    spawned, not forked, so it never inherits model threads).
+    """
+    global _POOL, _POOL_PID
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != os.getpid():
+            _POOL = ProcessPoolExecutor(
+                max_workers=PDF_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _POOL_PID = os.getpid()
+        return _POOL
+
+
+def _discard_pool(pool):
+    """
+    Drop a pool whose process died; the next _get_pool() starts a new one.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_pages(document, start, stop, max_chars):
+    """
+    [(text, seconds), ...] for pages [start, stop), stopping once `max_chars`
+    characters have been extracted.
+    """
+    pages = []
+    total = 0
+    begin = time.perf_counter()
+    for page_text in document.iter_pages(start, stop):
+        now = time.perf_counter()
+        pages.append((page_text, now - begin))
+        begin = now
+
+        total += len(page_text)
+        if max_chars and total >= max_chars:
+            break
+    return pages
+
+
+def _extract_page_range(pdf_bytes, backend, start, stop, max_chars):
+    # Runs in a pool process: each one opens its own document
+    document = open_document(backend, pdf_bytes)
     try:
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        return text
+        return _extract_pages(document, start, stop, max_chars)
+    finally:
+        document.close()
+
+
+def _extract_parallel(pdf_bytes, backend, page_count, max_chars):
+    pool = _get_pool()
+    chunk = -(-page_count // (PDF_PROCESS_WORKERS * 2))
+    try:
+        futures = [
+            pool.submit(
+                _extract_page_range, pdf_bytes, backend,
+                start, min(start + chunk, page_count), max_chars,
+            )
+            for start in range(0, page_count, chunk)
+        ]
+
+        pages = []
+        total = 0
+        for future in futures:
+            if max_chars and total >= max_chars:
+                # Early cutoff: later pages are not needed
+                future.cancel()
+                continue
+            for page in future.result():
+                pages.append(page)
+                total += len(page[0])
+        return pages
+    except BrokenProcessPool:
+        # A crashed process (e.g. OOM-killed) breaks the pool for good
+        _discard_pool(pool)
+        raise
+
+
+def _extract_with(backend, pdf_bytes, max_pages, max_chars):
+    document = open_document(backend, pdf_bytes)
+    try:
+        page_count = document.page_count
+        if max_pages:
+            page_count = min(page_count, max_pages)
+
+        if PDF_PROCESS_WORKERS > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+            try:
+                return _extract_parallel(pdf_bytes, backend, page_count, max_chars)
+            except Exception as e:
+                print(f"WARNING: parallel PDF extraction failed, extracting sequentially: {e}")
+
+        return _extract_pages(document, 0, page_count, max_chars)
+    finally:
+        document.close()
+
+
+def extract_text(source, max_pages=None, max_chars=None, backends=None) -> str:
+    """
+    Extract the text of a PDF given as bytes (uploads, no temp file) or a
+    file path, up to `max_pages` pages and `max_chars` characters
+    (PDF_MAX_PAGES / PDF_MAX_CHARS by default).
+
+    Backends are tried in order (PDF_BACKENDS by default); one that fails or
+    finds no text on a file falls back to the next.
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+
+    try:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            pdf_bytes = bytes(source)
+        else:
+            with open(source, "rb") as f:
+                pdf_bytes = f.read()
     except Exception:
         # Never crash backend
         return ""
 
+    for backend in backends or PDF_BACKENDS:
+        if backend in _UNAVAILABLE_BACKENDS:
+            continue
+        try:
+            pages = _extract_with(backend, pdf_bytes, max_pages, max_chars)
+        except BackendUnavailable as e:
+            print(f"WARNING: PDF backend skipped: {e}")
+            _UNAVAILABLE_BACKENDS.add(backend)
+            continue
+        except Exception as e:
+            print(f"WARNING: PDF backend {backend} failed: {e}")
+            PDF_BACKEND_FAILURES.inc(backend=backend)
+            continue
+
+        for _, seconds in pages:
+            PDF_PAGE_SECONDS.observe(seconds, backend=backend)
+
+        text = "".join(page_text + "\n" for page_text, _ in pages if page_text)
+        if text.strip():
+            return text[:max_chars] if max_chars else text
+        PDF_BACKEND_FAILURES.inc(backend=backend)
+
+    return ""
+
 
 # -------------------------
 # Skill extraction
 # -------------------------
-def extract_skills(text: str):
+def match_skills(text: str):
+    """
+    Return {canonical skill name: category} for every taxonomy skill or
+    alias found in `text`.
+    """
     if not text:
-        return []
+        return {}
+
+    with STAGE_SECONDS.time(stage="extract_skills"):
+        return get_skill_matcher().match(text)
+
+
+# -------------------------
+# Semantic skill normalization
+# -------------------------
+# Noun chunks mapped to the nearest taxonomy term (see skill_index.py).
+# Off by default: SEMANTIC_SKILLS=true makes /parse-resume depend on spaCy's
+# en_core_web_sm, the embedding model and the taxonomy index (the "nlp",
+# "embeddings" and "skill_index" subsystems), and wait for them to load.
+SEMANTIC_SKILLS = os.getenv("SEMANTIC_SKILLS", "false") == "true"
+
+_SKILL_INDEX = None
+_SKILL_INDEX_LOCK = threading.Lock()
+
 
-    text_lower = text.lower()
-    found = []
+def _encode_terms(texts):
+    from model.evaluator import get_embedding_model
+
+    return get_embedding_model().encode(texts, convert_to_numpy=True, batch_size=256)
+
+
+def get_skill_index():
+    """
+    Load (or build once and persist) the taxonomy vector index for the
+    current embedding model and taxonomy version.
+    """
+    global _SKILL_INDEX
+    if _SKILL_INDEX is None:
+        with _SKILL_INDEX_LOCK:
+            if _SKILL_INDEX is None:
+                from model.evaluator import embedding_model_id
+
+                _SKILL_INDEX = SkillIndex.load_or_build(
+                    get_skill_matcher(), _encode_terms, embedding_model_id()
+                )
+    return _SKILL_INDEX
+
+
+def semantic_skills(text: str):
+    """
+    Return {canonical skill name: category} for noun chunks of `text` whose
+    embedding is close to a taxonomy term: one batched encode, one lookup.
+    """
+    if not text:
+        return {}
+
+    chunks = noun_chunks(get_nlp(), text)
+    if not chunks:
+        return {}
+
+    from model.evaluator import encode_responses
+
+    # One batched encode on this (parse) worker: a resume's chunks do not go
+    # through the micro-batcher, where live evaluations would queue behind them
+    index = get_skill_index()
+    with STAGE_SECONDS.time(stage="encode_skill_chunks"):
+        vectors = encode_responses(chunks)
+
+    found = {}
+    for hit in index.nearest(vectors):
+        if hit is not None:
+            found.setdefault(hit[0], index.categories[hit[0]])
+    return found
+
+
+def extract_skills(text: str):
+    return sorted(match_skills(text))
 
-    for skill, pattern in SKILL_PATTERNS.items():
-        if pattern.search(text_lower):
-            found.append(skill)
 
-    return sorted(found)
+def group_by_category(skills: dict):
+    grouped = {}
+    for name, category in sorted(skills.items()):
+        grouped.setdefault(category, []).append(name)
+    return grouped
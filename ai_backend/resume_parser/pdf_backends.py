@@ -0,0 +1,123 @@
+import io
+import threading
+
+# -------------------------
+# PDF text extraction backends
+# -------------------------
+#
+#   pypdfium2  PDFium (C++) through pypdfium2: fastest, optional dependency
+#   pdfminer   pdfminer.six with layout box ordering disabled, optional
+#   pypdf2     pure-Python PyPDF2 (always available)
+#
+# open_document(name, pdf_bytes) returns an object with `page_count` and
+# `iter_pages(start, stop)` yielding the text of each page (or "").
+
+BACKENDS = ("pypdfium2", "pdfminer", "pypdf2")
+
+
+class BackendUnavailable(RuntimeError):
+    pass
+
+
+class _PyPDF2Document:
+    def __init__(self, pdf_bytes):
+        from PyPDF2 import PdfReader
+
+        self._reader = PdfReader(io.BytesIO(pdf_bytes))
+        self.page_count = len(self._reader.pages)
+
+    def iter_pages(self, start, stop):
+        for number in range(start, stop):
+            yield self._reader.pages[number].extract_text() or ""
+
+    def close(self):
+        pass
+
+
+# PDFium is not thread-safe: every call into it is serialized per process
+# (page-level parallelism comes from the extraction process pool)
+_PDFIUM_LOCK = threading.Lock()
+
+
+class _PdfiumDocument:
+    def __init__(self, pdf_bytes):
+        import pypdfium2
+
+        with _PDFIUM_LOCK:
+            self._pdf = pypdfium2.PdfDocument(pdf_bytes)
+            self.page_count = len(self._pdf)
+
+    def iter_pages(self, start, stop):
+        for number in range(start, stop):
+            with _PDFIUM_LOCK:
+                page = self._pdf[number]
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+            # PDFium ends lines with CRLF
+            yield text.replace("\r\n", "\n")
+
+    def close(self):
+        with _PDFIUM_LOCK:
+            self._pdf.close()
+
+
+class _PdfminerDocument:
+    def __init__(self, pdf_bytes):
+        from pdfminer.pdfpage import PDFPage
+
+        self._bytes = pdf_bytes
+        self.page_count = sum(1 for _ in PDFPage.get_pages(io.BytesIO(pdf_bytes)))
+
+    def iter_pages(self, start, stop):
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LAParams, LTTextContainer
+
+        # boxes_flow=None skips the costly reading-order analysis of text
+        # boxes; skill matching does not depend on box order
+        laparams = LAParams(boxes_flow=None, detect_vertical=False)
+        for layout in extract_pages(
+            io.BytesIO(self._bytes), page_numbers=range(start, stop), laparams=laparams
+        ):
+            yield "".join(
+                element.get_text() for element in layout
+                if isinstance(element, LTTextContainer)
+            )
+
+    def close(self):
+        pass
+
+
+_DOCUMENTS = {
+    "pypdfium2": _PdfiumDocument,
+    "pdfminer": _PdfminerDocument,
+    "pypdf2": _PyPDF2Document,
+}
+
+
+def open_document(name, pdf_bytes):
+    """
+    Open `pdf_bytes` with backend `name`.
+    Raises BackendUnavailable if the backend's library is not installed.
+    """
+    if name not in _DOCUMENTS:
+        raise ValueError(f"Unknown PDF backend {name!r}, expected one of {BACKENDS}")
+    try:
+        return _DOCUMENTS[name](pdf_bytes)
+    except ImportError as e:
+        raise BackendUnavailable(f"{name} is not installed: {e}") from e
+
+
+def parse_backends(value):
+    """
+    "pypdfium2,pypdf2" -> ("pypdfium2", "pypdf2"); unknown names are dropped
+    and pypdf2 is always the last resort.
+    """
+    names = [name.strip().lower() for name in value.split(",")]
+    names = [name for name in dict.fromkeys(names) if name in BACKENDS]
+    if "pypdf2" not in names:
+        names.append("pypdf2")
+    return tuple(names)
@@ -0,0 +1,104 @@
+import hashlib
+import os
+
+from cache import TTLCache
+from metrics import ERRORS, STAGE_SECONDS, register_collector
+from model.evaluator import embedding_model_id
+from resume_parser import parse_cache
+from resume_parser.parser import (
+    PDF_MAX_CHARS,
+    PDF_MAX_PAGES,
+    SEMANTIC_SKILLS,
+    extract_text,
+    get_skill_matcher,
+    match_skills,
+    semantic_skills,
+)
+
+# Repeat uploads of the same PDF cost a hash and a lookup.
+# RESUME_CACHE_MAX_ENTRIES=0 disables the in-memory tier.
+_PARSE_CACHE = TTLCache(
+    max_entries=int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "256")),
+    ttl_seconds=float(os.getenv("RESUME_CACHE_TTL_SECONDS", "86400")),
+)
+
+_disk_hits = 0
+_disk_misses = 0
+
+
+def _cache_key(pdf_bytes):
+    """
+    Content hash of the PDF plus everything else that determines the result:
+    the taxonomy version, the extraction limits and the matching mode.
+    """
+    with STAGE_SECONDS.time(stage="resume_hash"):
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+    mode = f"semantic-{embedding_model_id()}" if SEMANTIC_SKILLS else "exact"
+    return f"{digest}:{get_skill_matcher().version}:{PDF_MAX_PAGES}:{PDF_MAX_CHARS}:{mode}"
+
+
+def _parse(key, pdf_bytes):
+    global _disk_hits, _disk_misses
+
+    if parse_cache.enabled():
+        try:
+            stored = parse_cache.load_parse(key)
+        except Exception as e:
+            print(f"ERROR reading resume parse cache: {e}")
+            stored = None
+        if stored is not None:
+            _disk_hits += 1
+            return stored
+        _disk_misses += 1
+
+    with STAGE_SECONDS.time(stage="extract_text"):
+        text = extract_text(pdf_bytes)
+    result = {"text": text, "skills": match_skills(text)}
+
+    if SEMANTIC_SKILLS and text:
+        try:
+            # Exact matches win; semantic ones only add skills
+            for name, category in semantic_skills(text).items():
+                result["skills"].setdefault(name, category)
+        except Exception as e:
+            print(f"ERROR in semantic skill matching: {e}")
+            ERRORS.inc(component="semantic_skills")
+            # Exact-only result: serve it, but do not cache it
+            result["partial"] = True
+            return result
+
+    if text and parse_cache.enabled():
+        try:
+            parse_cache.save_parse(key, result)
+        except Exception as e:
+            print(f"ERROR writing resume parse cache: {e}")
+    return result
+
+
+def parse_resume(pdf_bytes):
+    """
+    Extract text and skills ({name: category}) from an uploaded PDF.
+    Results are cached by content in memory and, optionally, in SQLite.
+    """
+    key = _cache_key(pdf_bytes)
+    return _PARSE_CACHE.get_or_compute(
+        key,
+        lambda: _parse(key, pdf_bytes),
+        # Unreadable PDFs are not cached: a later backend may read them
+        cacheable=lambda result: bool(result["text"]) and not result.get("partial"),
+    )
+
+
+def _collect_cache_metrics():
+    stats = _PARSE_CACHE.stats()
+    yield ("prism_resume_cache_hits_total", "counter",
+           "Resume parses served from a cache tier.", {"tier": "memory"}, stats["hits"])
+    yield ("prism_resume_cache_hits_total", "counter",
+           "Resume parses served from a cache tier.", {"tier": "disk"}, _disk_hits)
+    yield ("prism_resume_cache_misses_total", "counter",
+           "Resume parses not found in a cache tier.", {"tier": "memory"}, stats["misses"])
+    yield ("prism_resume_cache_misses_total", "counter",
+           "Resume parses not found in a cache tier.", {"tier": "disk"}, _disk_misses)
+
+
+register_collector(_collect_cache_metrics)
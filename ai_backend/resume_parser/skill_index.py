@@ -0,0 +1,125 @@
+import json
+import os
+import re
+
+import numpy as np
+
+from metrics import STAGE_SECONDS
+
+# -------------------------
+# Semantic skill index
+# -------------------------
+# Every taxonomy name and alias is embedded once with the evaluator's model
+# and kept as one normalized float16 matrix on disk. A resume's noun chunks
+# are then mapped to their nearest canonical skill with one batched encode
+# and one matrix product, catching variants the exact matcher misses
+# ("convolutional networks" -> CNN).
+
+SKILL_INDEX_DIR = os.getenv(
+    "SKILL_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "skill_index"),
+)
+SKILL_SIMILARITY_THRESHOLD = float(os.getenv("SKILL_SIMILARITY_THRESHOLD", "0.75"))
+
+# Bounds the per-resume cost: chunks encoded and text handed to spaCy
+SKILL_MAX_CHUNKS = int(os.getenv("SKILL_MAX_CHUNKS", "512"))
+SKILL_MAX_CHUNK_CHARS = 48
+SKILL_NLP_MAX_CHARS = int(os.getenv("SKILL_NLP_MAX_CHARS", "50000"))
+
+_SKIP_POS = {"DET", "PRON", "PUNCT", "NUM", "CCONJ", "ADP"}
+
+
+def _normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    return matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+
+
+class SkillIndex:
+    """
+    Normalized taxonomy term vectors with the canonical skill of each row.
+    """
+
+    def __init__(self, names, categories, vectors):
+        self.names = list(names)
+        self.categories = dict(categories)
+        self.vectors = np.asarray(vectors, dtype=np.float16)
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def build(cls, matcher, encode):
+        """
+        Embed every term of a SkillMatcher with `encode(list_of_texts)`.
+        """
+        terms = [term for term, _ in matcher.terms]
+        vectors = _normalize(encode(terms)) if terms else np.zeros((0, 0), dtype=np.float32)
+        return cls([name for _, name in matcher.terms], matcher.skills, vectors)
+
+    @classmethod
+    def load_or_build(cls, matcher, encode, model_id, directory=SKILL_INDEX_DIR):
+        """
+        Load the index for this model and taxonomy version from `directory`,
+        building and saving it the first time.
+        """
+        if not directory:
+            return cls.build(matcher, encode)
+
+        safe_name = re.sub(r"[^A-Za-z0-9_.+-]+", "_", f"{model_id}-{matcher.version}")
+        array_path = os.path.join(directory, f"{safe_name}.npy")
+        labels_path = os.path.join(directory, f"{safe_name}.json")
+
+        if os.path.exists(array_path) and os.path.exists(labels_path):
+            try:
+                with open(labels_path, "r", encoding="utf-8") as f:
+                    labels = json.load(f)
+                return cls(labels["names"], labels["categories"], np.load(array_path))
+            except Exception as e:
+                print(f"WARNING: rebuilding unreadable skill index: {e}")
+
+        index = cls.build(matcher, encode)
+        os.makedirs(directory, exist_ok=True)
+        # Written under temporary names, then renamed: readers never see a partial file
+        np.save(array_path + ".tmp.npy", index.vectors)
+        with open(labels_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"names": index.names, "categories": index.categories}, f)
+        os.replace(array_path + ".tmp.npy", array_path)
+        os.replace(labels_path + ".tmp", labels_path)
+        return index
+
+    def nearest(self, vectors, threshold=SKILL_SIMILARITY_THRESHOLD):
+        """
+        For each row of `vectors`, (name, similarity) of the closest skill
+        term, or None below `threshold`.
+        """
+        if len(self) == 0 or len(vectors) == 0:
+            return [None] * len(vectors)
+
+        with STAGE_SECONDS.time(stage="skill_index_lookup"):
+            similarities = _normalize(vectors) @ self.vectors.T.astype(np.float32)
+            best = similarities.argmax(axis=1)
+            scores = similarities[np.arange(len(best)), best]
+
+        return [
+            (self.names[row], float(score)) if score >= threshold else None
+            for row, score in zip(best, scores)
+        ]
+
+
+def noun_chunks(nlp, text, limit=SKILL_MAX_CHUNKS):
+    """
+    Distinct noun chunks of `text` without determiners, pronouns or numbers,
+    lowercased, in order of appearance.
+    """
+    # Only the tagger and parser are needed for noun chunks
+    disable = [name for name in ("ner", "lemmatizer") if name in nlp.pipe_names]
+    doc = next(nlp.pipe([text[:SKILL_NLP_MAX_CHARS]], disable=disable))
+    chunks = {}
+    for chunk in doc.noun_chunks:
+        words = [token.text for token in chunk if token.pos_ not in _SKIP_POS]
+        phrase = " ".join(words).strip().lower()
+        if phrase and len(phrase) <= SKILL_MAX_CHUNK_CHARS:
+            chunks.setdefault(phrase, None)
+            if len(chunks) >= limit:
+                break
+    return list(chunks)
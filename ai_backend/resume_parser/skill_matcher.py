@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import re
+
+# -------------------------
+# Skill taxonomy matcher
+# -------------------------
+# Skills and their aliases are compiled into a trie over word tokens, so a
+# resume is matched against the whole taxonomy in one scan of its tokens,
+# whatever the taxonomy size. Tokens keep the characters that matter in
+# skill names ("c++", "c#", "node.js", ".net"); other punctuation separates
+# tokens, so "CI/CD", "ci cd" and "ci-cd" all match the same entry.
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "data", "skills.json")
+
+TOKEN_PATTERN = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9][a-z0-9+#]*)*")
+
+_END = ""  # trie key holding the (name, category) of a complete term
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Leftmost-longest matcher over a skill taxonomy.
+
+    entries: iterable of {"name", "category", "aliases"?, "match_name"?};
+    match_name=False matches only the aliases (for names that are also
+    common words, e.g. "Go").
+    """
+
+    def __init__(self, entries, version=None):
+        self.version = version
+        self._root = {}
+        self._max_terms = 0
+        self.skills = {}  # name -> category
+        self.terms = []   # (term, name) for every name and alias
+
+        for entry in entries:
+            name = entry["name"]
+            category = entry.get("category", "Other")
+            self.skills[name] = category
+
+            terms = list(entry.get("aliases", []))
+            if entry.get("match_name", True):
+                terms.append(name)
+            for term in terms:
+                self.terms.append((term, name))
+                self._add(tokenize(term), name, category)
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TAXONOMY_PATH):
+        """
+        Load a taxonomy file. The version combines the file's "version" with
+        a hash of its content, so edits invalidate caches keyed on it even if
+        the version was not bumped.
+        """
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw)
+        digest = hashlib.sha256(raw).hexdigest()[:12]
+        return cls(data["skills"], version=f"{data.get('version', '0')}+{digest}")
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _add(self, tokens, name, category):
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # First entry wins when two skills share an alias
+        node.setdefault(_END, (name, category))
+        self._max_terms = max(self._max_terms, len(tokens))
+
+    def _tokens(self, text):
+        for token in tokenize(text):
+            # "experience.python" (lost whitespace) -> "experience", "python"
+            if "." in token[1:] and token not in self._root:
+                yield from (part for part in token.split(".") if part)
+            else:
+                yield token
+
+    def match(self, text):
+        """
+        Return {name: category} for every skill mentioned in `text`, in order
+        of first mention.
+        """
+        tokens = list(self._tokens(text))
+        found = {}
+
+        i = 0
+        while i < len(tokens):
+            node = self._root
+            match, length = None, 0
+            for j in range(i, min(len(tokens), i + self._max_terms)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if _END in node:
+                    match, length = node[_END], j - i + 1
+
+            if match is None:
+                i += 1
+                continue
+
+            found.setdefault(*match)
+            i += length
+
+        return found
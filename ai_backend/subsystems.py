@@ -0,0 +1,197 @@
+import os
+import threading
+import time
+
+# -------------------------
+# Lazily loaded subsystems
+# -------------------------
+# Importing the app loads no model: each subsystem loads on first use, or in
+# the background at startup, so the server binds its port immediately and
+# one missing dependency only disables the endpoints that need it.
+
+WARMUP = os.getenv("WARMUP", "true") == "true"
+
+# background: load every subsystem right after startup (default)
+# lazy: load each one on the first request that needs it
+SUBSYSTEM_LOADING = os.getenv("SUBSYSTEM_LOADING", "background")
+
+
+class SubsystemUnavailable(RuntimeError):
+    def __init__(self, name, error):
+        super().__init__(f"{name} unavailable: {error}")
+        self.name = name
+        self.error = error
+
+
+class Subsystem:
+    """
+    A named, load-once dependency. load() runs the loader at most once at a
+    time; a failed load is recorded and retried on the next call.
+    """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self._loader = loader
+        self._lock = threading.Lock()
+        self.state = "pending"  # pending | loading | ready | failed
+        self.error = None
+        self.seconds = None
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    def load(self):
+        if self.state == "ready":
+            return
+
+        with self._lock:
+            if self.state == "ready":
+                return
+
+            self.state = "loading"
+            start = time.perf_counter()
+            try:
+                self._loader()
+            except Exception as e:
+                self.state = "failed"
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"ERROR loading {self.name}: {self.error}")
+                raise SubsystemUnavailable(self.name, self.error) from e
+            finally:
+                self.seconds = round(time.perf_counter() - start, 3)
+
+            self.state = "ready"
+            self.error = None
+            print(f"{self.name} ready in {self.seconds}s")
+
+    def status(self):
+        return {"state": self.state, "seconds": self.seconds, "error": self.error}
+
+
+# -------------------------
+# Loaders
+# -------------------------
+def _load_embeddings():
+    from executors import configure_inference_threads
+    from model.evaluator import get_embedding_model, get_keyword_store
+
+    # Thread counts must be applied before the model's first forward pass
+    configure_inference_threads()
+    model = get_embedding_model()
+    get_keyword_store()
+    if WARMUP:
+        model.encode("warmup")
+
+
+def _load_sentiment():
+    from model.evaluator import get_sentiment_analyzer
+
+    get_sentiment_analyzer()
+
+
+def _load_skills():
+    from resume_parser.parser import get_skill_matcher
+
+    get_skill_matcher()
+
+
+def _load_skill_index():
+    from resume_parser.parser import SEMANTIC_SKILLS, get_skill_index
+
+    if SEMANTIC_SKILLS:
+        get_skill_index()
+
+
+def _load_nlp():
+    from resume_parser.parser import get_nlp
+
+    get_nlp()
+
+
+def _load_gemini():
+    from question_generator.gemini_api import get_genai
+
+    get_genai()
+
+
+SUBSYSTEMS = {
+    s.name: s
+    for s in (
+        Subsystem("embeddings", _load_embeddings),
+        Subsystem("sentiment", _load_sentiment),
+        Subsystem("skills", _load_skills),
+        Subsystem("nlp", _load_nlp),
+        Subsystem("skill_index", _load_skill_index),
+        Subsystem("gemini", _load_gemini),
+    )
+}
+
+def _parse_resume_subsystems():
+    from resume_parser.parser import SEMANTIC_SKILLS
+
+    if SEMANTIC_SKILLS:
+        return ["skills", "embeddings", "nlp", "skill_index"]
+    return ["skills"]
+
+
+# Subsystems the endpoints require (see _require in main.py)
+PARSE_RESUME_SUBSYSTEMS = _parse_resume_subsystems()
+ENDPOINT_SUBSYSTEMS = list(dict.fromkeys(["embeddings", "sentiment", *PARSE_RESUME_SUBSYSTEMS]))
+
+# Subsystems that must be ready for /ready to report the worker routable
+READY_SUBSYSTEMS = [
+    name.strip()
+    for name in os.getenv("READY_SUBSYSTEMS", ",".join(ENDPOINT_SUBSYSTEMS)).split(",")
+    if name.strip() in SUBSYSTEMS
+]
+
+
+def require(*names):
+    """
+    Load (or wait for) the named subsystems.
+    Raises SubsystemUnavailable if one of them cannot be loaded.
+    """
+    for name in names:
+        SUBSYSTEMS[name].load()
+
+
+def all_ready(*names):
+    return all(SUBSYSTEMS[name].ready for name in names)
+
+
+def load_all(names=None):
+    """
+    Load every subsystem, continuing past failures (they stay reported).
+    """
+    for name in names or SUBSYSTEMS:
+        try:
+            SUBSYSTEMS[name].load()
+        except SubsystemUnavailable:
+            pass
+
+
+def load_in_background(names=None):
+    thread = threading.Thread(
+        target=load_all, args=(names,), name="subsystem-loader", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def routable(*names):
+    """
+    Whether requests needing `names` can be served. In lazy mode a subsystem
+    not loaded yet counts: the first request loads it. A failed one never does.
+    """
+    if SUBSYSTEM_LOADING != "lazy":
+        return all_ready(*names)
+    return all(SUBSYSTEMS[name].state in ("ready", "pending") for name in names)
+
+
+def readiness():
+    return {
+        "ready": routable(*READY_SUBSYSTEMS),
+        "required": READY_SUBSYSTEMS,
+        "subsystems": {name: s.status() for name, s in SUBSYSTEMS.items()},
+    }
@@ -0,0 +1,169 @@
+import os
+import sys
+import tempfile
+
+# Tests import modules the way the app does (run from ai_backend/):
+#   cd ai_backend && python -m pytest -q tests
+AI_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if AI_BACKEND_DIR not in sys.path:
+    sys.path.insert(0, AI_BACKEND_DIR)
+
+# Nothing under test may write into the real .cache directory or load models
+# at import time
+_CACHE_DIR = tempfile.mkdtemp(prefix="prism-tests-")
+os.environ.setdefault("WARMUP", "false")
+os.environ.setdefault("EMBEDDING_SNAPSHOT_DIR", "")
+os.environ.setdefault("KEYWORD_STORE_DIR", "")
+os.environ.setdefault("RESUME_CACHE_PATH", "")
+os.environ.setdefault("SKILL_INDEX_DIR", "")
+os.environ.setdefault("QUESTION_BANK_PATH", os.path.join(_CACHE_DIR, "question_bank.sqlite3"))
+os.environ.setdefault("QUESTION_STORE_PATH", os.path.join(_CACHE_DIR, "questions.sqlite3"))
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+import hashlib
+import re
+
+import numpy as np
+import pytest
+
+
+class HashEncoder:
+    """
+    Stand-in for the SentenceTransformer: bag-of-words hash vectors, so texts
+    sharing words are similar. `fail` makes the next encode calls raise.
+    """
+
+    dim = 32
+
+    def __init__(self):
+        self.calls = []
+        self.fail = 0
+
+    def _vector(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1
+        return vector if vector.any() else np.ones(self.dim, dtype=np.float32)
+
+    def encode(self, texts, convert_to_tensor=False, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        self.calls.append(texts)
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("encoder failed")
+        vectors = (
+            np.stack([self._vector(t) for t in texts]) if texts
+            else np.zeros((0, self.dim), dtype=np.float32)
+        )
+        if single:
+            vectors = vectors[0]
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(vectors)
+        return vectors
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    """
+    A fresh HashEncoder as the embedding model, with an empty keyword store.
+    """
+    from model import evaluator
+
+    model = HashEncoder()
+    monkeypatch.setattr(evaluator, "_MODEL", model)
+    monkeypatch.setattr(evaluator, "_KEYWORD_STORE", None)
+    return model
+
+
+class FakeGemini:
+    """
+    Stand-in for the google.generativeai module. Every prompt is answered
+    with `per_skill` questions per skill in the prompt's JSON array, after
+    `delay[model]` seconds (async calls); models in `failing` raise.
+    """
+
+    def __init__(self, models=("models/a", "models/b")):
+        self.models = list(models)
+        self.prompts = []
+        self.calls = []      # model names, in call order
+        self.delay = {}
+        self.failing = set()
+        self.per_skill = None
+        self.chunk_size = 17
+
+    def list_models(self):
+        import types
+        return [types.SimpleNamespace(name=name) for name in self.models]
+
+    def GenerativeModel(self, name):
+        return _FakeModel(self, name)
+
+    def answer(self, prompt):
+        import json
+        skills = json.loads(prompt[prompt.index("["):prompt.index("]") + 1])
+        per_skill = self.per_skill or int(re.search(r"EXACTLY (\d+)", prompt).group(1))
+        return json.dumps([
+            {"skill": skill, "question": f"{skill} question {i}", "keywords": ["design", "testing"]}
+            for skill in skills for i in range(per_skill)
+        ])
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeStream:
+    def __init__(self, text, size):
+        self._chunks = [text[i:i + size] for i in range(0, len(text), size)]
+
+    async def _iterate(self):
+        import asyncio
+        for chunk in self._chunks:
+            await asyncio.sleep(0)
+            yield _FakeResponse(chunk)
+
+    def __aiter__(self):
+        return self._iterate()
+
+
+class _FakeModel:
+    def __init__(self, gemini, name):
+        self.gemini = gemini
+        self.name = name
+
+    def _call(self, prompt):
+        self.gemini.calls.append(self.name)
+        self.gemini.prompts.append(prompt)
+        if self.name in self.gemini.failing:
+            raise RuntimeError(f"{self.name} failed")
+        return self.gemini.answer(prompt)
+
+    def generate_content(self, prompt, request_options=None):
+        return _FakeResponse(self._call(prompt))
+
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        import asyncio
+        await asyncio.sleep(self.gemini.delay.get(self.name, 0))
+        text = self._call(prompt)
+        return _FakeStream(text, self.gemini.chunk_size) if stream else _FakeResponse(text)
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    """
+    Route gemini_api through a FakeGemini with a fresh ModelRouter.
+    """
+    from question_generator import gemini_api
+    from question_generator.model_router import ModelRouter
+
+    gemini = FakeGemini()
+    monkeypatch.setattr(gemini_api, "get_genai", lambda: gemini)
+    monkeypatch.setattr(gemini_api, "ROUTER", ModelRouter(gemini.models, gemini_api._list_model_names))
+    monkeypatch.setattr(gemini_api, "_IN_FLIGHT", {})
+    return gemini
@@ -0,0 +1,54 @@
+import json
+import pathlib
+
+import pytest
+
+from model import backends
+
+
+@pytest.fixture
+def exports(monkeypatch):
+    calls = []
+
+    def fake_export(model_name, output_dir, quantize=True):
+        calls.append(model_name)
+        write_export(pathlib.Path(output_dir), model_name)
+
+    monkeypatch.setattr(backends, "export_onnx", fake_export)
+    monkeypatch.setattr(backends, "OnnxEmbeddingModel", lambda model_dir, *args: model_dir)
+    return calls
+
+
+def write_export(model_dir, model_name):
+    model_dir.mkdir(parents=True, exist_ok=True)
+    (model_dir / "model.onnx").write_bytes(b"")
+    (model_dir / "prism_onnx.json").write_text(json.dumps({"model": model_name}))
+
+
+def test_matching_export_is_reused(tmp_path, exports):
+    write_export(tmp_path, "model-a")
+    backends.load_embedding_model("model-a", "onnx", onnx_dir=str(tmp_path))
+    assert exports == []
+
+
+def test_export_of_another_model_in_configured_dir_raises(tmp_path, exports):
+    write_export(tmp_path, "model-a")
+    with pytest.raises(ValueError, match="model-a"):
+        backends.load_embedding_model("model-b", "onnx", onnx_dir=str(tmp_path))
+    assert exports == []
+
+
+def test_export_of_another_model_in_default_dir_is_replaced(tmp_path, monkeypatch, exports):
+    monkeypatch.setattr(backends, "DEFAULT_ONNX_DIR", str(tmp_path))
+    write_export(tmp_path / "model-b", "model-a")
+    backends.load_embedding_model("model-b", "onnx")
+
+    assert exports == ["model-b"]
+    assert backends.read_onnx_config(str(tmp_path / "model-b"))["model"] == "model-b"
+
+
+def test_missing_config_counts_as_mismatch(tmp_path, exports):
+    write_export(tmp_path, "model-a")
+    (tmp_path / "prism_onnx.json").unlink()
+    with pytest.raises(ValueError):
+        backends.load_embedding_model("model-a", "onnx", onnx_dir=str(tmp_path))
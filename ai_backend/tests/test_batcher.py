@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+import pytest
+
+from executors import INFERENCE_WORKERS
+from model import evaluator
+from model.batcher import MicroBatcher
+from response_evaluator import evaluator as response_evaluator
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def test_base_exception_fails_the_batch_and_the_worker_restarts():
+    calls = []
+
+    def encode_batch(texts):
+        calls.append(texts)
+        if len(calls) == 1:
+            raise Interrupted()
+        return [len(text) for text in texts]
+
+    batcher = MicroBatcher(encode_batch, max_wait_ms=0)
+
+    with pytest.raises(RuntimeError, match="did not complete"):
+        batcher.submit("first").result(timeout=5)
+    assert batcher.submit("second").result(timeout=5) == 6
+
+
+def test_cancelled_requests_are_not_encoded():
+    release = threading.Event()
+    encoded = []
+
+    def encode_batch(texts):
+        release.wait(5)
+        encoded.extend(texts)
+        return texts
+
+    batcher = MicroBatcher(encode_batch, max_wait_ms=0)
+    blocking = batcher.submit("blocking")  # holds the worker
+    cancelled = batcher.submit("cancelled")
+    assert cancelled.cancel()
+    kept = batcher.submit("kept")
+
+    release.set()
+    assert blocking.result(timeout=5) == "blocking"
+    assert kept.result(timeout=5) == "kept"
+    assert "cancelled" not in encoded
+
+
+def test_concurrent_evaluations_share_a_batch_larger_than_the_worker_pool(encoder, monkeypatch):
+    sizes = []
+
+    def recording(texts):
+        sizes.append(len(texts))
+        return evaluator.encode_responses(texts)
+
+    monkeypatch.setattr(evaluator, "MICROBATCH_ENABLED", True)
+    monkeypatch.setattr(evaluator, "_BATCHER", MicroBatcher(recording, max_wait_ms=500))
+    monkeypatch.setattr(response_evaluator._RESULT_CACHE, "max_entries", 0)
+
+    count = INFERENCE_WORKERS * 3
+    payloads = [
+        {
+            "response": f"answer number {i} about caching",
+            "question": {"text": "Q", "expected_keywords": [{"keyword": "caching", "weight": 1.0}]},
+        }
+        for i in range(count)
+    ]
+
+    async def main():
+        return await asyncio.gather(*(response_evaluator.evaluate_async(p) for p in payloads))
+
+    results = asyncio.run(main())
+
+    assert [r["response"] for r in results] == [p["response"] for p in payloads]
+    assert not any(r.get("degraded") for r in results)
+    assert max(sizes) > INFERENCE_WORKERS
+
+
+def test_async_evaluation_matches_the_sync_path(encoder, monkeypatch):
+    monkeypatch.setattr(response_evaluator._RESULT_CACHE, "max_entries", 0)
+    payload = {
+        "response": "cache invalidation on writes",
+        "question": {"text": "Q", "expected_keywords": [{"keyword": "cache invalidation", "weight": 1.0}]},
+    }
+    for enabled in (True, False):
+        monkeypatch.setattr(evaluator, "MICROBATCH_ENABLED", enabled)
+        assert asyncio.run(response_evaluator.evaluate_async(payload)) == response_evaluator.evaluate(payload)
@@ -0,0 +1,105 @@
+import threading
+import time
+
+from cache import TTLCache
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(max_entries=2, ttl_seconds=10)
+    cache.put("a", 1)
+
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+
+
+def test_disabled_cache_always_computes():
+    cache = TTLCache(max_entries=0)
+    calls = []
+    for _ in range(2):
+        cache.get_or_compute("k", lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_concurrent_misses_compute_once():
+    cache = TTLCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+        for _ in range(5)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["value"] * 5
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_error_reaches_waiters_and_is_not_cached():
+    cache = TTLCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_compute("k", compute)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert len(errors) == 2
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
+
+
+def test_uncacheable_results_are_returned_but_not_stored():
+    cache = TTLCache()
+    assert cache.get_or_compute("k", lambda: {"degraded": True}, cacheable=lambda v: not v.get("degraded")) == {"degraded": True}
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+QUESTION = {
+    "text": "How do you cache API responses?",
+    "expected_keywords": [{"keyword": "cache invalidation", "weight": 1.0}],
+}
+
+
+@pytest.fixture
+def client(encoder, monkeypatch):
+    async def ready(*names):
+        pass
+
+    monkeypatch.setattr(main, "_require", ready)
+    return TestClient(main.app)
+
+
+def assert_rejected(websocket, error):
+    assert error in websocket.receive_json()["error"]
+    assert websocket.receive()["code"] == 1003
+
+
+@pytest.mark.parametrize("opening", ["[1, 2]", '"question"', "42", "null"])
+def test_opening_message_must_be_an_object(client, opening):
+    with client.websocket_connect("/evaluate-stream") as websocket:
+        websocket.send_text(opening)
+        assert_rejected(websocket, "JSON object")
+
+
+def test_invalid_json_is_rejected(client):
+    with client.websocket_connect("/evaluate-stream") as websocket:
+        websocket.send_text("{not json")
+        assert_rejected(websocket, "not valid JSON")
+
+
+def test_invalid_question_is_rejected(client):
+    with client.websocket_connect("/evaluate-stream") as websocket:
+        websocket.send_json({"question": {"expected_keywords": []}})
+        assert_rejected(websocket, "Invalid question")
+
+
+def test_chunk_messages_are_validated(client):
+    with client.websocket_connect("/evaluate-stream") as websocket:
+        websocket.send_json({"question": QUESTION})
+        assert websocket.receive_json() == {"ready": True}
+
+        websocket.send_json({"chunk": "Cache invalidation."})
+        assert websocket.receive_json()["feedback"]["matched_keywords"] == ["cache invalidation"]
+
+        websocket.send_text('["chunk"]')
+        assert_rejected(websocket, "JSON object")
+
+
+def test_non_string_chunk_is_rejected(client):
+    with client.websocket_connect("/evaluate-stream") as websocket:
+        websocket.send_json({"question": QUESTION})
+        websocket.receive_json()
+        websocket.send_json({"chunk": ["a", "b"]})
+        assert_rejected(websocket, "chunk must be a string")
+
+
+def test_final_message_returns_full_result(client):
+    with client.websocket_connect("/evaluate-stream") as websocket:
+        websocket.send_json({"question": QUESTION})
+        websocket.receive_json()
+        websocket.send_json({"final": True, "chunk": "cache invalidation"})
+        result = websocket.receive_json()
+        assert result["feedback"]["matched_keywords"] == ["cache invalidation"]
+
+
+def test_evaluation_error_closes_with_internal_error(client, encoder):
+    with client.websocket_connect("/evaluate-stream") as websocket:
+        websocket.send_json({"question": QUESTION})
+        websocket.receive_json()
+
+        encoder.fail = 1
+        websocket.send_json({"chunk": "Cache invalidation."})
+        assert websocket.receive_json() == {"error": "Evaluation failed"}
+        assert websocket.receive()["code"] == 1011
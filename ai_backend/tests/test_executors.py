@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+import pytest
+
+from executors import BoundedExecutor, ExecutorSaturated
+
+
+def test_runs_jobs_and_returns_results():
+    executor = BoundedExecutor("test", max_workers=2, max_queue=2)
+
+    async def main():
+        return await asyncio.gather(*(executor.run(pow, i, 2) for i in range(4)))
+
+    assert asyncio.run(main()) == [0, 1, 4, 9]
+    stats = executor.stats()
+    assert stats["completed"] == 4
+    assert stats["running"] == stats["queued"] == 0
+
+
+def test_rejects_beyond_workers_plus_queue():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        stats = executor.stats()
+        assert (stats["running"], stats["queued"]) == (1, 1)
+        with pytest.raises(ExecutorSaturated) as excinfo:
+            await executor.run(release.wait)
+        assert excinfo.value.name == "test"
+
+        release.set()
+        await asyncio.gather(running, queued)
+        # Capacity is back once the jobs finish
+        return await executor.run(lambda: "ok")
+
+    assert asyncio.run(main()) == "ok"
+    assert executor.rejected == 1
+
+
+def test_cancelled_request_keeps_its_slot_until_the_job_ends():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def main():
+        task = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(lambda: None)
+        release.set()
+        for _ in range(100):
+            if executor.stats()["running"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        return await executor.run(lambda: "ok")
+
+    assert asyncio.run(main()) == "ok"
+
+
+def test_job_errors_propagate_and_release_the_slot():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+
+    async def main():
+        with pytest.raises(ZeroDivisionError):
+            await executor.run(lambda: 1 / 0)
+        return await executor.run(lambda: "ok")
+
+    assert asyncio.run(main()) == "ok"
+    assert executor.stats()["completed"] == 2
@@ -0,0 +1,120 @@
+import asyncio
+
+from question_generator import gemini_api
+
+
+def stream(skills, per_skill=2, on_shard_end=None):
+    async def run():
+        return [
+            q async for q in gemini_api.stream_questions_for_skills_async(
+                skills, per_skill, on_shard_end=on_shard_end
+            )
+        ]
+    return asyncio.run(run())
+
+
+def test_stream_reports_each_shard_once_it_ends(fake_gemini, monkeypatch):
+    monkeypatch.setattr(gemini_api, "QUESTION_SHARD_SIZE", 2)
+    ended = []
+
+    async def on_shard_end(questions):
+        ended.append(sorted({q["skill"] for q in questions}))
+
+    questions = stream(["A", "B", "C"], on_shard_end=on_shard_end)
+
+    assert len(questions) == 6
+    assert sorted(ended) == [["A", "B"], ["C"]]
+
+
+def test_single_shard_stream_reports_its_end(fake_gemini):
+    ended = []
+
+    async def on_shard_end(questions):
+        ended.append(len(questions))
+
+    assert len(stream(["A"], per_skill=3, on_shard_end=on_shard_end)) == 3
+    assert ended == [3]
+
+
+def test_failed_shard_yields_nothing_and_reports_nothing(fake_gemini):
+    fake_gemini.failing = set(fake_gemini.models)
+    ended = []
+
+    async def on_shard_end(questions):
+        ended.append(questions)
+
+    assert stream(["A"], on_shard_end=on_shard_end) == []
+    assert ended == []
+
+
+def q(skill, text):
+    return {"skill": skill, "text": text, "keywords": []}
+
+
+def test_shard_skills_dedups_and_keeps_first_spelling():
+    shards = gemini_api.shard_skills(["Python", "SQL", " python ", "Go", "sql", "Rust"], size=2)
+    assert shards == [["Python", "SQL"], ["Go", "Rust"]]
+    assert gemini_api.shard_skills([], size=2) == []
+
+
+def test_merge_groups_by_input_order_and_drops_duplicates():
+    merged = gemini_api.merge_questions(
+        ["B", "A"],
+        [
+            [q("A", "a1"), q("Made up", "m1"), q("b", "b1")],
+            [q("B", "b2"), q("a", "A1 "), q("A", "a2")],
+        ],
+    )
+    assert [(x["skill"], x["text"]) for x in merged] == [
+        ("b", "b1"), ("B", "b2"),
+        ("A", "a1"), ("A", "a2"),
+        ("Made up", "m1"),
+    ]
+
+
+def test_sync_generation_sends_one_prompt_per_shard(fake_gemini, monkeypatch):
+    monkeypatch.setattr(gemini_api, "QUESTION_SHARD_SIZE", 2)
+    questions = gemini_api.generate_questions_for_skills(["A", "B", "C", "a"], per_skill=2)
+
+    assert len(fake_gemini.prompts) == 2
+    assert [x["skill"] for x in questions] == ["A", "A", "B", "B", "C", "C"]
+
+
+def test_async_generation_sends_one_prompt_per_shard(fake_gemini, monkeypatch):
+    monkeypatch.setattr(gemini_api, "QUESTION_SHARD_SIZE", 2)
+    questions = asyncio.run(gemini_api.generate_questions_for_skills_async(["C", "B", "A"], per_skill=1))
+
+    assert len(fake_gemini.prompts) == 2
+    assert [x["skill"] for x in questions] == ["C", "B", "A"]
+
+
+def test_failed_shard_does_not_lose_the_others(fake_gemini, monkeypatch):
+    monkeypatch.setattr(gemini_api, "QUESTION_SHARD_SIZE", 1)
+    answer = fake_gemini.answer
+
+    def flaky(prompt):
+        if '"B"' in prompt:
+            raise RuntimeError("shard failed")
+        return answer(prompt)
+
+    monkeypatch.setattr(fake_gemini, "answer", flaky)
+    sync = gemini_api.generate_questions_for_skills(["A", "B", "C"], per_skill=1)
+    concurrent = asyncio.run(gemini_api.generate_questions_for_skills_async(["A", "B", "C"], per_skill=1))
+
+    assert [x["skill"] for x in sync] == ["A", "C"]
+    assert [x["skill"] for x in concurrent] == ["A", "C"]
+
+
+def test_identical_concurrent_shards_share_one_call(fake_gemini):
+    fake_gemini.delay = {name: 0.05 for name in fake_gemini.models}
+
+    async def main():
+        return await asyncio.gather(
+            gemini_api.generate_questions_for_skills_async(["Python", "SQL"]),
+            gemini_api.generate_questions_for_skills_async(["sql", "python"]),
+        )
+
+    first, second = asyncio.run(main())
+    assert len(fake_gemini.prompts) == 1
+    assert len(first) == len(second) == 4
+    assert [x["skill"] for x in second] == ["SQL", "SQL", "Python", "Python"]
@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+
+from model.keyword_store import KeywordEmbeddingStore
+
+DIM = 4
+
+
+def encoder(calls):
+    def encode(keywords):
+        calls.append(list(keywords))
+        # Each keyword gets a distinct, recognizable vector
+        return np.array([[float(sum(map(ord, k)))] * DIM for k in keywords], dtype=np.float32)
+    return encode
+
+
+def expected(keyword):
+    return np.full(DIM, float(sum(map(ord, keyword))), dtype=np.float32)
+
+
+def test_encodes_only_missing_keywords():
+    calls = []
+    store = KeywordEmbeddingStore("m", DIM)
+    store.get_many(["a", "b"], encoder(calls))
+    vectors = store.get_many(["b", "c", "b"], encoder(calls))
+
+    assert calls == [["a", "b"], ["c"]]
+    assert vectors.shape == (3, DIM)
+    np.testing.assert_array_equal(vectors[0], expected("b"))
+    np.testing.assert_array_equal(vectors[2], expected("b"))
+
+
+def test_empty_request_returns_empty_matrix():
+    store = KeywordEmbeddingStore("m", DIM)
+    assert store.get_many([], encoder([])).shape == (0, DIM)
+
+
+def test_persisted_rows_survive_reopen(tmp_path):
+    calls = []
+    KeywordEmbeddingStore("m", DIM, str(tmp_path)).get_many(["python"], encoder(calls))
+    reopened = KeywordEmbeddingStore("m", DIM, str(tmp_path), memory_entries=0)
+    vectors = reopened.get_many(["python"], encoder(calls))
+
+    assert calls == [["python"]]
+    np.testing.assert_array_equal(vectors[0], expected("python"))
+
+
+def test_lru_eviction_reuses_rows(tmp_path):
+    calls = []
+    store = KeywordEmbeddingStore("m", DIM, str(tmp_path), max_entries=2, memory_entries=0)
+    store.get_many(["a", "b"], encoder(calls))
+    store.get_many(["a"], encoder(calls))      # "b" is now least recently used
+    store.get_many(["c"], encoder(calls))      # evicts "b"
+
+    assert len(store) == 2
+    store.get_many(["a", "c"], encoder(calls))
+    assert calls[-1] == ["c"]
+    store.get_many(["b"], encoder(calls))
+    assert calls[-1] == ["b"]
+
+
+def test_reader_never_sees_a_row_reused_by_another_worker(tmp_path):
+    # Two stores on one directory stand for two worker processes
+    calls = []
+    reader = KeywordEmbeddingStore("m", DIM, str(tmp_path), max_entries=1, memory_entries=0)
+    writer = KeywordEmbeddingStore("m", DIM, str(tmp_path), max_entries=1, memory_entries=0)
+
+    reader.get_many(["x"], encoder(calls))
+    # The writer evicts "x" and writes "y" into the same row
+    writer.get_many(["y"], encoder(calls))
+
+    vectors = reader.get_many(["x"], encoder(calls))
+    np.testing.assert_array_equal(vectors[0], expected("x"))
+    assert calls[-1] == ["x"]
+
+
+def test_generation_detects_rewrites_within_one_mtime_tick(tmp_path):
+    calls = []
+    reader = KeywordEmbeddingStore("m", DIM, str(tmp_path), max_entries=2, memory_entries=0)
+    writer = KeywordEmbeddingStore("m", DIM, str(tmp_path), max_entries=2, memory_entries=0)
+    reader.get_many(["x"], encoder(calls))
+
+    # Two index writes back to back, then the index file's mtime is reset:
+    # only the generation tells the reader its index is stale
+    before = os.stat(writer._index_path)
+    writer.get_many(["y", "z"], encoder(calls))
+    writer.get_many(["x"], encoder(calls))
+    os.utime(writer._index_path, ns=(before.st_atime_ns, before.st_mtime_ns))
+
+    for keyword in ("x", "y", "z"):
+        np.testing.assert_array_equal(reader.get_many([keyword], encoder(calls))[0], expected(keyword))
+
+
+def test_rows_left_mid_update_are_ignored(tmp_path):
+    calls = []
+    store = KeywordEmbeddingStore("m", DIM, str(tmp_path), memory_entries=0)
+    store.get_many(["x"], encoder(calls))
+
+    # A writer died after marking the array dirty and overwriting rows
+    store._header()[1] = 1
+    store._array[:store.max_entries] = 0
+
+    other = KeywordEmbeddingStore("m", DIM, str(tmp_path), memory_entries=0)
+    np.testing.assert_array_equal(other.get_many(["x"], encoder(calls))[0], expected("x"))
+    np.testing.assert_array_equal(store.get_many(["x"], encoder(calls))[0], expected("x"))
@@ -0,0 +1,34 @@
+import metrics
+
+
+def test_collector_samples_are_grouped_per_metric(monkeypatch):
+    def collect():
+        for pool in ("a", "b"):
+            yield ("prism_test_running", "gauge", "Running.", {"pool": pool}, 1)
+            yield ("prism_test_queued", "gauge", "Queued.", {"pool": pool}, 2)
+
+    monkeypatch.setattr(metrics, "_COLLECTORS", [collect])
+    lines = [
+        line for line in metrics.render_metrics().splitlines()
+        if "prism_test_" in line
+    ]
+
+    assert lines == [
+        "# HELP prism_test_running Running.",
+        "# TYPE prism_test_running gauge",
+        'prism_test_running{pool="a"} 1.0',
+        'prism_test_running{pool="b"} 1.0',
+        "# HELP prism_test_queued Queued.",
+        "# TYPE prism_test_queued gauge",
+        'prism_test_queued{pool="a"} 2.0',
+        'prism_test_queued{pool="b"} 2.0',
+    ]
+
+
+def test_failing_collector_is_skipped(monkeypatch):
+    def broken():
+        raise RuntimeError("boom")
+        yield
+
+    monkeypatch.setattr(metrics, "_COLLECTORS", [broken])
+    metrics.render_metrics()
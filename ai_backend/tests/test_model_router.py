@@ -0,0 +1,156 @@
+import asyncio
+import time
+
+import pytest
+
+from question_generator import model_router
+from question_generator.model_router import GENERATE, STREAM, DeadlineExceeded, ModelRouter
+
+
+@pytest.fixture
+def fast_hedging(monkeypatch):
+    # Hedge after 50ms instead of the production defaults
+    monkeypatch.setattr(model_router, "GEMINI_HEDGE_MIN_SECONDS", 0.05)
+    monkeypatch.setattr(model_router, "GEMINI_HEDGE_DEFAULT_SECONDS", 0.05)
+
+
+def router(models=("a", "b")):
+    return ModelRouter(models, lambda: list(models))
+
+
+def fake_request(delays, failing=(), started=None, cancelled=None):
+    async def request(name):
+        if started is not None:
+            started.append(name)
+        try:
+            await asyncio.sleep(delays.get(name, 0))
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(name)
+            raise
+        if name in failing:
+            raise RuntimeError(f"{name} failed")
+        return f"answer from {name}"
+    return request
+
+
+def test_slow_primary_is_hedged_and_the_loser_cancelled(fast_hedging):
+    started, cancelled = [], []
+    request = fake_request({"a": 1.0, "b": 0.0}, started=started, cancelled=cancelled)
+
+    name, result = asyncio.run(router().call(request))
+
+    assert (name, result) == ("b", "answer from b")
+    assert started == ["a", "b"]
+    assert cancelled == ["a"]
+
+
+def test_fast_primary_is_not_hedged(fast_hedging):
+    started = []
+    name, _ = asyncio.run(router().call(fake_request({"a": 0.0}, started=started)))
+
+    assert name == "a"
+    assert started == ["a"]
+
+
+def test_failed_call_falls_back_to_the_next_model():
+    name, _ = asyncio.run(router().call(fake_request({}, failing={"a"})))
+    assert name == "b"
+
+
+def test_every_model_failing_raises_the_last_error():
+    with pytest.raises(RuntimeError, match="b failed"):
+        asyncio.run(router().call(fake_request({}, failing={"a", "b"})))
+
+
+def test_async_call_raises_at_its_deadline(fast_hedging):
+    cancelled = []
+    request = fake_request({"a": 1.0, "b": 1.0}, cancelled=cancelled)
+    r = router()
+
+    began = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(r.call(request, deadline=time.monotonic() + 0.2))
+
+    assert time.monotonic() - began < 0.9
+    assert sorted(cancelled) == ["a", "b"]
+    assert r.stats["a"].error_rate() == 1.0
+
+
+def test_sync_call_passes_the_remaining_time_and_stops_at_the_deadline():
+    timeouts = []
+
+    def request(name, timeout):
+        timeouts.append(timeout)
+        time.sleep(0.15)
+        raise TimeoutError(name)
+
+    with pytest.raises(DeadlineExceeded):
+        router().call_sync(request, deadline=time.monotonic() + 0.1)
+
+    assert len(timeouts) == 1 and 0 < timeouts[0] <= 0.1
+
+
+def test_sync_call_falls_back_on_error():
+    def request(name, timeout):
+        if name == "a":
+            raise RuntimeError("a failed")
+        return name
+
+    assert router().call_sync(request) == ("b", "b")
+
+
+def test_demoted_model_recovers_once_its_errors_age_out(monkeypatch):
+    monkeypatch.setattr(model_router, "GEMINI_ERROR_WINDOW_SECONDS", 0.1)
+    r = router()
+    r.stats["a"].record(ok=False)
+
+    assert r.models() == ["b", "a"]
+    time.sleep(0.15)
+    assert r.stats["a"].error_rate() == 0.0
+    assert r.models() == ["a", "b"]
+
+
+def test_stream_and_generate_latencies_are_kept_apart(monkeypatch):
+    monkeypatch.setattr(model_router, "GEMINI_HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(model_router, "GEMINI_HEDGE_MIN_SECONDS", 0.0)
+    r = router()
+    for _ in range(3):
+        r.stats["a"].record(10.0, kind=GENERATE)
+        r.stats["a"].record(0.5, kind=STREAM)
+
+    assert r.hedge_delay("a", GENERATE) == 10.0
+    assert r.hedge_delay("a", STREAM) == 0.5
+
+    samples = {
+        (labels["model"], labels["call"]): value
+        for name, _, _, labels, value in r.collect_metrics()
+        if name == "prism_gemini_model_p95_seconds"
+    }
+    assert samples == {("a", GENERATE): 10.0, ("a", STREAM): 0.5}
+
+
+def test_stream_calls_record_under_their_own_kind():
+    r = router()
+    asyncio.run(r.call(fake_request({}), kind=STREAM))
+
+    assert len(r.stats["a"]._latencies[STREAM]) == 1
+    assert len(r.stats["a"]._latencies[GENERATE]) == 0
+
+
+def test_model_list_is_refreshed_and_kept_when_listing_fails(monkeypatch):
+    listed = [["a", "b"]]
+
+    def list_models():
+        if not listed:
+            raise ConnectionError("offline")
+        return listed.pop()
+
+    r = ModelRouter(["a", "b"], list_models)
+    assert r.models() == ["a", "b"]
+
+    monkeypatch.setattr(model_router, "GEMINI_MODEL_LIST_TTL_SECONDS", 0.0)
+    assert r.models() == ["a", "b"]
+
+    listed.append(["b"])
+    assert r.models() == ["b"]
@@ -0,0 +1,95 @@
+import pytest
+
+from benchmarks import corpus
+from cache import TTLCache
+from resume_parser import parse_cache, service
+
+
+@pytest.fixture
+def extractions(tmp_path, monkeypatch):
+    """
+    Empty memory and disk tiers; returns the list of texts actually extracted.
+    """
+    monkeypatch.setattr(parse_cache, "RESUME_CACHE_PATH", str(tmp_path / "parses.sqlite3"))
+    monkeypatch.setattr(parse_cache, "_initialized", False)
+    monkeypatch.setattr(service, "_PARSE_CACHE", TTLCache(max_entries=16, ttl_seconds=600))
+    monkeypatch.setattr(service, "SEMANTIC_SKILLS", False)
+
+    calls = []
+    extract_text = service.extract_text
+
+    def counting(pdf_bytes):
+        calls.append(pdf_bytes)
+        return extract_text(pdf_bytes)
+
+    monkeypatch.setattr(service, "extract_text", counting)
+    return calls
+
+
+@pytest.fixture(scope="module")
+def pdf():
+    return corpus.resume_pdf(pages=2)
+
+
+def test_repeat_upload_is_parsed_once(extractions, pdf):
+    first = service.parse_resume(pdf)
+    second = service.parse_resume(bytes(pdf))
+
+    assert len(extractions) == 1
+    assert first["skills"] and second == first
+
+
+def test_disk_tier_survives_a_restart(extractions, pdf, monkeypatch):
+    first = service.parse_resume(pdf)
+    # A new process: empty memory tier, same SQLite file
+    monkeypatch.setattr(service, "_PARSE_CACHE", TTLCache(max_entries=16, ttl_seconds=600))
+    second = service.parse_resume(pdf)
+
+    assert len(extractions) == 1
+    assert second == {"text": first["text"], "skills": first["skills"]}
+
+
+def test_unreadable_pdf_is_not_cached(extractions):
+    for _ in range(2):
+        assert service.parse_resume(b"not a pdf") == {"text": "", "skills": {}}
+    assert len(extractions) == 2
+
+
+def test_partial_semantic_result_is_not_cached(extractions, pdf, monkeypatch):
+    def broken(text):
+        raise RuntimeError("embeddings unavailable")
+
+    monkeypatch.setattr(service, "SEMANTIC_SKILLS", True)
+    monkeypatch.setattr(service, "semantic_skills", broken)
+    monkeypatch.setattr(service, "embedding_model_id", lambda: "test-model")
+
+    result = service.parse_resume(pdf)
+    assert result["partial"] is True and result["skills"]
+    service.parse_resume(pdf)
+    assert len(extractions) == 2
+    assert parse_cache.load_parse(service._cache_key(pdf)) is None
+
+
+def test_key_covers_limits_and_matching_mode(pdf, monkeypatch):
+    monkeypatch.setattr(service, "SEMANTIC_SKILLS", False)
+    exact = service._cache_key(pdf)
+    monkeypatch.setattr(service, "PDF_MAX_PAGES", service.PDF_MAX_PAGES + 1)
+    assert service._cache_key(pdf) != exact
+    monkeypatch.setattr(service, "SEMANTIC_SKILLS", True)
+    monkeypatch.setattr(service, "embedding_model_id", lambda: "test-model")
+    assert service._cache_key(pdf).endswith(":semantic-test-model")
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(parse_cache, "RESUME_CACHE_PATH", str(tmp_path / "parses.sqlite3"))
+    monkeypatch.setattr(parse_cache, "_initialized", False)
+    monkeypatch.setattr(parse_cache, "RESUME_CACHE_DISK_ENTRIES", 2)
+
+    for key in ("a", "b"):
+        parse_cache.save_parse(key, {"text": key, "skills": {}})
+    parse_cache.load_parse("a")
+    parse_cache.save_parse("c", {"text": "c", "skills": {}})
+
+    assert parse_cache.load_parse("b") is None
+    assert parse_cache.load_parse("a") == {"text": "a", "skills": {}}
+    assert parse_cache.load_parse("c") is not None
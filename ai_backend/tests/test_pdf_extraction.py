@@ -0,0 +1,63 @@
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from benchmarks import corpus
+from resume_parser import parser
+
+
+class BrokenPool:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.fixture(scope="module")
+def pdf():
+    return corpus.resume_pdf(pages=4)
+
+
+def test_parallel_extraction_is_off_by_default():
+    assert parser.PDF_PROCESS_WORKERS < 2
+
+
+def test_sequential_extraction(pdf):
+    text = parser.extract_text(pdf, max_pages=0, max_chars=0)
+    assert text.strip()
+
+
+def test_limits_apply(pdf):
+    full = parser.extract_text(pdf, max_pages=0, max_chars=0)
+    assert len(parser.extract_text(pdf, max_pages=0, max_chars=100)) == 100
+    assert len(parser.extract_text(pdf, max_pages=1, max_chars=0)) < len(full)
+
+
+def test_unreadable_input_returns_empty_text():
+    assert parser.extract_text(b"not a pdf") == ""
+    assert parser.extract_text("/nonexistent.pdf") == ""
+
+
+def test_broken_pool_is_replaced_and_extraction_falls_back(pdf, monkeypatch):
+    sequential = parser.extract_text(pdf, max_pages=0, max_chars=0)
+    broken = BrokenPool()
+    monkeypatch.setattr(parser, "PDF_PROCESS_WORKERS", 2)
+    monkeypatch.setattr(parser, "PDF_PARALLEL_MIN_PAGES", 1)
+    monkeypatch.setattr(parser, "_POOL", broken)
+    monkeypatch.setattr(parser, "_POOL_PID", parser.os.getpid())
+
+    text = parser.extract_text(pdf, max_pages=0, max_chars=0)
+
+    assert text == sequential
+    assert broken.shut_down
+    assert parser._POOL is None
+
+    rebuilt = parser._get_pool()
+    try:
+        assert rebuilt is not broken
+    finally:
+        parser._discard_pool(rebuilt)
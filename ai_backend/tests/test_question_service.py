@@ -0,0 +1,201 @@
+import asyncio
+import threading
+
+import anyio
+import pytest
+
+from question_generator import question_bank, question_store, service
+
+
+@pytest.fixture
+def bank(tmp_path, monkeypatch, encoder):
+    """
+    Empty question bank and store; Gemini counts as loaded.
+    """
+    monkeypatch.setattr(question_bank, "QUESTION_BANK_PATH", str(tmp_path / "bank.sqlite3"))
+    monkeypatch.setattr(question_bank, "_initialized", False)
+    monkeypatch.setattr(question_store, "QUESTION_STORE_PATH", str(tmp_path / "questions.sqlite3"))
+    monkeypatch.setattr(question_store, "_initialized", False)
+    monkeypatch.setattr(service, "require", lambda *names: None)
+
+
+def questions_for(skills, count, tag="v1"):
+    return [
+        {"skill": skill, "text": f"{skill} question {i} {tag}", "keywords": ["design", "testing"]}
+        for skill in skills for i in range(count)
+    ]
+
+
+class Calls(list):
+    pass
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """
+    Fake generation: each skill gets `answer_count[0]` questions (fewer than
+    the bank's minimum by default). Returns the list of requested skill lists.
+    """
+    calls = Calls()
+    answer_count = [1]
+
+    def generate(skills, per_skill=2):
+        calls.append(list(skills))
+        return questions_for(skills, answer_count[0], tag=f"v{len(calls)}")
+
+    async def generate_async(skills, per_skill=2):
+        return generate(skills, per_skill)
+
+    async def stream(skills, per_skill=2, on_shard_end=None):
+        questions = generate(skills, per_skill)
+        for question in questions:
+            yield question
+        if on_shard_end is not None:
+            await on_shard_end(questions)
+
+    monkeypatch.setattr(service, "generate_questions_for_skills", generate)
+    monkeypatch.setattr(service, "generate_questions_for_skills_async", generate_async)
+    monkeypatch.setattr(service, "stream_questions_for_skills_async", stream)
+    calls.answer_count = answer_count
+    return calls
+
+
+
+
+def test_short_answer_still_marks_skills_fresh(bank, gemini):
+    assert question_bank.QUESTION_BANK_MIN_QUESTIONS > 1
+    first = service.generate_questions(["Python", "SQL"])
+    second = service.generate_questions([" python ", "SQL"])
+
+    assert len(gemini) == 1
+    assert [q["skill"] for q in first] == ["Python", "SQL"]
+    assert [q["text"] for q in second] == [q["text"] for q in first]
+
+
+def test_skill_without_any_question_is_asked_again(bank, gemini, monkeypatch):
+    def generate(skills, per_skill=2):
+        gemini.append(list(skills))
+        return questions_for([s for s in skills if s != "SQL"], 1)
+
+    monkeypatch.setattr(service, "generate_questions_for_skills", generate)
+    service.generate_questions(["Python", "SQL"])
+    service.generate_questions(["Python", "SQL"])
+
+    assert gemini == [["Python", "SQL"], ["SQL"]]
+
+
+def test_async_generation_marks_skills_fresh(bank, gemini):
+    asyncio.run(service.generate_questions_async(["Go"]))
+    again = asyncio.run(service.generate_questions_async(["go"]))
+
+    assert len(gemini) == 1
+    assert [q["skill"] for q in again] == ["go"]
+
+
+def test_async_generation_stores_questions_on_the_inference_pool(bank, gemini, monkeypatch):
+    threads = []
+    save_questions = service.save_questions
+
+    def recording(questions):
+        threads.append(threading.current_thread().name)
+        return save_questions(questions)
+
+    monkeypatch.setattr(service, "save_questions", recording)
+    questions = asyncio.run(service.generate_questions_async(["Go"]))
+
+    assert len(threads) == 1 and threads[0].startswith("inference-pool")
+    assert all(question_store.load_question(q["id"]) for q in questions)
+
+
+def test_bank_serves_banked_questions_with_ids(bank, gemini):
+    gemini.answer_count[0] = 4
+    first = service.generate_questions(["Python"])
+    service.generate_questions(["Python"])
+
+    assert len(gemini) == 1
+    assert len(first) == service.QUESTIONS_PER_SKILL
+    assert all(question_store.load_question(q["id"]) for q in first)
+
+
+def collect(skills):
+    async def run():
+        return [q async for q in await service.stream_questions(skills)]
+    return asyncio.run(run())
+
+
+def test_completed_stream_marks_skills_fresh(bank, gemini):
+    streamed = collect(["Python"])
+    again = collect(["Python"])
+
+    assert len(gemini) == 1
+    assert [q["id"] for q in again] == [q["id"] for q in streamed]
+
+
+def test_abandoned_stream_does_not_mark_skills_fresh(bank, gemini):
+    gemini.answer_count[0] = 3
+
+    async def first_only():
+        stream = await service.stream_questions(["Python"])
+        question = await stream.__anext__()
+        await stream.aclose()
+        return question
+
+    asyncio.run(first_only())
+    assert question_bank.missing_skills(["Python"]) == ["Python"]
+
+
+def test_streamed_questions_are_stored_in_one_batch_with_their_sent_ids(bank, gemini, monkeypatch):
+    gemini.answer_count[0] = 3
+    batches = []
+    save_questions = service.save_questions
+
+    def recording(questions):
+        batches.append(len(questions))
+        return save_questions(questions)
+
+    monkeypatch.setattr(service, "save_questions", recording)
+    streamed = collect(["Python", "SQL"])
+
+    assert batches == [6]
+    for question in streamed:
+        assert question_store.load_question(question["id"])["text"] == question["text"]
+
+
+def test_abandoned_stream_stores_what_it_received(bank, gemini):
+    gemini.answer_count[0] = 3
+
+    async def first_only():
+        stream = await service.stream_questions(["Python"])
+        question = await stream.__anext__()
+        await stream.aclose()
+        return question
+
+    question = asyncio.run(first_only())
+    assert question_store.load_question(question["id"]) is not None
+
+
+def test_disconnected_stream_still_stores_and_banks_its_questions(bank, gemini, monkeypatch):
+    gemini.answer_count[0] = 3
+
+    async def slow_stream(skills, per_skill=2, on_shard_end=None):
+        for question in questions_for(skills, 3):
+            await asyncio.sleep(0)
+            yield question
+
+    monkeypatch.setattr(service, "stream_questions_for_skills_async", slow_stream)
+    received = []
+
+    async def client_leaves_after_the_first_question():
+        # How Starlette cancels a StreamingResponse when the client disconnects
+        async with anyio.create_task_group() as group:
+            async def consume():
+                async for question in await service.stream_questions(["Python"]):
+                    received.append(question)
+                    group.cancel_scope.cancel()
+            group.start_soon(consume)
+
+    anyio.run(client_leaves_after_the_first_question)
+
+    assert len(received) == 1
+    assert question_store.load_question(received[0]["id"]) is not None
+    assert question_bank.take_questions("Python", 1)
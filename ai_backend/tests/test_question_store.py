@@ -0,0 +1,51 @@
+import sqlite3
+
+import pytest
+
+from question_generator import question_store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch, encoder):
+    """
+    Empty question store without its memory tier.
+    """
+    monkeypatch.setattr(question_store, "QUESTION_STORE_PATH", str(tmp_path / "questions.sqlite3"))
+    monkeypatch.setattr(question_store, "_initialized", False)
+    monkeypatch.setattr(question_store._LOADED, "max_entries", 0)
+    return question_store
+
+
+def question(n):
+    return {"skill": "Python", "text": f"Question {n}", "keywords": ["testing"]}
+
+
+def test_least_recently_used_questions_are_evicted(store, monkeypatch):
+    monkeypatch.setattr(store, "QUESTION_STORE_MAX_ENTRIES", 2)
+    clock = iter(range(100))
+    monkeypatch.setattr(store.time, "time", lambda: next(clock))
+
+    first, second = store.save_questions([question(1), question(2)])
+    assert store.load_question(first["id"]) is not None  # now more recent than `second`
+    (third,) = store.save_questions([question(3)])
+
+    assert store.load_question(second["id"]) is None
+    assert store.load_question(first["id"])["text"] == "Question 1"
+    assert store.load_question(third["id"])["text"] == "Question 3"
+
+
+def test_store_without_last_used_column_is_migrated(store):
+    with sqlite3.connect(store.QUESTION_STORE_PATH) as conn:
+        conn.execute(
+            "CREATE TABLE questions (id TEXT PRIMARY KEY, skill TEXT NOT NULL,"
+            " text TEXT NOT NULL, keywords TEXT NOT NULL, model TEXT NOT NULL,"
+            " dim INTEGER NOT NULL, vectors BLOB NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO questions VALUES ('old', 'Go', 'Old question', '[\"a\"]', 'm', 1, x'00000000')"
+        )
+
+    (saved,) = store.save_questions([question(1)])
+
+    assert store.load_question("old")["text"] == "Old question"
+    assert store.load_question(saved["id"])["text"] == "Question 1"
@@ -0,0 +1,80 @@
+import pytest
+
+from cache import TTLCache
+from response_evaluator import evaluator
+
+QUESTION = {
+    "text": "How do you cache API responses?",
+    "expected_keywords": [{"keyword": "cache invalidation", "weight": 1.0}],
+}
+PAYLOAD = {"response": "cache invalidation on writes", "question": QUESTION}
+
+
+@pytest.fixture(autouse=True)
+def result_cache(monkeypatch):
+    cache = TTLCache(max_entries=64, ttl_seconds=600)
+    monkeypatch.setattr(evaluator, "_RESULT_CACHE", cache)
+    return cache
+
+
+def test_identical_request_is_served_from_cache(encoder):
+    first = evaluator.evaluate(PAYLOAD)
+    calls = len(encoder.calls)
+    second = evaluator.evaluate({**PAYLOAD, "response": " cache  invalidation on writes "})
+
+    assert len(encoder.calls) == calls
+    assert second["scores"] == first["scores"]
+    assert second["response"] == " cache  invalidation on writes "
+
+
+def test_failed_encode_is_not_cached(encoder, result_cache):
+    encoder.fail = 1
+    failed = evaluator.evaluate(PAYLOAD)
+    assert failed["degraded"] is True
+    assert failed["scores"]["keyword"] == 0.0
+    assert result_cache.stats()["entries"] == 0
+
+    calls = len(encoder.calls)
+    recovered = evaluator.evaluate(PAYLOAD)
+    assert len(encoder.calls) > calls
+    assert "degraded" not in recovered
+    assert recovered["feedback"]["matched_keywords"] == ["cache invalidation"]
+
+
+def test_failed_batch_encode_is_not_cached(encoder, result_cache):
+    encoder.fail = 1
+    failed = evaluator.evaluate_many([PAYLOAD, PAYLOAD])
+    assert all(result["degraded"] for result in failed)
+    assert result_cache.stats()["entries"] == 0
+
+    recovered = evaluator.evaluate_many([PAYLOAD])
+    assert recovered[0]["feedback"]["matched_keywords"] == ["cache invalidation"]
+    assert result_cache.stats()["entries"] == 1
+
+
+def test_batch_fallbacks_are_not_cached(encoder, result_cache, monkeypatch):
+    evaluate_responses = evaluator.evaluate_responses
+    failures = [RuntimeError("boom")]
+
+    def flaky(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return evaluate_responses(*args, **kwargs)
+
+    monkeypatch.setattr(evaluator, "evaluate_responses", flaky)
+    results = evaluator.evaluate_many([PAYLOAD, {"response": "x"}])
+    assert results[0]["feedback"]["suggestion"] == "Evaluation failed"
+    assert results[1]["feedback"]["suggestion"] == "Invalid question format"
+    assert result_cache.stats()["entries"] == 0
+
+    recovered = evaluator.evaluate_many([PAYLOAD])
+    assert recovered[0]["feedback"]["matched_keywords"] == ["cache invalidation"]
+
+
+def test_batch_reuses_single_results(encoder):
+    single = evaluator.evaluate(PAYLOAD)
+    calls = len(encoder.calls)
+    batch = evaluator.evaluate_many([PAYLOAD])
+
+    assert len(encoder.calls) == calls
+    assert batch[0]["scores"] == single["scores"]
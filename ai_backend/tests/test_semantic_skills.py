@@ -0,0 +1,66 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import subsystems
+from benchmarks import corpus
+from model import evaluator
+from resume_parser import parser
+from resume_parser.skill_index import SkillIndex
+from resume_parser.skill_matcher import SkillMatcher
+
+ENTRIES = [
+    {"name": "Machine Learning", "category": "AI", "aliases": ["ml"]},
+    {"name": "Kubernetes", "category": "DevOps", "aliases": ["k8s"]},
+]
+
+
+@pytest.fixture
+def index(encoder, monkeypatch):
+    matcher = SkillMatcher(ENTRIES, version="test")
+    index = SkillIndex.build(matcher, evaluator.encode_responses)
+    monkeypatch.setattr(parser, "_SKILL_INDEX", index)
+    monkeypatch.setattr(parser, "get_nlp", lambda: None)
+    return index
+
+
+def test_semantic_skills_maps_chunks_to_nearest_skill(index, monkeypatch):
+    monkeypatch.setattr(parser, "noun_chunks", lambda nlp, text: ["machine learning", "the office"])
+    assert parser.semantic_skills("We do machine learning at the office.") == {"Machine Learning": "AI"}
+
+
+def test_chunks_are_encoded_in_one_batch_outside_the_micro_batcher(index, encoder, monkeypatch):
+    submitted = []
+    batcher = evaluator.MicroBatcher(evaluator.encode_responses)
+    monkeypatch.setattr(batcher, "submit", submitted.append)
+    monkeypatch.setattr(evaluator, "_BATCHER", batcher)
+    monkeypatch.setattr(parser, "noun_chunks", lambda nlp, text: ["kubernetes", "k8s", "the office"])
+    encoder.calls.clear()
+
+    assert parser.semantic_skills("kubernetes") == {"Kubernetes": "DevOps"}
+    assert encoder.calls == [["kubernetes", "k8s", "the office"]]
+    assert submitted == []
+
+
+def test_parse_resume_requires_semantic_subsystems_when_enabled(monkeypatch):
+    monkeypatch.setattr(parser, "SEMANTIC_SKILLS", True)
+    assert subsystems._parse_resume_subsystems() == ["skills", "embeddings", "nlp", "skill_index"]
+    monkeypatch.setattr(parser, "SEMANTIC_SKILLS", False)
+    assert subsystems._parse_resume_subsystems() == ["skills"]
+
+
+def test_parse_resume_endpoint_waits_for_its_subsystems(monkeypatch):
+    required = []
+
+    async def record(*names):
+        required.extend(names)
+
+    monkeypatch.setattr(main, "_require", record)
+    monkeypatch.setattr(main, "PARSE_RESUME_SUBSYSTEMS", ["skills", "embeddings", "nlp", "skill_index"])
+    monkeypatch.setattr(main, "_parse_pdf", lambda pdf_bytes: {})
+
+    response = TestClient(main.app).post(
+        "/parse-resume", files={"file": ("cv.pdf", corpus.resume_pdf(1), "application/pdf")}
+    )
+    assert response.status_code == 200
+    assert required == ["skills", "embeddings", "nlp", "skill_index"]
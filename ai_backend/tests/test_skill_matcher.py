@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from resume_parser.skill_matcher import DEFAULT_TAXONOMY_PATH, SkillMatcher, tokenize
+
+ENTRIES = [
+    {"name": "Python", "category": "Languages", "aliases": ["python3"]},
+    {"name": "C++", "category": "Languages", "aliases": ["cpp"]},
+    {"name": "C#", "category": "Languages"},
+    {"name": "C", "category": "Languages"},
+    {"name": "Node.js", "category": "Frameworks", "aliases": ["nodejs"]},
+    {"name": ".NET", "category": "Frameworks"},
+    {"name": "Go", "category": "Languages", "aliases": ["golang"], "match_name": False},
+    {"name": "Machine Learning", "category": "AI", "aliases": ["ml"]},
+    {"name": "Machine Learning Engineering", "category": "AI"},
+    {"name": "CI/CD", "category": "DevOps"},
+    {"name": "Continuous Integration", "category": "DevOps", "aliases": ["ci"]},
+]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher(ENTRIES, version="test")
+
+
+def test_tokenize_keeps_symbols_that_name_skills():
+    assert tokenize("C++, C# and Node.js on .NET!") == ["c++", "c#", "and", "node.js", "on", ".net"]
+
+
+def test_symbol_skills_are_distinct(matcher):
+    assert list(matcher.match("C++ and C# and plain C")) == ["C++", "C#", "C"]
+
+
+def test_aliases_map_to_the_canonical_name(matcher):
+    assert matcher.match("python3, cpp, nodejs") == {
+        "Python": "Languages", "C++": "Languages", "Node.js": "Frameworks",
+    }
+
+
+def test_longest_match_wins(matcher):
+    assert list(matcher.match("machine learning engineering team")) == ["Machine Learning Engineering"]
+    assert list(matcher.match("machine learning team")) == ["Machine Learning"]
+
+
+def test_partial_multiword_term_does_not_match(matcher):
+    assert matcher.match("a machine shop") == {}
+
+
+def test_separators_are_interchangeable(matcher):
+    for text in ("CI/CD", "ci cd", "ci-cd"):
+        assert "CI/CD" in matcher.match(text), text
+
+
+def test_prefix_of_longer_term_still_matches(matcher):
+    # "ci" is both a skill and the start of "ci cd"
+    assert list(matcher.match("we use ci daily")) == ["Continuous Integration"]
+
+
+def test_match_name_false_matches_only_aliases(matcher):
+    assert matcher.match("let's go with golang") == {"Go": "Languages"}
+    assert matcher.match("go team") == {}
+
+
+def test_lost_whitespace_between_dotted_words(matcher):
+    assert list(matcher.match("experience.python")) == ["Python"]
+    # A dotted skill name is kept whole
+    assert list(matcher.match("node.js")) == ["Node.js"]
+
+
+def test_skills_are_reported_once_in_order_of_first_mention(matcher):
+    assert list(matcher.match("ml, python, ML again, python3")) == ["Machine Learning", "Python"]
+
+
+def test_first_entry_wins_a_shared_alias():
+    matcher = SkillMatcher([
+        {"name": "A", "category": "x", "aliases": ["shared"]},
+        {"name": "B", "category": "y", "aliases": ["shared"]},
+    ])
+    assert matcher.match("shared") == {"A": "x"}
+
+
+def test_version_changes_with_file_content(tmp_path):
+    path = tmp_path / "skills.json"
+    path.write_text(json.dumps({"version": "1", "skills": ENTRIES}))
+    first = SkillMatcher.from_file(str(path)).version
+    path.write_text(json.dumps({"version": "1", "skills": ENTRIES[:3]}))
+    second = SkillMatcher.from_file(str(path)).version
+
+    assert first.startswith("1+") and second.startswith("1+")
+    assert first != second
+
+
+def test_bundled_taxonomy_loads():
+    matcher = SkillMatcher.from_file(DEFAULT_TAXONOMY_PATH)
+    assert len(matcher) > 0
+    assert "Python" in matcher.match("Senior Python developer")
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from model.snapshot import load_snapshot
+
+pytest.importorskip("sentence_transformers")
+
+
+@pytest.fixture(scope="module")
+def snapshot_dir(tmp_path_factory):
+    """
+    A tiny BERT SentenceTransformer saved the way create_snapshot saves one.
+    """
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    root = tmp_path_factory.mktemp("snapshot")
+    hf_dir = root / "hf"
+    hf_dir.mkdir()
+    words = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "cache", "invalidation", "python"]
+    (hf_dir / "vocab.txt").write_text("\n".join(words) + "\n")
+
+    config = BertConfig(
+        vocab_size=len(words), hidden_size=32, num_hidden_layers=1,
+        num_attention_heads=2, intermediate_size=64, max_position_embeddings=32,
+    )
+    BertModel(config).save_pretrained(hf_dir)
+    BertTokenizerFast(str(hf_dir / "vocab.txt")).save_pretrained(hf_dir)
+
+    model = SentenceTransformer(modules=[models.Transformer(str(hf_dir)), models.Pooling(32)])
+    model.save(str(root / "snapshot" / "model"), safe_serialization=True)
+    return str(root / "snapshot")
+
+
+def _mapped_ranges(path):
+    """
+    Address ranges at which `path` is memory-mapped in this process.
+    """
+    path = os.path.realpath(path)
+    ranges = []
+    with open("/proc/self/maps") as maps:
+        for line in maps:
+            fields = line.split(maxsplit=5)
+            if len(fields) == 6 and fields[5].strip() == path:
+                start, end = (int(x, 16) for x in fields[0].split("-"))
+                ranges.append((start, end))
+    return ranges
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc/self/maps")
+def test_parameters_are_views_of_the_mapped_weights(snapshot_dir):
+    model = load_snapshot(snapshot_dir)
+    ranges = _mapped_ranges(os.path.join(snapshot_dir, "model", "model.safetensors"))
+
+    assert ranges
+    for name, param in model.named_parameters():
+        assert any(start <= param.data_ptr() < end for start, end in ranges), name
+    assert all(buffer.device.type == "cpu" for buffer in model.buffers())
+
+
+def test_weights_file_is_not_read_before_it_is_mapped(snapshot_dir, monkeypatch):
+    import transformers.modeling_utils
+
+    def refuse(*args, **kwargs):
+        raise AssertionError("weights read into memory")
+
+    # Both ways transformers reads safetensors checkpoints
+    monkeypatch.setattr(transformers.modeling_utils, "safe_open", refuse, raising=False)
+    monkeypatch.setattr(transformers.modeling_utils, "safe_load_file", refuse, raising=False)
+
+    load_snapshot(snapshot_dir)
+
+
+def test_mapped_and_in_memory_snapshots_encode_alike(snapshot_dir):
+    texts = ["cache invalidation", "python"]
+    mapped = load_snapshot(snapshot_dir).encode(texts)
+    loaded = load_snapshot(snapshot_dir, mmap_weights=False).encode(texts)
+    np.testing.assert_allclose(mapped, loaded, atol=1e-6)
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from question_generator.stream_parser import ObjectArrayStreamParser
+
+ITEMS = [
+    {"skill": "A", "question": 'Say "hi" {not a brace} [nor this]', "keywords": ["a\\b", "c"]},
+    {"skill": "B", "question": "Nested?", "keywords": [{"k": {"deep": [1, {"x": "}"}]}}]},
+    {"skill": "C", "question": "ends with a backslash \\", "keywords": []},
+]
+
+
+def feed_in_chunks(text, size):
+    parser = ObjectArrayStreamParser()
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    return parser, items
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_any_chunking_yields_the_same_objects(size):
+    parser, items = feed_in_chunks(json.dumps(ITEMS), size)
+    assert items == ITEMS
+    assert parser.done and parser.invalid == 0
+
+
+def test_escapes_split_across_chunks():
+    parser = ObjectArrayStreamParser()
+    assert parser.feed('[{"q": "a \\') == []
+    assert parser.feed('" still inside \\') == []
+    assert parser.feed('\\", "k": 1}]') == [{"q": 'a " still inside \\', "k": 1}]
+
+
+def test_braces_inside_strings_do_not_close_objects():
+    parser = ObjectArrayStreamParser()
+    assert parser.feed('[{"q": "}}]]"') == []
+    assert parser.feed('}]') == [{"q": "}}]]"}]
+
+
+def test_nested_objects_complete_with_their_parent():
+    parser = ObjectArrayStreamParser()
+    assert parser.feed('[{"a": {"b": {"c": 1}}') == []
+    assert parser.feed('}, {"d": 2}') == [{"a": {"b": {"c": 1}}}, {"d": 2}]
+
+
+def test_prose_around_the_array_is_ignored():
+    text = 'Sure! Here you go:\n```json\n' + json.dumps(ITEMS[:1]) + '\n```\nLet me know [if] {more}.'
+    parser, items = feed_in_chunks(text, 5)
+    assert items == ITEMS[:1]
+    assert parser.done
+
+
+def test_objects_stream_out_as_they_complete():
+    parser = ObjectArrayStreamParser()
+    assert parser.feed('[{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(': 2}') == [{"b": 2}]
+    assert not parser.done
+
+
+def test_truncated_final_element_is_dropped():
+    parser, items = feed_in_chunks(json.dumps(ITEMS)[:-20], 4)
+    assert items == ITEMS[:2]
+    assert not parser.done and parser.invalid == 0
+
+
+def test_malformed_element_is_counted_and_skipped():
+    parser = ObjectArrayStreamParser()
+    assert parser.feed('[{"a": 1}, {bad}, {"b": 2}]') == [{"a": 1}, {"b": 2}]
+    assert parser.invalid == 1
+
+
+def test_nothing_before_the_array_starts():
+    parser = ObjectArrayStreamParser()
+    assert parser.feed('{"not": "in an array"}') == []
+    assert not parser.started
+
+
+def test_text_after_the_closing_bracket_is_ignored():
+    parser = ObjectArrayStreamParser()
+    assert parser.feed('[{"a": 1}] [{"b": 2}]') == [{"a": 1}]
+    assert parser.done
@@ -0,0 +1,52 @@
+import pytest
+
+from model.streaming import StreamingEvaluation
+
+QUESTION = {
+    "text": "How do you cache API responses?",
+    "expected_keywords": [
+        {"keyword": "cache invalidation", "weight": 1.0},
+        {"keyword": "ttl expiry", "weight": 1.0},
+    ],
+}
+
+
+@pytest.fixture
+def session(encoder):
+    return StreamingEvaluation(QUESTION)
+
+
+def test_sentence_completed_by_whitespace(session):
+    session.add_chunk("I use cache invalidation. Then")
+    assert session.segments == ["I use cache invalidation."]
+    assert session._pending == "Then"
+
+
+def test_chunk_ending_in_terminator_completes_the_sentence(session):
+    snapshot = session.add_chunk("Cache invalidation.")
+    assert session.segments == ["Cache invalidation."]
+    assert session._pending == ""
+    assert "cache invalidation" in snapshot["feedback"]["matched_keywords"]
+
+    session.add_chunk("Is a ttl expiry enough?")
+    assert session.segments[-1] == "Is a ttl expiry enough?"
+
+
+def test_unterminated_fragment_waits_for_more_text(session):
+    session.add_chunk("we set a ttl")
+    assert session.segments == []
+    session.add_chunk("expiry on keys!")
+    assert session.segments == ["we set a ttl expiry on keys!"]
+
+
+def test_long_unpunctuated_speech_is_flushed(encoder):
+    session = StreamingEvaluation(QUESTION, max_pending_words=5)
+    session.add_chunk("one two three four five six")
+    assert session.segments == ["one two three four five six"]
+
+
+def test_finalize_matches_full_transcript(session):
+    session.add_chunk("cache invalidation.")
+    result = session.finalize("and ttl expiry")
+    assert set(result["feedback"]["matched_keywords"]) == {"cache invalidation", "ttl expiry"}
+    assert session.segments == ["cache invalidation.", "and ttl expiry"]
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+import subsystems
+from model import evaluator
+from subsystems import Subsystem, SubsystemUnavailable
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """
+    Replace the subsystems with cheap ones: "ok" loads, "broken" fails.
+    """
+    def broken():
+        raise RuntimeError("missing")
+
+    fake = {
+        "ok": Subsystem("ok", lambda: None),
+        "broken": Subsystem("broken", broken),
+    }
+    monkeypatch.setattr(subsystems, "SUBSYSTEMS", fake)
+    return fake
+
+
+def test_default_readiness_covers_what_endpoints_require():
+    assert set(subsystems.READY_SUBSYSTEMS) <= set(subsystems.ENDPOINT_SUBSYSTEMS)
+    assert "gemini" not in subsystems.READY_SUBSYSTEMS
+
+
+def test_background_mode_is_ready_only_once_loaded(registry, monkeypatch):
+    monkeypatch.setattr(subsystems, "SUBSYSTEM_LOADING", "background")
+    monkeypatch.setattr(subsystems, "READY_SUBSYSTEMS", ["ok"])
+
+    assert subsystems.readiness()["ready"] is False
+    subsystems.load_all()
+    assert subsystems.readiness()["ready"] is True
+
+
+def test_lazy_mode_is_ready_before_first_load(registry, monkeypatch):
+    monkeypatch.setattr(subsystems, "SUBSYSTEM_LOADING", "lazy")
+    monkeypatch.setattr(subsystems, "READY_SUBSYSTEMS", ["ok", "broken"])
+
+    assert subsystems.readiness()["ready"] is True
+    with pytest.raises(SubsystemUnavailable):
+        subsystems.require("broken")
+    # A subsystem that failed to load is never reported routable
+    assert subsystems.readiness()["ready"] is False
+    assert subsystems.routable("ok")
+
+
+def test_failed_load_is_retried(monkeypatch):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("first try")
+
+    subsystem = Subsystem("flaky", flaky)
+    with pytest.raises(SubsystemUnavailable):
+        subsystem.load()
+    assert subsystem.state == "failed"
+    subsystem.load()
+    assert subsystem.ready and len(attempts) == 2
+
+
+def test_embedding_model_loads_once_under_concurrency(monkeypatch):
+    loads = []
+
+    def slow_load(*args, **kwargs):
+        loads.append(1)
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(evaluator, "_MODEL", None)
+    monkeypatch.setattr(evaluator, "load_embedding_model", slow_load)
+
+    models = []
+    threads = [
+        threading.Thread(target=lambda: models.append(evaluator.get_embedding_model()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(loads) == 1
+    assert len(set(map(id, models))) == 1
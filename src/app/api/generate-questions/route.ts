@@ -61,7 +61,10 @@ export async function POST(req: NextRequest) {
 
     const questions = await backendRes.json();
 
-    const grouped = new Map<string, { text: string; keywords: string[] }[]>();
+    const grouped = new Map<
+      string,
+      { text: string; keywords: string[]; questionId?: string }[]
+    >();
 
     questions.forEach((q: any) => {
       if (!q.skill || !q.text) return;
@@ -73,6 +76,8 @@ export async function POST(req: NextRequest) {
       grouped.get(q.skill)!.push({
         text: q.text,
         keywords: Array.isArray(q.keywords) ? q.keywords : [],
+        // Backend ID: lets the evaluator reuse precomputed keyword vectors
+        ...(typeof q.id === "string" ? { questionId: q.id } : {}),
       });
     });
 
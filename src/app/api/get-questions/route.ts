@@ -51,7 +51,7 @@ export async function GET(request: NextRequest) {
         qList.forEach((q, index) => {
           if (!q?.text) return;
           questions.push({
-            questionId: `${skill}-${index}`,
+            questionId: q.questionId || `${skill}-${index}`,
             text: q.text,
             skill,
             keywords: Array.isArray(q.keywords) ? q.keywords : [],
@@ -67,7 +67,7 @@ export async function GET(request: NextRequest) {
         qList.forEach((q, index) => {
           if (!q?.text) return;
           questions.push({
-            questionId: `${skill}-${index}`,
+            questionId: q.questionId || `${skill}-${index}`,
             text: q.text,
             skill,
             keywords: Array.isArray(q.keywords) ? q.keywords : [],
@@ -59,6 +59,10 @@ export async function POST(request: NextRequest): Promise<Response> {
       body: JSON.stringify({
         response,
         question: questionObj,
+        // Backend-generated IDs skip keyword encoding; others are ignored
+        ...(typeof question.questionId === "string"
+          ? { question_id: question.questionId }
+          : {}),
       }),
     });
 
@@ -12,6 +12,7 @@ export interface IUser extends Document {
     {
       text: string;
       keywords: string[];
+      questionId?: string;
     }[]
   >;
   skillScores: Map<string, number>;
@@ -47,7 +48,8 @@ const UserSchema: Schema = new Schema({
   type: Map,
   of: [{
     text: { type: String, required: true },
-    keywords: [{ type: String }]
+    keywords: [{ type: String }],
+    questionId: { type: String }
   }],
   default: {},
   },
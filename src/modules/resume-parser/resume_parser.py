@@ -1,33 +1,76 @@
+import argparse
+import glob
+import hashlib
+import multiprocessing
+import os
 import sys
+import time
 from PyPDF2 import PdfReader
 import spacy
 import re
 import json
 
+# Usage:
+#   python resume_parser.py resume.pdf
+#       -> {"Technical Skills": [...], "Soft Skills": [...], "Other Skills": [...]}
+#   python resume_parser.py --bulk <directory or glob> [--output out.jsonl]
+#                           [--checkpoint done.txt] [--workers N]
+#       -> one JSON line per resume, as each one finishes
+
+# 📄 PDF text extraction backends, tried in PDF_BACKENDS order
+def _pages_pypdfium2(file_path):
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(file_path)
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            yield textpage.get_text_range().replace("\r\n", "\n")
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+
+
+def _pages_pypdf2(file_path):
+    for page in PdfReader(file_path).pages:
+        yield page.extract_text() or ""
+
+
+PDF_BACKENDS = {"pypdfium2": _pages_pypdfium2, "pypdf2": _pages_pypdf2}
+
+
 # 📄 Extract text from PDF
 def extract_text_from_pdf(file_path):
-    try:
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        return text
-    except Exception as e:
-        print(json.dumps({"error": f"Failed to extract text from PDF: {str(e)}"}))
-        sys.exit(1)
+    """
+    Raises the last backend's error if no backend could read the file.
+    """
+    names = [n.strip() for n in os.getenv("PDF_BACKENDS", "pypdfium2,pypdf2").split(",")]
+    names = [n for n in names if n in PDF_BACKENDS] or ["pypdf2"]
+
+    error = None
+    for name in names:
+        try:
+            text = "\n".join(t for t in PDF_BACKENDS[name](file_path) if t)
+        except Exception as e:  # missing library or unreadable file: next backend
+            error = e
+            continue
+        if text.strip():
+            return text + "\n"
 
-# Get file path from command line argument
-if len(sys.argv) < 2:
-    print(json.dumps({"error": "No file path provided"}))
-    sys.exit(1)
+    if error is not None:
+        raise error
+    return ""
 
-resume_file = sys.argv[1]
-resume_text = extract_text_from_pdf(resume_file)
+# 🧠 NLP model, loaded once per process
+_nlp = None
 
-# 🧠 Load NLP model
-nlp = spacy.load("en_core_web_sm")
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        _nlp = spacy.load("en_core_web_sm")
+    return _nlp
 
 # 📚 Skill dictionaries
 technical_skills = [
@@ -49,30 +92,199 @@ other_skills = [
     "Organizational Skills", "Research", "Documentation"
 ]
 
+SKILL_CATEGORIES = {
+    "Technical Skills": technical_skills,
+    "Soft Skills": soft_skills,
+    "Other Skills": other_skills,
+}
+
 # 🛠 Skill extractor
 def extract_categorized_skills(text):
-    doc = nlp(text)
-    found = {
-        "Technical Skills": set(),
-        "Soft Skills": set(),
-        "Other Skills": set()
+    # A skill is found when it equals, or is contained in, a token. Only the
+    # tokenizer is needed, and each skill is searched once in the distinct
+    # tokens joined by newlines (no token or skill contains one), instead of
+    # comparing every token with every skill.
+    doc = get_nlp().make_doc(text)
+    tokens = "\n".join({token.text.lower() for token in doc})
+
+    return {
+        category: sorted({skill for skill in skills if skill.lower() in tokens})
+        for category, skills in SKILL_CATEGORIES.items()
+    }
+
+
+def parse_resume(file_path):
+    return extract_categorized_skills(extract_text_from_pdf(file_path))
+
+# 📦 Bulk ingestion
+def find_resumes(source):
+    """
+    PDFs under a directory (recursively) or matching a glob, sorted.
+    """
+    if os.path.isdir(source):
+        pattern = os.path.join(source, "**", "*.pdf")
+    else:
+        pattern = source
+    return sorted(
+        path for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path) and path.lower().endswith(".pdf")
+    )
+
+
+def file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_checkpoint(path):
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def _init_worker():
+    # Never raise here: Pool replaces a worker whose initializer fails, again
+    # and again. bulk_ingest() loads the model first; should a spawned worker
+    # still fail to, each of its resumes records the error instead.
+    try:
+        get_nlp()
+    except Exception:
+        pass
+
+
+def _parse_task(task):
+    file_path, sha256 = task
+    start = time.perf_counter()
+    record = {"file": file_path, "sha256": sha256}
+    try:
+        record["skills"] = parse_resume(file_path)
+    except Exception as e:
+        record["error"] = f"Failed to parse resume: {str(e)}"
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def _progress(done, total, failed, started):
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate > 0 else 0.0
+    print(
+        f"[{done}/{total}] {rate:.1f} resumes/s, {failed} failed, "
+        f"elapsed {elapsed:.1f}s, eta {eta:.1f}s",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def bulk_ingest(source, output=None, checkpoint=None, workers=None, progress_every=1.0):
+    """
+    Parse every PDF in `source` in a process pool and write one JSON line per
+    resume to `output` (stdout if None) as each finishes. Hashes of parsed
+    resumes are appended to `checkpoint`: a rerun skips them, and identical
+    files are parsed once.
+    """
+    workers = workers or os.cpu_count() or 1
+    done_hashes = load_checkpoint(checkpoint)
+
+    tasks = []
+    skipped = 0
+    for file_path in find_resumes(source):
+        sha256 = file_sha256(file_path)
+        if sha256 in done_hashes:
+            skipped += 1
+            continue
+        done_hashes.add(sha256)
+        tasks.append((file_path, sha256))
+
+    total = len(tasks)
+    print(f"{total} resumes to parse, {skipped} already done, {workers} workers", file=sys.stderr)
+
+    if tasks:
+        # Fail fast with a clear error; forked workers inherit the model
+        try:
+            get_nlp()
+        except Exception as e:
+            raise RuntimeError(f"Failed to load spaCy model 'en_core_web_sm': {str(e)}") from e
+
+    out = open(output, "a", encoding="utf-8") if output else sys.stdout
+    ckpt = open(checkpoint, "a", encoding="utf-8") if checkpoint else None
+
+    started = time.perf_counter()
+    last_report = started
+    done = failed = 0
+    try:
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            for record in pool.imap_unordered(_parse_task, tasks, chunksize=4):
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                done += 1
+                if "error" in record:
+                    failed += 1
+                elif ckpt:
+                    # Written after the output line: a crash can repeat a
+                    # resume on the next run, never lose one
+                    ckpt.write(record["sha256"] + "\n")
+                    ckpt.flush()
+
+                now = time.perf_counter()
+                if now - last_report >= progress_every or done == total:
+                    _progress(done, total, failed, started)
+                    last_report = now
+    finally:
+        if output:
+            out.close()
+        if ckpt:
+            ckpt.close()
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "parsed": done - failed,
+        "failed": failed,
+        "skipped": skipped,
+        "seconds": round(elapsed, 2),
+        "resumes_per_second": round(done / elapsed, 2) if elapsed > 0 else 0.0,
     }
+    print(json.dumps(summary), file=sys.stderr)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PRISM resume skill extractor")
+    parser.add_argument("file", nargs="?", help="resume PDF")
+    parser.add_argument("--bulk", metavar="SOURCE", help="directory or glob of resume PDFs")
+    parser.add_argument("--output", help="JSONL output file (appended to), default stdout")
+    parser.add_argument("--checkpoint", help="file of processed resume hashes, for resuming")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, default CPU count")
+    args = parser.parse_args()
+
+    if args.bulk:
+        try:
+            summary = bulk_ingest(args.bulk, args.output, args.checkpoint, args.workers)
+        except RuntimeError as e:
+            print(json.dumps({"error": str(e)}))
+            sys.exit(1)
+        sys.exit(1 if summary["failed"] else 0)
+
+    # Get file path from command line argument
+    if not args.file:
+        print(json.dumps({"error": "No file path provided"}))
+        sys.exit(1)
+
+    try:
+        resume_text = extract_text_from_pdf(args.file)
+    except Exception as e:
+        print(json.dumps({"error": f"Failed to extract text from PDF: {str(e)}"}))
+        sys.exit(1)
 
-    for token in doc:
-        word = token.text.lower()
-        for skill in technical_skills:
-            if skill.lower() == word or skill.lower() in word:
-                found["Technical Skills"].add(skill)
-        for skill in soft_skills:
-            if skill.lower() == word or skill.lower() in word:
-                found["Soft Skills"].add(skill)
-        for skill in other_skills:
-            if skill.lower() == word or skill.lower() in word:
-                found["Other Skills"].add(skill)
+    # 📊 Extracted Skills
+    categorized_skills = extract_categorized_skills(resume_text)
 
-    return {k: sorted(list(v)) for k, v in found.items()}
+    print(json.dumps(categorized_skills))
 
-# 📊 Extracted Skills
-categorized_skills = extract_categorized_skills(resume_text)
 
-print(json.dumps(categorized_skills))
+if __name__ == "__main__":
+    main()